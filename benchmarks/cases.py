@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+The benchmark cases. Each one sets up what it needs and returns a callable doing a single operation.
+"""
+
+import io
+from itertools import cycle
+
+from .suite import case
+
+from quantity.quantity import Quantity
+from quantity.prefix import closest_prefix
+from quantity.quantity_config_parser import QuantityConfigParser
+from quantity.bit_field import BitField
+import quantity.unit.units as units
+import quantity.prefix.prefixes as prefixes
+
+# Size of the generated config file, sections x options
+CONFIG_SECTIONS = 200
+CONFIG_OPTIONS = 50
+
+
+@case('quantity.from_string')
+def quantity_from_string():
+    return lambda: Quantity(1.5, 'kV')
+
+
+@case('quantity.from_unit')
+def quantity_from_unit():
+    volt, kilo = units.volt, prefixes.kilo
+    return lambda: Quantity(1.5, volt, kilo)
+
+
+@case('quantity.arithmetic')
+def quantity_arithmetic():
+    v, i, t = Quantity(2, 'kV'), Quantity(3, 'A'), Quantity(4, 's')
+    return lambda: repr(v * i / t)
+
+
+@case('quantity.to')
+def quantity_to():
+    q = Quantity(1.5, 'kV')
+    return lambda: q.to('mV')
+
+
+@case('quantity.to_prefix')
+def quantity_to_prefix():
+    q, milli = Quantity(1.5, 'kV'), prefixes.milli
+    return lambda: q.to(milli)
+
+
+@case('unit.mul')
+def unit_mul():
+    volt, ampere = units.volt, units.ampere
+    return lambda: volt * ampere
+
+
+@case('unit.mul_compound')
+def unit_mul_compound():
+    metre, second = units.metre, units.second
+    return lambda: metre * second
+
+
+@case('unit.truediv')
+def unit_truediv():
+    joule, second = units.joule, units.second
+    return lambda: joule / second
+
+
+@case('unit.truediv_compound')
+def unit_truediv_compound():
+    metre, second = units.metre, units.second
+    return lambda: metre / second
+
+
+@case('unit.convert')
+def unit_convert():
+    celsius, fahrenheit = units.celsius, units.fahrenheit
+    return lambda: celsius.convert(fahrenheit, 100.0)
+
+
+@case('unit.convert_chained')
+def unit_convert_chained():
+    inch, mile = units.inch, units.mile
+    return lambda: inch.convert(mile, 63360.0)
+
+
+@case('prefix.closest_prefix')
+def prefix_closest_prefix():
+    return lambda: closest_prefix(1234.5)
+
+
+@case('prefix.closest_prefix_int')
+def prefix_closest_prefix_int():
+    return lambda: closest_prefix(1234567)
+
+
+def _config_parser() -> QuantityConfigParser:
+    text = io.StringIO()
+    for s in range(CONFIG_SECTIONS):
+        text.write(f'[section{s}]\n')
+        for o in range(CONFIG_OPTIONS):
+            text.write(f'option{o} = {s * CONFIG_OPTIONS + o}.5 mV\n')
+    text.seek(0)
+    parser = QuantityConfigParser()
+    parser.read_file(text)
+    return parser
+
+
+@case('config.getfloat')
+def config_getfloat():
+    parser = _config_parser()
+    keys = cycle([(f'section{s}', f'option{o}') for s in range(CONFIG_SECTIONS) for o in range(CONFIG_OPTIONS)])
+    return lambda: parser.getfloat(*next(keys))
+
+
+@case('config.get_section_as')
+def config_get_section_as():
+    parser = _config_parser()
+    sections = cycle(parser.sections())
+
+    def get_section_as():
+        # A change each time so the whole section is parsed again
+        parser.set('section0', 'option0', '0.5 mV')
+        return parser.get_section_as(next(sections))
+    return get_section_as
+
+
+@case('bit_field.get_slice')
+def bit_field_get_slice():
+    field = BitField((1 << 1000) - 12345)
+    return lambda: field[200:232]
+
+
+@case('bit_field.set_slice')
+def bit_field_set_slice():
+    field = BitField((1 << 1000) - 12345)
+
+    def set_slice():
+        field[200:232] = 0xDEADBEEF
+    return set_slice
+
+
+@case('bit_field.from_word_set')
+def bit_field_from_word_set():
+    words = [(i * 2654435761) & 0xFFFF for i in range(64)]
+    return lambda: BitField().from_word_set(words)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Stress the unit registry from several threads at once and report lookup throughput for each thread count.
+
+Every reader thread multiplies and divides units, parses unit strings, converts and picks prefixes, checking the
+answers as it goes, while a writer thread keeps adding and removing a conversion in the same registry. Reads use
+the registry's snapshot so they take no lock; on a free-threaded build the throughput should grow with the
+threads, with the GIL it stays flat.
+
+    python benchmarks/registry_threads.py --threads 1 2 4 8 --seconds 2
+"""
+
+import argparse
+import operator
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from quantity.registry import default_registry, use_registry
+from quantity.unit import Unit, get_unit, get_affine_conversion
+from quantity.prefix import closest_prefix
+from quantity.unit_parser import parse_unit
+import quantity.unit.units as units
+import quantity.prefix.prefixes as prefixes
+
+
+def _lookups(a: Unit, b: Unit) -> int:
+    """
+    One round of registry reads, checking every answer
+
+    :return: number of lookups done
+    """
+    assert units.volt * units.ampere is units.watt
+    assert units.joule / units.second is units.watt
+    assert parse_unit('kV') == (prefixes.kilo, units.volt)
+    assert get_unit('A') is units.ampere
+    assert closest_prefix(1500.0)[1] is prefixes.kilo
+    assert get_affine_conversion((units.celsius, units.kelvin)) == (1.0, 273.15)
+    assert get_affine_conversion((a, b)) in (None, (2.0, 0.0))
+    return 7
+
+
+def run(threads: int, seconds: float) -> float:
+    """
+    Run reader threads against a registry that is being written to
+
+    :param threads: number of reader threads
+    :param seconds: how long to run for
+    :return: lookups per second over all the readers
+    """
+    registry = default_registry.fork()
+    a = Unit('BMA', 'benchmark a', temp=True)
+    b = Unit('BMB', 'benchmark b', temp=True)
+    stop = threading.Event()
+    start = threading.Barrier(threads + 1)
+    counts = [0] * threads
+
+    def read(slot: int):
+        with use_registry(registry):
+            start.wait()
+            count = 0
+            while not stop.is_set():
+                count += _lookups(a, b)
+            counts[slot] = count
+
+    def write():
+        while not stop.is_set():
+            with registry.write():
+                registry.conversions[(a, b)] = ((operator.mul, 2.0),)
+            time.sleep(0.001)
+            with registry.write():
+                del registry.conversions[(a, b)]
+            time.sleep(0.001)
+
+    readers = [threading.Thread(target=read, args=(i,)) for i in range(threads)]
+    writer = threading.Thread(target=write)
+    for reader in readers:
+        reader.start()
+    start.wait()
+    began = time.perf_counter()
+    writer.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in readers + [writer]:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - began)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--seconds', type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'python {sys.version.split()[0]}, GIL {"enabled" if gil else "disabled"}, {os.cpu_count()} CPUs')
+    baseline = None
+    for threads in args.threads:
+        rate = run(threads, args.seconds)
+        baseline = baseline or rate
+        print(f'{threads:3d} threads: {rate:12,.0f} lookups/s ({rate / baseline:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
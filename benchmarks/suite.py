@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+Throughput benchmarks for the paths the rest of the package leans on. Each case times one operation, results are
+saved as JSON baselines, and comparing a run against a baseline fails if any case got slower than a threshold.
+
+    python -m benchmarks run --save baseline.json
+    python -m benchmarks compare baseline.json --threshold 0.1
+    python -m benchmarks compare baseline.json current.json
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Version of the baseline file layout
+VERSION = 1
+
+# {case name: function returning the callable to time}
+CASES = {}
+
+
+def case(name: str):
+    """
+    Register a benchmark case. The decorated function does any setup and returns a callable that does one
+    operation.
+
+    :param name: dotted case name, e.g. 'unit.mul'
+    """
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def _selected(patterns) -> list:
+    """
+    Get the case names matching any of the glob patterns, or all of them
+    """
+    from . import cases  # noqa: F401 registers the cases
+
+    names = sorted(CASES)
+    if not patterns:
+        return names
+    return [name for name in names if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)]
+
+
+def time_case(name: str, repeat: int = 5) -> dict:
+    """
+    Time a case, taking the best of several runs
+
+    :param name: case name
+    :param repeat: number of timed runs
+    :return: {'ns_per_op', 'ops_per_s', 'loops', 'repeat'}
+    """
+    timer = timeit.Timer(CASES[name]())
+    loops, _ = timer.autorange()
+    best = min(timer.repeat(repeat, loops)) / loops
+    return {
+        'ns_per_op': best * 1e9,
+        'ops_per_s': 1 / best if best else float('inf'),
+        'loops': loops,
+        'repeat': repeat,
+    }
+
+
+def run(patterns=(), repeat: int = 5, report=None) -> dict:
+    """
+    Run the selected cases
+
+    :param patterns: glob patterns of case names to run, all of them if empty
+    :param repeat: number of timed runs for each case
+    :param report: called with (name, result) as each case finishes
+    :return: baseline document
+    """
+    results = {}
+    for name in _selected(patterns):
+        results[name] = time_case(name, repeat)
+        if report is not None:
+            report(name, results[name])
+    return {
+        'version': VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def save(document: dict, path: str):
+    with open(path, 'wt', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load(path: str) -> dict:
+    with open(path, 'rt', encoding='utf-8') as f:
+        document = json.load(f)
+    if document.get('version') != VERSION:
+        raise ValueError(f'{path} is not a version {VERSION} benchmark baseline')
+    return document
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> list:
+    """
+    Compare two runs case by case
+
+    :param baseline: baseline document
+    :param current: document for the run being judged
+    :param threshold: fraction slower than the baseline a case can be before it counts as a regression
+    :return: list of (name, baseline ns, current ns or None, ratio or None, regressed), for every case in either run
+    """
+    rows = []
+    for name in sorted(set(baseline['results']) | set(current['results'])):
+        before = baseline['results'].get(name)
+        after = current['results'].get(name)
+        if before is None or after is None:
+            rows.append((name, before and before['ns_per_op'], after and after['ns_per_op'], None, False))
+            continue
+        ratio = after['ns_per_op'] / before['ns_per_op']
+        rows.append((name, before['ns_per_op'], after['ns_per_op'], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def _print_result(name: str, result: dict):
+    print(f'{name:32s} {result["ns_per_op"]:12,.1f} ns/op {result["ops_per_s"]:14,.0f} ops/s')
+
+
+def _print_comparison(rows: list, threshold: float) -> int:
+    """
+    Print a comparison table
+
+    :return: number of regressions
+    """
+    regressions = 0
+    for name, before, after, ratio, regressed in rows:
+        if ratio is None:
+            side = 'baseline' if after is None else 'current run'
+            print(f'{name:32s} only in the {side}')
+            continue
+        flag = 'REGRESSED' if regressed else ''
+        print(f'{name:32s} {before:12,.1f} -> {after:12,.1f} ns/op {ratio:7.2f}x {flag}')
+        regressions += regressed
+    print(f'{regressions} regression{"" if regressions == 1 else "s"} past {threshold:.0%}')
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='PyQuantity throughput benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    listing = commands.add_parser('list', help='list the benchmark cases')
+    listing.add_argument('patterns', nargs='*', help='glob patterns of cases')
+
+    running = commands.add_parser('run', help='run the benchmarks')
+    running.add_argument('patterns', nargs='*', help='glob patterns of cases to run, e.g. "unit.*"')
+    running.add_argument('--repeat', type=int, default=5, help='timed runs per case, the best is kept')
+    running.add_argument('--save', metavar='PATH', help='save the results as a JSON baseline')
+
+    comparing = commands.add_parser('compare', help='compare a run against a baseline')
+    comparing.add_argument('baseline', help='JSON baseline')
+    comparing.add_argument('current', nargs='?', help='JSON results to judge, the benchmarks are run if not given')
+    comparing.add_argument('--threshold', type=float, default=0.1,
+                           help='fraction slower than the baseline that counts as a regression (default 0.1)')
+    comparing.add_argument('--repeat', type=int, default=5, help='timed runs per case, the best is kept')
+    comparing.add_argument('-k', dest='patterns', action='append', default=[], help='glob pattern of cases to run')
+    comparing.add_argument('--save', metavar='PATH', help='save the new results as a JSON baseline')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for name in _selected(args.patterns):
+            print(name)
+        return 0
+
+    if args.command == 'run':
+        document = run(args.patterns, args.repeat, _print_result)
+        if args.save:
+            save(document, args.save)
+        return 0
+
+    baseline = load(args.baseline)
+    if args.patterns:
+        baseline['results'] = {name: result for name, result in baseline['results'].items()
+                               if any(fnmatch.fnmatchcase(name, pattern) for pattern in args.patterns)}
+    if args.current:
+        current = load(args.current)
+    else:
+        patterns = args.patterns or list(baseline['results'])
+        current = run(patterns, args.repeat)
+        if args.save:
+            save(current, args.save)
+    return 1 if _print_comparison(compare(baseline, current, args.threshold), args.threshold) else 0
@@ -1,6 +1,35 @@
 __author__ = 'akm'
-from . import unit
-from . import prefix
-from . import quantity
-from . import bit_field
-from . import quantity_config_parser
+"""
+Submodules are imported the first time they are used, e.g. ``quantity.aggregate`` or ``from quantity import
+converter``, so importing one part of the library doesn't pay for the rest (numpy and multiprocessing in particular).
+"""
+
+import importlib
+
+_SUBMODULES = ('registry', 'instrumentation', 'unit', 'prefix', 'unit_parser', 'quantity', 'converter', 'bit_field',
+               'quantity_config_parser', 'quantity_reader', 'quantity_file', 'packing', 'parallel', 'quantity_index',
+               'aggregate', 'quantity_stats', 'fixed_quantity', 'expression', 'unit_check', 'quantity_array',
+               'optional', 'registry_file')
+
+# Names re-exported from a submodule: name -> (submodule, attribute)
+_EXPORTS = {
+    'stats': ('instrumentation', 'stats'),
+    'reset_stats': ('instrumentation', 'reset'),
+}
+
+__all__ = _SUBMODULES + tuple(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    if name in _EXPORTS:
+        module, attribute = _EXPORTS[name]
+        value = getattr(importlib.import_module(f'{__name__}.{module}'), attribute)
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+from .aggregate import sum, mean, min, max
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+Aggregates over any iterable of quantities with the same unit. The base values are streamed in one pass into
+:func:`math.fsum`, so memory doesn't grow with the number of values, there is a single :mod:`Quantity` made for the
+result and no rounding drift however many values there are. The names shadow the builtins, so use them as
+``aggregate.sum(...)``.
+"""
+
+import math
+import operator
+
+from quantity.unit import Unit, NoUnit
+from quantity.quantity import Quantity
+from quantity.optional import is_quantity_array
+
+
+def _accumulate(quantities) -> tuple:
+    """
+    Add up the base values of some quantities, which must all have the same unit. The values are streamed into
+    :func:`math.fsum` and counted as they go past, so nothing is held on to.
+
+    :param quantities: iterable of :mod:`Quantity` or a :mod:`QuantityArray`
+    :return: (:mod:`Unit` or None if there were no quantities, total of the base values, how many there were)
+    """
+    if is_quantity_array(quantities):
+        return quantities.unit, math.fsum(quantities.values), len(quantities.values)
+
+    iterator = iter(quantities)
+    for first in iterator:
+        break
+    else:
+        return None, 0.0, 0
+
+    unit = first.unit
+    count = 1
+
+    def values():
+        nonlocal count
+        yield first._value
+        for q in iterator:
+            assert q.unit is unit, (q.unit, unit)
+            count += 1
+            yield q._value
+
+    total = math.fsum(values())
+    return unit, total, count
+
+
+def sum(quantities, unit: Unit = NoUnit) -> Quantity:
+    """
+    Add up quantities
+
+    >>> aggregate.sum(Quantity(v, 'mV') for v in range(1000))
+    0.4995 kV
+
+    :param quantities: iterable of :mod:`Quantity` or a :mod:`QuantityArray`
+    :param unit: :mod:`Unit` of the result if there are no quantities
+    :return: :mod:`Quantity`
+    """
+    found, total, _ = _accumulate(quantities)
+    return Quantity._from_base(total, unit if found is None else found)
+
+
+def mean(quantities) -> Quantity:
+    """
+    Get the mean of some quantities
+
+    :param quantities: iterable of :mod:`Quantity` or a :mod:`QuantityArray`
+    :return: :mod:`Quantity`
+    :raises ValueError: if there are no quantities
+    """
+    unit, total, count = _accumulate(quantities)
+    if not count:
+        raise ValueError('mean of no quantities')
+    return Quantity._from_base(total / count, unit)
+
+
+def _extreme(quantities, better) -> Quantity:
+    """
+    Find the smallest or largest quantity
+
+    :param quantities: iterable of :mod:`Quantity`
+    :param better: is a base value better than the best so far
+    :return: the :mod:`Quantity` found
+    :raises ValueError: if there are no quantities
+    """
+    iterator = iter(quantities)
+    for best in iterator:
+        break
+    else:
+        raise ValueError('no quantities')
+
+    unit = best.unit
+    value = best._value
+    for q in iterator:
+        assert q.unit is unit, (q.unit, unit)
+        if better(q._value, value):
+            best = q
+            value = q._value
+    return best
+
+
+def min(quantities) -> Quantity:
+    """
+    Get the smallest quantity, whatever the prefixes
+
+    :param quantities: iterable of :mod:`Quantity` or a :mod:`QuantityArray`
+    :return: the smallest :mod:`Quantity`, the first if there are several
+    :raises ValueError: if there are no quantities
+    """
+    if is_quantity_array(quantities):
+        return quantities.min()
+    return _extreme(quantities, operator.lt)
+
+
+def max(quantities) -> Quantity:
+    """
+    Get the largest quantity, whatever the prefixes
+
+    :param quantities: iterable of :mod:`Quantity` or a :mod:`QuantityArray`
+    :return: the largest :mod:`Quantity`, the first if there are several
+    :raises ValueError: if there are no quantities
+    """
+    if is_quantity_array(quantities):
+        return quantities.max()
+    return _extreme(quantities, operator.gt)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+Converters work out the scale and offset between a source and target unit (and prefix) once, and then apply it to
+raw numbers, so converting lots of values doesn't make a :mod:`Quantity` for each one.
+"""
+
+from array import array
+
+from quantity.unit import Unit, get_affine_conversion
+from quantity.prefix import Prefix
+from quantity.unit_parser import parse_unit
+from quantity.optional import import_numpy, is_ndarray
+import quantity.prefix.prefixes as prefixes
+
+# memoryview formats taken as numbers, and ones taken as the raw bytes of doubles
+_FLOAT_FORMATS = frozenset('df')
+_BYTE_FORMATS = frozenset('Bbc')
+
+
+def _resolve(unit: Unit | str, prefix: Prefix) -> tuple:
+    """
+    Get the power and unit for a unit string or :mod:`Unit` and extra prefix
+
+    :param unit: unit string (with optional prefix) or :mod:`Unit`
+    :param prefix: extra :mod:`Prefix` to apply
+    :return: (power of 10, :mod:`Unit`)
+    """
+    if isinstance(unit, str):
+        unit_prefix, unit = parse_unit(unit)
+        return unit_prefix.power + prefix.power, unit
+    return prefix.power, unit
+
+
+class Converter:
+    """
+    A reusable conversion from one unit and prefix to another, for raw numbers.
+
+    >>> to_mv = Converter('kV', 'mV')
+    >>> to_mv(1.5)
+    1500000.0
+    >>> to_f = Converter('°C', '°F')
+    >>> to_f([0, 100])
+    [32.0, 212.0]
+
+    :param source: unit string (with optional prefix) or :mod:`Unit` to convert from
+    :param target: unit string (with optional prefix) or :mod:`Unit` to convert to
+    :param source_prefix: extra prefix on the source values
+    :param target_prefix: extra prefix on the target values
+    """
+
+    __slots__ = ('source', 'target', 'scale', 'offset')
+
+    def __init__(self, source: Unit | str, target: Unit | str, source_prefix: Prefix = prefixes.NoPrefix,
+                 target_prefix: Prefix = prefixes.NoPrefix):
+        source_power, self.source = _resolve(source, source_prefix)
+        target_power, self.target = _resolve(target, target_prefix)
+
+        if self.source is self.target:
+            scale, offset = 1.0, 0.0
+        else:
+            conversion = get_affine_conversion((self.source, self.target))
+            if conversion is None:
+                raise ValueError(f'No conversion from {self.source!r} to {self.target!r}')
+            scale, offset = conversion
+
+        # value * 10 ** source_power -> base units -> scale and offset -> / 10 ** target_power
+        power = source_power - target_power
+        if power < 0:
+            scale /= 10 ** -power
+        else:
+            scale *= 10 ** power
+        if target_power < 0:
+            offset *= 10 ** -target_power
+        else:
+            offset /= 10 ** target_power
+        self.scale = scale
+        self.offset = offset
+
+    def __call__(self, values):
+        """
+        Convert raw numbers.
+
+        :param values: a number, a numpy array, an :mod:`array.array`, a buffer of doubles (or floats, or the raw bytes
+                       of doubles) or any other iterable
+        :return: a float for a number, a new numpy array for arrays and buffers (or a list of floats without numpy),
+                 an ``array('d')`` for an :mod:`array.array` and a list of floats for anything else
+        """
+        scale, offset = self.scale, self.offset
+        if isinstance(values, (int, float)):
+            return values * scale + offset
+
+        if is_ndarray(values):
+            return values * scale + offset
+
+        if isinstance(values, array):
+            out = array('d', values)
+            numpy = import_numpy() if out else None
+            if numpy is not None:
+                converted = numpy.frombuffer(out, dtype=numpy.float64)
+                converted *= scale
+                converted += offset
+                return out
+            return array('d', [v * scale + offset for v in out])
+
+        if isinstance(values, memoryview):
+            if values.format in _BYTE_FORMATS:
+                # Raw bytes, read them as the doubles they hold
+                values = values.cast('d')
+            elif values.format not in _FLOAT_FORMATS:
+                raise TypeError(f"Can't convert a buffer of {values.format!r}, only doubles, floats or raw bytes")
+            numpy = import_numpy()
+            if numpy is not None:
+                return numpy.asarray(values, dtype=numpy.float64) * scale + offset
+            values = values.tolist()
+
+        return [v * scale + offset for v in values]
+
+    def inverse(self) -> Converter:
+        """
+        Get the converter going the other way
+
+        :return: :mod:`Converter`
+        """
+        obj = Converter.__new__(Converter)
+        obj.source = self.target
+        obj.target = self.source
+        obj.scale = 1.0 / self.scale
+        obj.offset = -self.offset / self.scale
+        return obj
+
+    def __repr__(self) -> str:
+        return f'<Converter: {self.source!r} -> {self.target!r} (* {self.scale} + {self.offset})>'
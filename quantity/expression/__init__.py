@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+from .expression import Expression, Symbol, Constant, CompiledExpression, lazy
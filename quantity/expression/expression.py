@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+Lazy quantity expressions. Arithmetic on :mod:`Symbol` and :mod:`Constant` objects builds an expression graph rather
+than computing anything. The unit of the result is worked out once, over the graph, and the graph compiles to a single
+python function of raw numbers, so a formula can be evaluated over and over (or over numpy arrays) without making any
+intermediate :mod:`Quantity` or :mod:`Unit` objects.
+"""
+
+import abc
+from numbers import Number
+
+from quantity.unit import Unit, NoUnit
+from quantity.quantity import Quantity
+from quantity.unit_parser import parse_unit
+import quantity.prefix.prefixes as prefixes
+
+_unit_operations = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '/': lambda a, b: a / b,
+}
+
+
+def lazy(value) -> Expression:
+    """
+    Wrap a :mod:`Quantity` or number as a constant in an expression, an expression is returned unchanged
+
+    :param value: :mod:`Quantity`, number or :mod:`Expression`
+    :return: :mod:`Expression`
+    """
+    if isinstance(value, Expression):
+        return value
+    return Constant(value)
+
+
+class Expression(abc.ABC):
+    """
+    A node of a lazy quantity expression
+    """
+
+    __slots__ = ('_unit', '_compiled')
+
+    def __init__(self):
+        self._unit = None
+        self._compiled = None
+
+    def __add__(self, o) -> Expression:
+        return BinaryOperation('+', self, lazy(o))
+
+    def __radd__(self, o) -> Expression:
+        return BinaryOperation('+', lazy(o), self)
+
+    def __sub__(self, o) -> Expression:
+        return BinaryOperation('-', self, lazy(o))
+
+    def __rsub__(self, o) -> Expression:
+        return BinaryOperation('-', lazy(o), self)
+
+    def __mul__(self, o) -> Expression:
+        return BinaryOperation('*', self, lazy(o))
+
+    def __rmul__(self, o) -> Expression:
+        return BinaryOperation('*', lazy(o), self)
+
+    def __truediv__(self, o) -> Expression:
+        return BinaryOperation('/', self, lazy(o))
+
+    def __rtruediv__(self, o) -> Expression:
+        return BinaryOperation('/', lazy(o), self)
+
+    def __neg__(self) -> Expression:
+        return Negation(self)
+
+    def __pow__(self, index: int) -> Expression:
+        return Power(self, index)
+
+    @property
+    def unit(self) -> Unit:
+        """
+        The unit of the result, worked out once
+        """
+        if self._unit is None:
+            self._unit = self._resolve_unit()
+        return self._unit
+
+    @abc.abstractmethod
+    def _resolve_unit(self) -> Unit:
+        """
+        Work out the unit of this node from its operands
+        """
+
+    @abc.abstractmethod
+    def _source(self, symbols: dict, constants: dict) -> str:
+        """
+        Python source for this node
+
+        :param symbols: {name: (argument name, :mod:`Symbol`)}, filled in as symbols are found
+        :param constants: {constant name: value}, filled in as constants are found
+        :return: python expression
+        """
+
+    def compile(self) -> CompiledExpression:
+        """
+        Compile to a single function of raw numbers, one argument per symbol in the order they first appear
+
+        :return: :mod:`CompiledExpression`
+        """
+        if self._compiled is None:
+            self._compiled = CompiledExpression(self)
+        return self._compiled
+
+    def evaluate(self, *args, **kwargs) -> Quantity:
+        """
+        Evaluate for one set of symbol values
+
+        :return: :mod:`Quantity`
+        """
+        return self.compile().quantity(*args, **kwargs)
+
+
+class Symbol(Expression):
+    """
+    A named input to an expression. Values given for it are raw numbers in its unit (and prefix)
+
+    >>> v = Symbol('v', 'kV')
+    >>> i = Symbol('i', 'A')
+    >>> power = (v * i).compile()
+    >>> power.unit
+    watt
+    >>> power(2, 3)
+    6000.0
+
+    :param name: name of the input, used for keyword arguments
+    :param unit: unit string (with optional prefix) or :mod:`Unit`
+    """
+
+    __slots__ = ('name', 'symbol_unit', 'scale')
+
+    def __init__(self, name: str, unit: Unit | str = NoUnit):
+        super().__init__()
+        self.name = name
+        prefix = prefixes.NoPrefix
+        if isinstance(unit, str):
+            prefix, unit = parse_unit(unit)
+        self.symbol_unit = unit
+        self.scale = 1 * prefix
+
+    def _resolve_unit(self) -> Unit:
+        return self.symbol_unit
+
+    def _source(self, symbols: dict, constants: dict) -> str:
+        known = symbols.get(self.name)
+        if known is None:
+            known = symbols[self.name] = (f'_a{len(symbols)}', self)
+        elif known[1].symbol_unit is not self.symbol_unit or known[1].scale != self.scale:
+            raise ValueError(f'Symbol {self.name} is used with different units')
+        if self.scale == 1:
+            return known[0]
+        return f'({known[0]} * {self.scale!r})'
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+class Constant(Expression):
+    """
+    A fixed :mod:`Quantity` or number in an expression
+    """
+
+    __slots__ = ('value', 'constant_unit')
+
+    def __init__(self, value: Quantity | Number):
+        super().__init__()
+        if isinstance(value, Quantity):
+            self.value = float(value)
+            self.constant_unit = value.unit
+        elif isinstance(value, Number):
+            self.value = value
+            self.constant_unit = NoUnit
+        else:
+            raise TypeError(f'Cannot use {value!r} in a quantity expression')
+
+    def _resolve_unit(self) -> Unit:
+        return self.constant_unit
+
+    def _source(self, symbols: dict, constants: dict) -> str:
+        name = f'_c{len(constants)}'
+        constants[name] = self.value
+        return name
+
+    def __repr__(self) -> str:
+        return repr(Quantity._from_base(self.value, self.constant_unit))
+
+
+class BinaryOperation(Expression):
+    """
+    Two expressions combined with +, -, * or /
+    """
+
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op: str, left: Expression, right: Expression):
+        super().__init__()
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def _resolve_unit(self) -> Unit:
+        return _unit_operations[self.op](self.left.unit, self.right.unit)
+
+    def _source(self, symbols: dict, constants: dict) -> str:
+        return f'({self.left._source(symbols, constants)} {self.op} {self.right._source(symbols, constants)})'
+
+    def __repr__(self) -> str:
+        return f'({self.left!r} {self.op} {self.right!r})'
+
+
+class Negation(Expression):
+    """
+    A negated expression
+    """
+
+    __slots__ = ('operand',)
+
+    def __init__(self, operand: Expression):
+        super().__init__()
+        self.operand = operand
+
+    def _resolve_unit(self) -> Unit:
+        return self.operand.unit
+
+    def _source(self, symbols: dict, constants: dict) -> str:
+        return f'(-{self.operand._source(symbols, constants)})'
+
+    def __repr__(self) -> str:
+        return f'-{self.operand!r}'
+
+
+class Power(Expression):
+    """
+    An expression raised to an integer power
+    """
+
+    __slots__ = ('operand', 'index')
+
+    def __init__(self, operand: Expression, index: int):
+        super().__init__()
+        if not isinstance(index, int):
+            raise TypeError('Quantity expressions can only be raised to integer powers')
+        self.operand = operand
+        self.index = index
+
+    def _resolve_unit(self) -> Unit:
+        return self.operand.unit ** self.index
+
+    def _source(self, symbols: dict, constants: dict) -> str:
+        return f'({self.operand._source(symbols, constants)} ** {self.index})'
+
+    def __repr__(self) -> str:
+        return f'{self.operand!r} ** {self.index}'
+
+
+class CompiledExpression:
+    """
+    An expression compiled to one python function. Calling it with raw numbers (or numpy arrays) for each symbol
+    returns the raw result as an SI base value of :attr:`unit`.
+
+    :param expression: :mod:`Expression` to compile
+    """
+
+    __slots__ = ('function', 'unit', 'symbols', 'source')
+
+    def __init__(self, expression: Expression):
+        # Resolving the unit first checks the unit algebra before anything is compiled
+        self.unit = expression.unit
+        symbols, constants = {}, {}
+        body = expression._source(symbols, constants)
+        self.symbols = tuple(symbols)
+        arguments = ', '.join(argument for argument, _ in symbols.values())
+        self.source = f'lambda {arguments}: {body}'
+        self.function = eval(self.source, dict(constants))
+
+    def __call__(self, *args, **kwargs):
+        if kwargs:
+            missing = [name for name in self.symbols[len(args):] if name not in kwargs]
+            if missing:
+                raise TypeError(f'missing symbol {missing[0]}')
+            args += tuple(kwargs.pop(name) for name in self.symbols[len(args):])
+            if kwargs:
+                raise TypeError(f'Unknown symbols {", ".join(kwargs)}')
+        return self.function(*args)
+
+    def quantity(self, *args, **kwargs) -> Quantity:
+        """
+        Evaluate and wrap the result in a :mod:`Quantity`
+        """
+        return Quantity._from_base(self(*args, **kwargs), self.unit)
+
+    def __repr__(self) -> str:
+        return f'<CompiledExpression: {self.source} [{self.unit}]>'
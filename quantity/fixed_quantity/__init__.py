@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+from .fixed_quantity import FixedQuantity
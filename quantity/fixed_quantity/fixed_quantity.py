@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+Fixed point quantities for things that are counted rather than measured: bytes, ticks, meter pulses. The value is an
+integer mantissa and a power of 10 exponent, so arithmetic and prefix changes are integer multiplies and shifts, never
+floats. Results are exact (or rounded half to even where a division or rescale has to drop digits) and the same on
+every machine.
+"""
+
+from decimal import Decimal
+from fractions import Fraction
+
+from quantity.unit import Unit, NoUnit
+from quantity.prefix import Prefix, get_prefix, has_prefix, int_exponent, prefix_for_exponent
+from quantity.quantity import Quantity
+from quantity.unit_parser import parse_unit
+import quantity.prefix.prefixes as prefixes
+
+
+def _divide(numerator: int, denominator: int) -> int:
+    """
+    Integer division rounding half to even
+    """
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if denominator < 0:
+        twice, denominator = -twice, -denominator
+    if twice > denominator or (twice == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def _rescale(mantissa: int, exponent: int, to: int) -> int:
+    """
+    Express mantissa * 10 ** exponent as a mantissa for another exponent, rounding half to even if digits are lost
+    """
+    if to <= exponent:
+        return mantissa * 10 ** (exponent - to)
+    return _divide(mantissa, 10 ** (to - exponent))
+
+
+def _format(mantissa: int, exponent: int) -> str:
+    """
+    Render mantissa * 10 ** exponent as an exact decimal string
+    """
+    sign = '-' if mantissa < 0 else ''
+    digits = str(abs(mantissa))
+    if exponent >= 0:
+        return f'{sign}{digits}{"0" * exponent if mantissa else ""}'
+    digits = digits.rjust(1 - exponent, '0')
+    whole, fraction = digits[:exponent], digits[exponent:].rstrip('0')
+    return f'{sign}{whole}.{fraction}' if fraction else f'{sign}{whole}'
+
+
+class FixedQuantity:
+    """
+    A quantity held as an integer mantissa and a base 10 exponent, mantissa * 10 ** exponent in SI base units.
+
+    >>> sent = FixedQuantity(1536, 'B')
+    >>> sent + FixedQuantity(2, 'kB')
+    3.536 kB
+    >>> (sent * 3).to('kB')
+    5
+    >>> FixedQuantity(15000, 'J') / 4
+    3.75 kJ
+    >>> FixedQuantity(15, 'kJ') / 4
+    4 kJ
+
+    :param amount: an int, or a :class:`decimal.Decimal` / decimal string for exact fractional amounts
+    :param unit: The unit, this can be a string (with optional power prefix) or a :mod:`Unit` object.
+    :param prefix: A SI power prefix to be applied to the amount.
+    :param exponent: the exponent to hold the value at, which sets the resolution of the results of division. If not
+                     given it is the one the amount is written in, e.g. 15 kJ is held in kJ and 15.25 kJ in tens of J.
+                     Amounts that need more digits than this are rounded half to even.
+    """
+
+    __slots__ = ('mantissa', 'exponent', 'unit')
+
+    def __init__(self, amount: int | Decimal | str, unit: Unit | str = NoUnit, prefix: Prefix = prefixes.NoPrefix,
+                 exponent: int | None = None):
+        power = prefix.power
+        if isinstance(unit, str):
+            unit_prefix, unit = parse_unit(unit)
+            power += unit_prefix.power
+
+        if isinstance(amount, int):
+            mantissa, amount_exponent = amount, 0
+        elif isinstance(amount, (Decimal, str)):
+            sign, digits, amount_exponent = Decimal(amount).as_tuple()
+            if not isinstance(amount_exponent, int):
+                raise ValueError(f'{amount} is not a finite amount')
+            mantissa = int(''.join(map(str, digits)) or 0)
+            if sign:
+                mantissa = -mantissa
+        else:
+            raise TypeError(f'FixedQuantity amounts must be exact, not {type(amount).__name__}')
+
+        amount_exponent += power
+        if exponent is None:
+            exponent = amount_exponent
+        self.mantissa = _rescale(mantissa, amount_exponent, exponent)
+        self.exponent = exponent
+        self.unit = unit
+
+    @classmethod
+    def _from_parts(cls, mantissa: int, exponent: int, unit: Unit) -> FixedQuantity:
+        """
+        Make a FixedQuantity without any parsing
+
+        :param mantissa: integer mantissa
+        :param exponent: power of 10 of the mantissa, in base units
+        :param unit: :mod:`Unit` object
+        :return: :mod:`FixedQuantity`
+        """
+        obj = cls.__new__(cls)
+        obj.mantissa = mantissa
+        obj.exponent = exponent
+        obj.unit = unit
+        return obj
+
+    @classmethod
+    def from_quantity(cls, q: Quantity, exponent: int = 0) -> FixedQuantity:
+        """
+        Convert a :mod:`Quantity`, rounding its base value to a number of decimal places
+
+        :param q: :mod:`Quantity`
+        :param exponent: power of 10 to hold the value at, e.g. -3 for thousandths of the base unit
+        :return: :mod:`FixedQuantity`
+        """
+        value = Fraction(float(q)) * Fraction(10) ** -exponent
+        return cls._from_parts(_divide(value.numerator, value.denominator), exponent, q.unit)
+
+    def to_quantity(self) -> Quantity:
+        """
+        Convert to a (float) :mod:`Quantity`
+        """
+        return Quantity._from_base(float(self), self.unit)
+
+    def rescale(self, exponent: int) -> FixedQuantity:
+        """
+        Hold the value at another exponent, rounding half to even if digits are lost
+
+        :param exponent: new power of 10
+        :return: :mod:`FixedQuantity`
+        """
+        if exponent == self.exponent:
+            return self
+        return self._from_parts(_rescale(self.mantissa, self.exponent, exponent), exponent, self.unit)
+
+    def _aligned(self, o: FixedQuantity) -> tuple:
+        """
+        Get both mantissas at the finer of the two exponents
+
+        :return: (our mantissa, their mantissa, exponent)
+        """
+        if self.exponent == o.exponent:
+            return self.mantissa, o.mantissa, self.exponent
+        if self.exponent < o.exponent:
+            return self.mantissa, o.mantissa * 10 ** (o.exponent - self.exponent), self.exponent
+        return self.mantissa * 10 ** (self.exponent - o.exponent), o.mantissa, o.exponent
+
+    def __add__(self, o: FixedQuantity) -> FixedQuantity:
+        if not isinstance(o, FixedQuantity):
+            return NotImplemented
+        unit = self.unit + o.unit
+        a, b, exponent = self._aligned(o)
+        return self._from_parts(a + b, exponent, unit)
+
+    def __sub__(self, o: FixedQuantity) -> FixedQuantity:
+        if not isinstance(o, FixedQuantity):
+            return NotImplemented
+        unit = self.unit - o.unit
+        a, b, exponent = self._aligned(o)
+        return self._from_parts(a - b, exponent, unit)
+
+    def __mul__(self, o: FixedQuantity | int) -> FixedQuantity:
+        if isinstance(o, FixedQuantity):
+            return self._from_parts(self.mantissa * o.mantissa, self.exponent + o.exponent, self.unit * o.unit)
+        if isinstance(o, int):
+            return self._from_parts(self.mantissa * o, self.exponent, self.unit)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def divide(self, o: FixedQuantity | int, exponent: int | None = None) -> FixedQuantity:
+        """
+        Divide, rounding half to even at a chosen exponent
+
+        :param o: :mod:`FixedQuantity` or int
+        :param exponent: power of 10 to hold the result at, our exponent if not given
+        :return: :mod:`FixedQuantity`
+        """
+        if exponent is None:
+            exponent = self.exponent
+        if isinstance(o, int):
+            mantissa, o_exponent, unit = o, 0, self.unit
+        else:
+            mantissa, o_exponent, unit = o.mantissa, o.exponent, self.unit / o.unit
+        if not mantissa:
+            raise ZeroDivisionError('FixedQuantity division by zero')
+        # (a * 10 ** ea) / (b * 10 ** eb) = q * 10 ** exponent
+        shift = self.exponent - o_exponent - exponent
+        if shift >= 0:
+            return self._from_parts(_divide(self.mantissa * 10 ** shift, mantissa), exponent, unit)
+        return self._from_parts(_divide(self.mantissa, mantissa * 10 ** -shift), exponent, unit)
+
+    def __truediv__(self, o: FixedQuantity | int) -> FixedQuantity:
+        if not isinstance(o, (FixedQuantity, int)):
+            return NotImplemented
+        return self.divide(o)
+
+    def __neg__(self) -> FixedQuantity:
+        return self._from_parts(-self.mantissa, self.exponent, self.unit)
+
+    def __abs__(self) -> FixedQuantity:
+        return self._from_parts(abs(self.mantissa), self.exponent, self.unit)
+
+    def __pow__(self, index: int) -> FixedQuantity:
+        if not isinstance(index, int) or index < 0:
+            return NotImplemented
+        return self._from_parts(self.mantissa ** index, self.exponent * index, self.unit ** index)
+
+    def __bool__(self) -> bool:
+        return bool(self.mantissa)
+
+    def __int__(self) -> int:
+        """
+        The value in base units, rounded half to even
+        """
+        return _rescale(self.mantissa, self.exponent, 0)
+
+    def __float__(self) -> float:
+        if self.exponent >= 0:
+            return float(self.mantissa * 10 ** self.exponent)
+        return self.mantissa / 10 ** -self.exponent
+
+    def _compared(self, o) -> tuple:
+        """
+        Get both mantissas at the same exponent to compare, units have to match
+        """
+        assert o.unit is self.unit, (o.unit, self.unit)
+        return self._aligned(o)[:2]
+
+    def __eq__(self, o) -> bool:
+        if not isinstance(o, FixedQuantity):
+            if self.unit is NoUnit and isinstance(o, int):
+                o = self._from_parts(o, 0, NoUnit)
+            else:
+                return NotImplemented
+        if o.unit is not self.unit:
+            return False
+        a, b = self._aligned(o)[:2]
+        return a == b
+
+    def __hash__(self) -> int:
+        # Strip trailing zeros so equal values hash the same whatever their exponents
+        mantissa, exponent = self.mantissa, self.exponent
+        if not mantissa:
+            exponent = 0
+        else:
+            while not mantissa % 10:
+                mantissa //= 10
+                exponent += 1
+        if self.unit is NoUnit and exponent >= 0:
+            return hash(mantissa * 10 ** exponent)
+        return hash((mantissa, exponent, self.unit))
+
+    def __lt__(self, o: FixedQuantity) -> bool:
+        a, b = self._compared(o)
+        return a < b
+
+    def __le__(self, o: FixedQuantity) -> bool:
+        a, b = self._compared(o)
+        return a <= b
+
+    def __gt__(self, o: FixedQuantity) -> bool:
+        a, b = self._compared(o)
+        return a > b
+
+    def __ge__(self, o: FixedQuantity) -> bool:
+        a, b = self._compared(o)
+        return a >= b
+
+    @property
+    def prefix(self) -> Prefix:
+        """
+        The largest prefix that keeps the display amount at least 1, worked out from the digits
+        """
+        if not self.mantissa:
+            return prefixes.NoPrefix
+        return prefix_for_exponent(int_exponent(abs(self.mantissa)) + self.exponent)
+
+    @property
+    def amount(self) -> Decimal:
+        """
+        The exact amount in terms of :attr:`prefix`
+        """
+        return Decimal(_format(self.mantissa, self.exponent - self.prefix.power))
+
+    def to(self, prefix: Prefix | str) -> int | None:
+        """
+        The amount in terms of another prefix, rounded half to even e.g.
+
+        >>> FixedQuantity(1536, 'B').to('kB')
+        2
+
+        :param prefix: A prefix / unit to convert to
+        :return: int, or None for an invalid prefix
+        """
+        if not isinstance(prefix, Prefix):
+            if self.unit.unit and prefix.endswith(self.unit.unit):
+                prefix = prefix[:-len(self.unit.unit)]
+            if not prefix:
+                return int(self)
+            if not has_prefix(prefix):
+                return None
+            prefix = get_prefix(prefix)
+        return _rescale(self.mantissa, self.exponent, prefix.power)
+
+    def __reduce__(self):
+        return type(self)._from_parts, (self.mantissa, self.exponent, self.unit)
+
+    def __repr__(self) -> str:
+        prefix = self.prefix
+        return f'{_format(self.mantissa, self.exponent - prefix.power)} {prefix}{self.unit}'
+
+    __str__ = __repr__
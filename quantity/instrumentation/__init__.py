@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+from .instrumentation import enable, disable, instrumented, record, timed, stats, reset
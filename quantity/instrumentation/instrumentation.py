@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+Opt-in counters and timers for the library's slow paths: unit strings that fall back to a suffix scan, temporary and
+compound units being made, registry lookups of unit products and quotients, closest prefix searches and conversion
+chains. Everything is off by default and each instrumented spot is guarded by a check of :data:`enabled`, so the
+cost when switched off is one attribute lookup on paths that are already the slow ones.
+
+>>> with instrumented():
+...     print(Quantity(1, 'kV') * Quantity(2, 'mA'))
+...     counts = stats()
+2.0 W
+>>> counts['prefix.closest_prefix']['count']
+1
+
+Set the environment variable ``PYQUANTITY_STATS=1`` to switch it on at import time.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from time import perf_counter_ns
+
+enabled = bool(os.environ.get('PYQUANTITY_STATS'))
+
+# name -> [calls, nanoseconds]
+_stats = {}
+_lock = threading.Lock()
+
+
+def enable(on: bool = True):
+    """
+    Turn the counters on (or off)
+
+    :param on: Whether to count
+    """
+    global enabled
+    enabled = bool(on)
+
+
+def disable():
+    """
+    Turn the counters off, what has been counted so far is kept until :func:`reset`
+    """
+    enable(False)
+
+
+@contextmanager
+def instrumented(reset_first: bool = True):
+    """
+    Count within a block, putting :data:`enabled` back as it was afterwards
+
+    :param reset_first: Start from zero
+    """
+    global enabled
+    was = enabled
+    if reset_first:
+        reset()
+    enabled = True
+    try:
+        yield
+    finally:
+        enabled = was
+
+
+def record(name: str, elapsed: int = 0, calls: int = 1):
+    """
+    Add to a counter, only call this when :data:`enabled` is set
+
+    :param name: counter name
+    :param elapsed: nanoseconds spent
+    :param calls: how many calls to count
+    """
+    with _lock:
+        entry = _stats.get(name)
+        if entry is None:
+            _stats[name] = [calls, elapsed]
+        else:
+            entry[0] += calls
+            entry[1] += elapsed
+
+
+def timed(name: str, function, *args):
+    """
+    Call a function, counting and timing it under a name
+
+    :param name: counter name
+    :param function: what to call
+    :param args: arguments for the function
+    :return: whatever the function returns
+    """
+    start = perf_counter_ns()
+    try:
+        return function(*args)
+    finally:
+        record(name, perf_counter_ns() - start)
+
+
+def stats() -> dict:
+    """
+    Get the counters so far
+
+    :return: {name: {'count': calls, 'seconds': time spent in timed calls}}, sorted by name
+    """
+    with _lock:
+        items = sorted((name, tuple(entry)) for name, entry in _stats.items())
+    return {name: {'count': calls, 'seconds': elapsed / 1e9} for name, (calls, elapsed) in items}
+
+
+def reset():
+    """
+    Zero every counter
+    """
+    with _lock:
+        _stats.clear()
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+from .optional import import_numpy, is_ndarray, is_quantity_array
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+numpy is optional and takes longer to import than the rest of the library put together, so modules that only need it
+to recognise arrays ask here rather than importing it themselves. Nothing can be a numpy array (or a
+:mod:`QuantityArray`) until something else has imported numpy, so these checks never import anything.
+"""
+
+import sys
+
+# Not looked for yet
+_UNSET = object()
+_numpy = _UNSET
+
+
+def import_numpy():
+    """
+    Import numpy for work that needs it
+
+    :return: the numpy module, or None if it isn't installed
+    """
+    global _numpy
+    if _numpy is _UNSET:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+
+def is_ndarray(value) -> bool:
+    """
+    Is the value a numpy array?
+    """
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def is_quantity_array(value) -> bool:
+    """
+    Is the value a :mod:`QuantityArray`?
+    """
+    module = sys.modules.get('quantity.quantity_array.quantity_array')
+    cls = getattr(module, 'QuantityArray', None)
+    return cls is not None and isinstance(value, cls)
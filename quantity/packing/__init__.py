@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+from .packing import pack_quantities, unpack_quantities
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+Packed encoding for lists of quantities, for handing work to other processes. Rather than pickling every
+:mod:`Quantity` the values go in one array, the distinct units go in a small table (pickled by registry key so they
+resolve to the registered objects) and each value refers to its unit by index.
+"""
+
+import pickle
+import sys
+from array import array
+
+from quantity.quantity import Quantity
+
+VERSION = 1
+
+
+def _index_typecode(n: int) -> str:
+    if n <= 0x100:
+        return 'B'
+    if n <= 0x10000:
+        return 'H'
+    return 'I'
+
+
+def pack_quantities(quantities) -> bytes:
+    """
+    Pack an iterable of quantities into bytes
+
+    >>> data = pack_quantities([Quantity(1, 'kV'), Quantity(2, 'mA')])
+    >>> unpack_quantities(data)
+    [1.0 kV, 2.0 mA]
+
+    :param quantities: iterable of :mod:`Quantity`
+    :return: bytes
+    """
+    units = {}
+    indices = []
+    values = []
+    for q in quantities:
+        indices.append(units.setdefault(q.unit, len(units)))
+        values.append(q._value)
+
+    packed_values = None
+    if all(type(v) is int for v in values):
+        try:
+            packed_values = array('q', values)
+        except OverflowError:
+            pass
+    if packed_values is None:
+        packed_values = array('d', values)
+    packed_indices = array(_index_typecode(len(units)), indices)
+
+    return pickle.dumps((VERSION, sys.byteorder, tuple(units),
+                         packed_indices.typecode, packed_indices.tobytes(),
+                         packed_values.typecode, packed_values.tobytes()), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def unpack_quantities(data: bytes) -> list:
+    """
+    Unpack bytes made by :func:`pack_quantities`
+
+    :param data: packed quantities
+    :return: list of :mod:`Quantity`
+    """
+    version, byteorder, units, index_typecode, index_bytes, value_typecode, value_bytes = pickle.loads(data)
+    if version > VERSION:
+        raise ValueError(f'Unsupported packed quantity version {version}')
+    indices = array(index_typecode)
+    indices.frombytes(index_bytes)
+    values = array(value_typecode)
+    values.frombytes(value_bytes)
+    if byteorder != sys.byteorder:
+        indices.byteswap()
+        values.byteswap()
+    from_base = Quantity._from_base
+    return [from_base(v, units[i]) for i, v in zip(indices, values)]
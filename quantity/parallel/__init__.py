@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+from .parallel import parallel_arithmetic, parallel_convert, parallel_reduce
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+Run large quantity workloads across processes. Amounts are copied once into :mod:`multiprocessing.shared_memory`
+as raw doubles and the workers each handle a chunk of them in place. Units never leave the parent, the result unit
+is worked out there once with the normal :mod:`Unit` algebra and only numbers go to the workers.
+"""
+
+import math
+import operator
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from quantity.converter import Converter
+from quantity.unit import Unit
+from quantity.prefix import Prefix
+from quantity.quantity import Quantity
+import quantity.prefix.prefixes as prefixes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Values per task when no chunk size is given, small enough to spread work, large enough to be worth sending
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+_operators = {
+    '+': (operator.add, operator.add),
+    '-': (operator.sub, operator.sub),
+    '*': (operator.mul, operator.mul),
+    '/': (operator.truediv, operator.truediv),
+}
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to a block made by the parent, which stays in charge of unlinking it
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # track was added in 3.13
+        return shared_memory.SharedMemory(name=name)
+
+
+def _views(names: tuple, start: int, stop: int) -> tuple:
+    """
+    Attach to shared blocks and get a view of the chunk in each
+    """
+    blocks = [_attach(name) for name in names]
+    views = [b.buf.cast('d')[start:stop] for b in blocks]
+    if numpy is not None:
+        views = [numpy.frombuffer(v, dtype=numpy.float64) for v in views]
+    return blocks, views
+
+
+def _close(blocks: list, views: list):
+    views.clear()
+    for b in blocks:
+        b.close()
+
+
+def _affine(values, out, scale: float, offset: float):
+    if numpy is not None:
+        numpy.multiply(values, scale, out=out)
+        out += offset
+    else:
+        for i, v in enumerate(values):
+            out[i] = v * scale + offset
+
+
+def _arithmetic(a, b, out, op: str):
+    if numpy is not None:
+        out[:] = _operators[op][1](a, b)
+    else:
+        f = _operators[op][0]
+        for i in range(len(out)):
+            out[i] = f(a[i], b[i])
+
+
+def _reduce(values) -> tuple:
+    if not len(values):
+        return 0, 0.0, None, None
+    if numpy is not None:
+        return len(values), math.fsum(values.tolist()), float(values.min()), float(values.max())
+    return len(values), math.fsum(values), min(values), max(values)
+
+
+def _affine_task(names: tuple, start: int, stop: int, scale: float, offset: float):
+    """
+    out = values * scale + offset over one chunk
+    """
+    blocks, views = _views(names, start, stop)
+    try:
+        _affine(*views, scale, offset)
+    finally:
+        _close(blocks, views)
+
+
+def _arithmetic_task(names: tuple, start: int, stop: int, op: str):
+    """
+    out = a op b over one chunk
+    """
+    blocks, views = _views(names, start, stop)
+    try:
+        _arithmetic(*views, op)
+    finally:
+        _close(blocks, views)
+
+
+def _reduce_task(names: tuple, start: int, stop: int) -> tuple:
+    """
+    Partial reduction of one chunk
+
+    :return: (count, sum, min, max)
+    """
+    blocks, views = _views(names, start, stop)
+    try:
+        return _reduce(*views)
+    finally:
+        _close(blocks, views)
+
+
+def _share(values) -> shared_memory.SharedMemory:
+    """
+    Copy values into a new shared block of doubles
+    """
+    if not isinstance(values, array) or values.typecode != 'd':
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            values = numpy.ascontiguousarray(values, dtype=numpy.float64)
+        else:
+            values = array('d', values)
+    raw = memoryview(values).cast('B')
+    block = shared_memory.SharedMemory(create=True, size=max(len(raw), 8))
+    block.buf[:len(raw)] = raw
+    return block
+
+
+def _run(task, names: tuple, count: int, extra: tuple, workers: int | None, chunk_size: int | None,
+         executor: Executor | None) -> list:
+    """
+    Split count values into chunks and run a task over them
+
+    :return: list of task results in chunk order
+    """
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+    chunks = [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+    if executor is not None:
+        futures = [executor.submit(task, names, start, stop, *extra) for start, stop in chunks]
+        return [f.result() for f in futures]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(task, names, start, stop, *extra) for start, stop in chunks]
+        return [f.result() for f in futures]
+
+
+def _collect(block: shared_memory.SharedMemory, count: int) -> array:
+    """
+    Copy a shared block of doubles out into an array
+    """
+    out = array('d')
+    out.frombytes(block.buf[:count * 8])
+    return out
+
+
+def _release(*blocks):
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+def parallel_convert(values, source: Unit | str, target: Unit | str, workers: int = None, chunk_size: int = None,
+                     executor: Executor = None) -> array:
+    """
+    Convert lots of raw numbers from one unit and prefix to another across processes
+
+    >>> parallel_convert(range(1000000), '°C', '°F')[-1]
+    1800030.2
+
+    :param values: numbers in the source unit, a sequence, :mod:`array.array` or numpy array
+    :param source: unit string (with optional prefix) or :mod:`Unit` to convert from
+    :param target: unit string (with optional prefix) or :mod:`Unit` to convert to
+    :param workers: number of processes, defaults to the number of CPUs
+    :param chunk_size: values handed to each task
+    :param executor: an existing pool to use instead of starting one
+    :return: ``array('d')`` of converted values
+    """
+    converter = Converter(source, target)
+    count = len(values)
+    source_block = _share(values)
+    out_block = shared_memory.SharedMemory(create=True, size=max(count * 8, 8))
+    try:
+        _run(_affine_task, (source_block.name, out_block.name), count, (converter.scale, converter.offset),
+             workers, chunk_size, executor)
+        return _collect(out_block, count)
+    finally:
+        _release(source_block, out_block)
+
+
+def parallel_arithmetic(op: str, a: tuple, b: tuple, workers: int = None, chunk_size: int = None,
+                        executor: Executor = None) -> tuple:
+    """
+    Add, subtract, multiply or divide two equal length columns of base values across processes
+
+    >>> values, unit = parallel_arithmetic('*', (volts, units.volt), (amps, units.ampere))
+    >>> unit
+    watt
+
+    :param op: one of '+', '-', '*', '/'
+    :param a: (values, :mod:`Unit`), values are SI base values
+    :param b: (values, :mod:`Unit`), values are SI base values
+    :param workers: number of processes, defaults to the number of CPUs
+    :param chunk_size: values handed to each task
+    :param executor: an existing pool to use instead of starting one
+    :return: (``array('d')`` of values, :mod:`Unit`)
+    """
+    (a_values, a_unit), (b_values, b_unit) = a, b
+    # The unit algebra (and unit checking) happens once, here
+    unit = _operators[op][0](a_unit, b_unit)
+    count = len(a_values)
+    assert len(b_values) == count, (len(b_values), count)
+
+    a_block, b_block = _share(a_values), _share(b_values)
+    out_block = shared_memory.SharedMemory(create=True, size=max(count * 8, 8))
+    try:
+        _run(_arithmetic_task, (a_block.name, b_block.name, out_block.name), count, (op,), workers, chunk_size,
+             executor)
+        return _collect(out_block, count), unit
+    finally:
+        _release(a_block, b_block, out_block)
+
+
+def parallel_reduce(op: str, values, unit: Unit, prefix: Prefix = prefixes.NoPrefix, workers: int = None,
+                    chunk_size: int = None, executor: Executor = None) -> Quantity | None:
+    """
+    Reduce a column of values across processes
+
+    :param op: one of 'sum', 'mean', 'min', 'max'
+    :param values: numbers, a sequence, :mod:`array.array` or numpy array
+    :param unit: :mod:`Unit` of the values
+    :param prefix: :mod:`Prefix` the values are expressed in
+    :param workers: number of processes, defaults to the number of CPUs
+    :param chunk_size: values handed to each task
+    :param executor: an existing pool to use instead of starting one
+    :return: :mod:`Quantity`, or None for the mean, min or max of no values
+    """
+    assert op in ('sum', 'mean', 'min', 'max'), op
+    count = len(values)
+    block = _share(values)
+    try:
+        partials = _run(_reduce_task, (block.name,), count, (), workers, chunk_size, executor)
+    finally:
+        _release(block)
+
+    partials = [p for p in partials if p[0]]
+    if op == 'sum':
+        return Quantity(math.fsum(p[1] for p in partials), unit, prefix)
+    if not partials:
+        return None
+    if op == 'mean':
+        return Quantity(math.fsum(p[1] for p in partials) / count, unit, prefix)
+    if op == 'min':
+        return Quantity(min(p[2] for p in partials), unit, prefix)
+    return Quantity(max(p[3] for p in partials), unit, prefix)
@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
-from .prefix import Prefix, has_power, has_prefix, get_power, get_prefix, closest_prefix
+from .prefix import (Prefix, has_power, has_prefix, get_power, get_prefix, closest_prefix,
+                     closest_prefixes, int_exponent, prefix_for_exponent)
 from . import prefixes
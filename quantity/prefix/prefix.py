@@ -7,15 +7,20 @@ Unit prefix library for units for powers of 10. Handles multiplication and divis
 returns super scripts for attaching to displays.
 """
 
+from time import perf_counter_ns
+
+from quantity.registry.registry import default_registry, current_registry, current_snapshot
+import quantity.instrumentation.instrumentation as instrumentation
+
 
 class MetaPrefix(type):
-    power_index = {}
-    prefix_index = {}
+    # The default registry's tables, lookups go through the current context's registry (see quantity.registry)
+    power_index = default_registry.power_index
+    prefix_index = default_registry.prefix_index
 
     def __call__(cls, *args, **kwargs):
         obj = super().__call__(*args, **kwargs)
-        MetaPrefix.power_index[obj.power] = obj
-        MetaPrefix.prefix_index[obj.prefix] = obj
+        current_registry().register_prefix(obj)
         return obj
 
 
@@ -68,11 +73,25 @@ class Prefix(metaclass=MetaPrefix):
     def __str__(self) -> str:
         return f'{self.prefix}'
 
+    def __reduce__(self):
+        """
+        Pickle registered prefixes by power or symbol so they unpickle to the same object
+        """
+        snapshot = current_snapshot()
+        if snapshot.power_index.get(self.power) is self:
+            return get_power, (self.power,)
+        if snapshot.prefix_index.get(self.prefix) is self:
+            return get_prefix, (self.prefix,)
+        return _restore_prefix, (self.prefix, self.name, self.power)
+
     def __rmul__(self, o) -> int | float:
         """
         Return a scalar multiplied by us.
         e.g. 5 * kilo returns 5000
         """
+        # Dividing by an exact power of 10 rounds once, so 9 * milli is the same float as 0.009
+        if self.power < 0:
+            return o / (10 ** -self.power)
         return o * (10 ** self.power)
 
     def __mul__(self, o) -> int | float:
@@ -80,6 +99,8 @@ class Prefix(metaclass=MetaPrefix):
         Return a scalar multiplied by us.
         e.g. 5 * kilo returns 5000
         """
+        if self.power < 0:
+            return o / (10 ** -self.power)
         return o * (10 ** self.power)
 
     def __rtruediv__(self, o) -> int | float:
@@ -90,6 +111,105 @@ class Prefix(metaclass=MetaPrefix):
         return float(o) / (10 ** self.power)
 
 
+# log10(2), to estimate the number of decimal digits from the number of bits
+_LOG10_2 = math.log10(2)
+
+
+def _exponent_table() -> tuple:
+    """
+    Get a table mapping every exponent between the lowest and highest registered power to the largest prefix
+    that doesn't exceed it, building it the first time it's needed for a registry snapshot.
+
+    :return: (lowest power, highest power, tuple of :mod:`Prefix`)
+    """
+    snapshot = current_snapshot()
+    table = snapshot.exponent_table
+    if table is not None:
+        return table
+    power_index = snapshot.power_index
+    powers = sorted(power_index)
+    lo, hi = powers[0], powers[-1]
+    table = []
+    j = 0
+    for exponent in range(lo, hi + 1):
+        if j + 1 < len(powers) and powers[j + 1] <= exponent:
+            j += 1
+        table.append(power_index[powers[j]])
+    snapshot.exponent_table = lo, hi, tuple(table)
+    return snapshot.exponent_table
+
+
+def prefix_for_exponent(exponent: int) -> Prefix:
+    """
+    Get the largest registered prefix that doesn't exceed a power of 10, or the smallest prefix below all of them
+
+    :param exponent: power of 10
+    :return: :mod:`Prefix`
+    """
+    lo, hi, table = _exponent_table()
+    return table[min(max(exponent, lo), hi) - lo]
+
+
+def int_exponent(i: int) -> int:
+    """
+    The power of 10 of the leading digit of a positive integer, i.e. floor(log10(i)), worked out exactly so it
+    doesn't go wrong for integers too big to be floats.
+
+    :param i: A positive integer
+    :return: exponent
+    """
+    # The bit length puts us within one digit
+    digits = int((i.bit_length() - 1) * _LOG10_2)
+    if i >= 10 ** (digits + 1):
+        digits += 1
+    return digits
+
+
+def _int_exponent(i: int) -> int:
+    """
+    The power of 10 closest to a positive integer, i.e. floor(log10(i) + 0.5), worked out exactly.
+
+    :param i: A positive integer
+    :return: exponent
+    """
+    digits = int_exponent(i)
+    # Round up when i >= 10 ** (digits + 0.5), i.e. i² >= 10 ** (2 * digits + 1)
+    if i * i >= 10 ** (2 * digits + 1):
+        digits += 1
+    return digits
+
+
+def _reduce(i: int | float, table: tuple) -> tuple:
+    """
+    Reduce a non-zero number to a coefficient and prefix using an exponent table
+
+    :param i: the number to reduce
+    :param table: (lowest power, highest power, tuple of :mod:`Prefix`)
+    :return: a (coefficient, :mod:`Prefix`) tuple.
+    """
+    lo, hi, prefixes = table
+    if isinstance(i, int):
+        exponent = _int_exponent(abs(i))
+    else:
+        coefficient = abs(i)
+        if not math.isfinite(coefficient):
+            return i, get_power(0)
+        exponent = math.floor(math.log10(coefficient) + 0.5)
+
+    if exponent <= lo:
+        prefix = prefixes[0]
+    elif exponent >= hi:
+        prefix = prefixes[-1]
+    else:
+        prefix = prefixes[exponent - lo]
+
+    # Scale by an integer power of 10 so the only rounding is in the final result
+    power = prefix.power
+    if power < 0:
+        return float(i * 10 ** -power), prefix
+    return i / 10 ** power, prefix
+
+
 def closest_prefix(i: int | float) -> tuple:
     """
     Reduce a number to a multiplier and a prefix.
@@ -100,29 +220,47 @@ def closest_prefix(i: int | float) -> tuple:
     :param i: the number to index
     :returns: a (coefficient, :mod:`Prefix`) tuple.
     """
+    if instrumentation.enabled:
+        return instrumentation.timed('prefix.closest_prefix', _closest, i)
+    return _closest(i)
+
+
+def _closest(i: int | float) -> tuple:
+    """
+    :func:`closest_prefix` without the instrumentation
+    """
     if i == 0:
         return 0, get_power(0)
+    return _reduce(i, _exponent_table())
 
-    coefficient = abs(float(i))
-
-    mult = 1
-    if i < 0:
-        mult = -1
 
-    exponent = int(math.floor(math.log(coefficient, 10) + 0.5))
-    coefficient /= 10 ** exponent
+def closest_prefixes(values) -> list:
+    """
+    Reduce a sequence of numbers to multipliers and prefixes in one call.
 
-    indices = sorted(MetaPrefix.power_index.keys())
+    e.g `closest_prefixes([1000, 0.05])` returns [(1.0, kilo), (50.0, milli)]
 
-    for j, i in enumerate(indices):
-        if i >= exponent:
-            if i > exponent:
-                i = indices[j - 1]
-                delta = exponent - i
-                coefficient *= 10 ** delta
-            break
-    exponent = get_power(i)
-    return coefficient * mult, exponent
+    :param values: iterable of numbers
+    :returns: a list of (coefficient, :mod:`Prefix`) tuples.
+    """
+    table = _exponent_table()
+    # Zeros are picked out the same way as in closest_prefix
+    zero = 0, get_power(0)
+    if instrumentation.enabled:
+        start = perf_counter_ns()
+        result = [zero if i == 0 else _reduce(i, table) for i in values]
+        instrumentation.record('prefix.closest_prefix', perf_counter_ns() - start, len(result))
+        return result
+    return [zero if i == 0 else _reduce(i, table) for i in values]
+
+
+def _restore_prefix(prefix: str, name: str, power: int) -> Prefix:
+    """
+    Unpickle a prefix that isn't registered, without registering it
+    """
+    obj = Prefix.__new__(Prefix)
+    obj.__init__(prefix, name, power)
+    return obj
 
 
 def has_prefix(prefix: str) -> bool:
@@ -131,7 +269,7 @@ def has_prefix(prefix: str) -> bool:
     :param prefix: Prefix
     :return: presence of prefix
     """
-    return prefix in MetaPrefix.prefix_index
+    return prefix in current_snapshot().prefix_index
 
 
 def has_power(power: int) -> bool:
@@ -140,7 +278,7 @@ def has_power(power: int) -> bool:
     :param power: Power
     :return: presence of power
     """
-    return power in MetaPrefix.power_index
+    return power in current_snapshot().power_index
 
 
 def get_power(power: int) -> int:
@@ -149,7 +287,7 @@ def get_power(power: int) -> int:
     :param power:
     :return: Cached Power
     """
-    return MetaPrefix.power_index[power]
+    return current_snapshot().power_index[power]
 
 
 def get_prefix(prefix: str) -> Prefix:
@@ -158,4 +296,4 @@ def get_prefix(prefix: str) -> Prefix:
     :param prefix: prefix
     :return: Cached prefix
     """
-    return MetaPrefix.prefix_index[prefix]
+    return current_snapshot().prefix_index[prefix]
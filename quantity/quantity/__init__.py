@@ -1,3 +1,3 @@
 # -*- coding: utf-8 -*-
 __author__ = 'akm'
-from .quantity import Quantity
+from .quantity import Quantity, FrozenQuantity
@@ -1,10 +1,20 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-from quantity.unit import Unit, get_unit, has_unit, NoUnit
+from functools import lru_cache
+from numbers import Number
+
+from quantity.unit import Unit, NoUnit
 from quantity.prefix import closest_prefix, has_prefix, get_prefix, Prefix
+from quantity.registry.registry import current_snapshot
+from quantity.unit_parser import parse_unit
 import quantity.prefix.prefixes as prefixes
 
+# How many distinct quantities Quantity.interned() keeps
+INTERN_CACHE_SIZE = 4096
+# Significant digits a FrozenQuantity compares and hashes on, enough to hide the rounding left by prefix scaling
+FROZEN_DIGITS = 15
+
 
 class Quantity:
     """
@@ -41,63 +51,149 @@ class Quantity:
     :param prefix: A SI power prefix to be applied to the amount.
     """
 
+    __slots__ = ('_value', 'unit', '_amount', '_prefix')
+
     def __init__(self, amount, unit: Unit | str = NoUnit, prefix: Prefix = prefixes.NoPrefix):
-        self.amount = amount
+        if isinstance(unit, str):
+            unit_prefix, unit = parse_unit(unit)
+            if unit_prefix is not prefixes.NoPrefix:
+                amount *= unit_prefix
+        if prefix is not prefixes.NoPrefix:
+            amount *= prefix
+        # We only hold the SI base value, the display amount and prefix are worked out when asked for
+        self._value = amount
         self.unit = unit
-        self.prefix = prefix
-        self._reduce_self()
+        self._amount = None
+        self._prefix = None
+
+    @classmethod
+    def _from_base(cls, value: int | float, unit: Unit = NoUnit) -> Quantity:
+        """
+        Make a Quantity from a base value and a :mod:`Unit` without any parsing
+
+        :param value: The SI base value (no prefix applied)
+        :param unit: :mod:`Unit` object
+        :return: :mod:`Quantity`
+        """
+        obj = cls.__new__(cls)
+        obj._value = value
+        obj.unit = unit
+        obj._amount = None
+        obj._prefix = None
+        return obj
+
+    @classmethod
+    def interned(cls, amount, unit: Unit | str = NoUnit, prefix: Prefix = prefixes.NoPrefix) -> FrozenQuantity:
+        """
+        Get a shared quantity for frequently used values instead of allocating a new one every time. It is shared by
+        every caller, so it is a :mod:`FrozenQuantity`.
+
+        >>> Quantity.interned(0) is Quantity.interned(0)
+        True
+
+        :param amount: The scalar amount
+        :param unit: The unit, this can be a string (with optional power prefix) or a :mod:`Unit` object.
+        :param prefix: A SI power prefix to be applied to the amount.
+        :return: :mod:`FrozenQuantity`
+        """
+        # Keyed on the snapshot version so unit strings are parsed again if the registry changes, without the cache
+        # keeping old snapshots alive
+        return _interned(amount, unit, prefix, current_snapshot().version)
+
+    def __reduce__(self):
+        """
+        Pickle as the base value and unit, the unit pickles by registry key
+        """
+        return type(self)._from_base, (self._value, self.unit)
+
+    def freeze(self) -> FrozenQuantity:
+        """
+        Get an immutable, hashable copy of this quantity
+
+        :return: :mod:`FrozenQuantity`
+        """
+        return FrozenQuantity._from_base(self._value, self.unit, self._amount, self._prefix)
+
+    @property
+    def amount(self) -> int | float:
+        """
+        The amount expressed in terms of :attr:`prefix`
+        """
+        if self._prefix is None:
+            self._reduce_self()
+        return self._amount
+
+    @property
+    def prefix(self) -> Prefix:
+        """
+        The closest SI prefix to our value
+        """
+        if self._prefix is None:
+            self._reduce_self()
+        return self._prefix
 
     def __int__(self) -> int:
-        return int((self.amount * self.prefix) + 0.5)
+        return int(self._value + 0.5)
 
     def __float__(self) -> float:
-        return float(self.amount * self.prefix)
+        return float(self._value)
 
     def __add__(self, o: int | float | Quantity) -> Quantity:
+        if not isinstance(o, (Quantity, Number)):
+            # Let arrays and expressions deal with us
+            return NotImplemented
+
         if isinstance(o, (int, float)) and o == 0:
             return self
 
         if self.unit is NoUnit and isinstance(o, (int, float)):
-            return Quantity(type(o)(self) + o)
+            return Quantity._from_base(type(o)(self) + o)
 
         unit = self.unit + o.unit
-        return Quantity(float(self) + float(o), unit)
+        return Quantity._from_base(self._value + o._value, unit)
 
     __radd__ = __add__
 
     def __sub__(self, o: int | float | Quantity) -> Quantity:
+        if not isinstance(o, (Quantity, Number)):
+            return NotImplemented
+
         if self.unit is NoUnit and isinstance(o, (int, float)):
-            return Quantity(type(o)(self) - o)
+            return Quantity._from_base(type(o)(self) - o)
 
         unit = self.unit - o.unit
-        return Quantity(float(self) - float(o), unit)
+        return Quantity._from_base(self._value - o._value, unit)
 
     def __mul__(self, o) -> Quantity:
         if isinstance(o, Quantity):
             unit = self.unit * o.unit
-            return Quantity(float(self) * float(o), unit)
+            return Quantity._from_base(self._value * o._value, unit)
+
+        if not isinstance(o, Number):
+            return NotImplemented
 
-        unit = self.unit
-        return Quantity(type(o)(self) * o, unit)
+        return Quantity._from_base(self._value * o, self.unit)
 
     __rmul__ = __mul__
 
     def __truediv__(self, o: int | float | Quantity) -> Quantity:
         if isinstance(o, Quantity):
             unit = self.unit / o.unit
-            return Quantity(float(self) / float(o), unit)
+            return Quantity._from_base(self._value / o._value, unit)
 
-        unit = self.unit
-        return Quantity(type(o)(self) / o, unit)
+        if not isinstance(o, Number):
+            return NotImplemented
+
+        return Quantity._from_base(self._value / o, self.unit)
+
+    def __pow__(self, index: int) -> Quantity:
+        return Quantity._from_base(self._value ** index, self.unit ** index)
 
     def _reduce_self(self):
         """
-        Parse our unit and reduce ourselves to the smallest representation
+        Reduce ourselves to the smallest representation for display
         """
-        if isinstance(self.unit, str):
-            self.unit = self.__find_unit()
-        a = self.amount * self.prefix
-        self.amount, self.prefix = closest_prefix(a)
+        self._amount, self._prefix = closest_prefix(self._value)
 
     def _strip_unit(self):
         """
@@ -105,47 +201,6 @@ class Quantity:
         """
         self.unit = NoUnit
 
-    def __find_unit(self) -> Unit:
-        """
-        Take a string like kV and work out prefix and units, obviously
-        there is scope for collision between units and prefixes...
-
-        :return: :mod:`Unit` object
-        """
-        if not self.unit:
-            return NoUnit
-
-        if isinstance(self.unit, Unit):
-            return self.unit
-
-        u = self.unit
-        if has_unit(u):
-            return get_unit(u)
-
-        # Work backwards through the list trying to find a unit that matches
-        unit = self.unit = None
-        ul = list(u)
-        u = ""
-
-        while ul:
-            u = (ul.pop() + u)
-            if has_unit(u):
-                unit = get_unit(u)
-                break
-
-        # Nothing left to look at
-        if not ul:
-            if not unit:
-                # Make a temporary unit, since we don't know what this is
-                unit = Unit(u, u, temp=True)
-            return unit
-
-        # We have leftovers... this should be a prefix...
-        ul = ''.join(ul)
-        if has_prefix(ul):
-            self.amount *= get_prefix(ul)
-        return unit
-
     def __repr__(self) -> str:
         return f'{self.amount} {self.prefix}{self.unit}'
 
@@ -162,43 +217,48 @@ class Quantity:
         if self.unit is NoUnit and isinstance(other, (int, float)):
             return type(other)(self) == other
 
-        return (other.amount == self.amount and
-                other.unit is self.unit and
-                other.prefix is self.prefix)
+        return (other._value == self._value and
+                other.unit is self.unit)
 
     def __ne__(self, other: int | float | Quantity) -> bool:
         return not (other == self)
 
-    def __lt__(self, other: int | float | Quantity) -> bool:
-        if self.unit is NoUnit and isinstance(other, (int, float, int)):
-            return type(other)(self) > other
+    def _compared_value(self, other: int | float | Quantity) -> int | float:
+        """
+        Get the base value to compare against. Units have to match, but prefixes don't matter, and we only compare
+        against scalars if we have no unit.
+        """
+        if isinstance(other, Quantity):
+            assert other.unit is self.unit, (other.unit, self.unit)
+            return other._value
+        assert self.unit is NoUnit, (self.unit, other)
+        return other
 
-        assert other.unit is self.unit and other.prefix is self.prefix
-        return self.amount < other.amount
+    def __lt__(self, other: int | float | Quantity) -> bool:
+        return self._value < self._compared_value(other)
 
     def __le__(self, other: int | float | Quantity) -> bool:
-        if self.unit is NoUnit and isinstance(other, (int, float, int)):
-            return type(other)(self) <= other
-
-        assert other.unit is self.unit and other.prefix is self.prefix
-        return self.amount <= other.amount
+        return self._value <= self._compared_value(other)
 
     def __gt__(self, other: int | float | Quantity) -> bool:
-        if self.unit is NoUnit and isinstance(other, (int, float, int)):
-            return type(other)(self) > other
-
-        assert other.unit is self.unit and other.prefix is self.prefix
-        return self.amount > other.amount
+        return self._value > self._compared_value(other)
 
     def __ge__(self, other: int | float | Quantity) -> bool:
-        if self.unit is NoUnit and isinstance(other, (int, float, int)):
-            return type(other)(self) >= other
+        return self._value >= self._compared_value(other)
 
-        assert other.unit is self.unit and other.prefix is self.prefix
-        return self.amount >= other.amount
+    def sort_key(self) -> tuple:
+        """
+        A key that sorts quantities by unit and then by size, whatever their prefixes
+
+        >>> sorted([Quantity(1.2, 'kW'), Quantity(900, 'W'), Quantity(3, 'V')], key=Quantity.sort_key)
+        [3.0 V, 0.9 kW, 1.2 kW]
+
+        :return: (unit symbol, base value)
+        """
+        return self.unit.unit, self._value
 
     def convert(self, unit: Unit) -> Quantity:
-        return Quantity(self.unit.convert(unit, float(self)), unit)
+        return Quantity._from_base(self.unit.convert(unit, float(self)), unit)
 
     def to(self, prefix: Prefix | str) -> float | None:
         """
@@ -217,10 +277,100 @@ class Quantity:
         :param prefix: A prefix / unit to convert to
         :return: A floating point scalar or None for invalid prefix
         """
-        if prefix.endswith(self.unit.unit):
+        if isinstance(prefix, Prefix):
+            return float(self) / prefix
+
+        if self.unit.unit and prefix.endswith(self.unit.unit):
             prefix = prefix[:-len(self.unit.unit)]
 
+        if not prefix:
+            return float(self)
+
         if has_prefix(prefix):
-            return int(self) / get_prefix(prefix)
+            return float(self) / get_prefix(prefix)
 
         return None
+
+
+class FrozenQuantity(Quantity):
+    """
+    An immutable Quantity that can be used as a dict key, in a set or as an :func:`functools.lru_cache` argument. It
+    compares and hashes on the SI base value, to :data:`FROZEN_DIGITS` significant digits, and the (interned) unit, so
+    quantities that compare equal hash equally whatever their prefixes. Arithmetic on it gives ordinary quantities.
+
+    >>> FrozenQuantity(1, 'kV') == FrozenQuantity(1000, 'V')
+    True
+    >>> limits = {FrozenQuantity(1, 'kV'): 'trip'}
+    >>> limits[Quantity(1000, 'V').freeze()]
+    'trip'
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def _from_base(cls, value: int | float, unit: Unit = NoUnit, amount: int | float | None = None,
+                   prefix: Prefix | None = None) -> FrozenQuantity:
+        """
+        Make a FrozenQuantity from a base value and a :mod:`Unit` without any parsing, optionally with the display
+        amount and prefix already worked out
+
+        :param value: The SI base value (no prefix applied)
+        :param unit: :mod:`Unit` object
+        :param amount: display amount, if already known
+        :param prefix: display :mod:`Prefix`, if already known
+        :return: :mod:`FrozenQuantity`
+        """
+        obj = cls.__new__(cls)
+        _set = object.__setattr__
+        _set(obj, '_value', value)
+        _set(obj, 'unit', unit)
+        _set(obj, '_amount', amount)
+        _set(obj, '_prefix', prefix)
+        return obj
+
+    def __setattr__(self, name: str, value):
+        # The display amount and prefix are still worked out when first asked for
+        if name in ('_value', 'unit') and hasattr(self, name):
+            raise AttributeError(f'{type(self).__name__} is immutable')
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def _key(self) -> int | float:
+        """
+        The base value rounded to :data:`FROZEN_DIGITS` significant digits, so 258.917 kV (stored as
+        258916.99999999997) and 258917 V are the same key. Equality and hashing both use it.
+        """
+        value = self._value
+        if isinstance(value, float):
+            return float(f'{value:.{FROZEN_DIGITS}g}')
+        return value
+
+    def __eq__(self, other: int | float | Quantity) -> bool:
+        if isinstance(other, Quantity):
+            return other.unit is self.unit and self._key() == FrozenQuantity._key(other)
+        if self.unit is NoUnit and isinstance(other, Number):
+            return self._key() == other
+        return NotImplemented
+
+    def __ne__(self, other: int | float | Quantity) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self) -> int:
+        if self.unit is NoUnit:
+            # Unitless quantities equal plain numbers, so hash like them
+            return hash(self._key())
+        return hash((self._key(), self.unit))
+
+    def freeze(self) -> FrozenQuantity:
+        return self
+
+
+@lru_cache(maxsize=INTERN_CACHE_SIZE, typed=True)
+def _interned(amount, unit: Unit | str, prefix: Prefix, _version: int) -> FrozenQuantity:
+    """
+    Make the shared instances for :meth:`Quantity.interned`
+    """
+    return FrozenQuantity(amount, unit, prefix)
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+from .quantity_array import QuantityArray
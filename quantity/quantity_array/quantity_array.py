@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+An array of amounts that share a single unit. The amounts live in one numpy array of SI base values (no prefix applied)
+so arithmetic is vectorised and the unit algebra is done once per operation instead of once per element. A display
+prefix is only chosen when the array is printed.
+"""
+
+import numpy as np
+
+from quantity.unit import Unit, NoUnit
+from quantity.prefix import Prefix, closest_prefix, has_prefix, get_prefix
+from quantity.quantity import Quantity
+from quantity.unit_parser import parse_unit
+import quantity.prefix.prefixes as prefixes
+
+
+def _unscale(values: np.ndarray, prefix: Prefix) -> np.ndarray:
+    """
+    Express base values in terms of a prefix, multiplying by an exact power of 10 where we can
+
+    :param values: SI base values
+    :param prefix: :mod:`Prefix` to express the values in
+    :return: new array of values
+    """
+    if prefix.power < 0:
+        return values * (10 ** -prefix.power)
+    return values / (10 ** prefix.power)
+
+
+class QuantityArray:
+    """
+    A numpy backed array of amounts with a single unit.
+
+    >>> a = QuantityArray([1, 2, 3], 'kV')
+    >>> a
+    [1. 2. 3.] kV
+    >>> a * Quantity(2, 'A')
+    [2. 4. 6.] kW
+    >>> a.to('V')
+    array([1000., 2000., 3000.])
+    >>> a.sum()
+    6.0 kV
+
+    :param amounts: Anything numpy can turn into an array of floats
+    :param unit: The unit, this can be a string (with optional power prefix) or a :mod:`Unit` object.
+    :param prefix: A SI power prefix to be applied to the amounts.
+    """
+
+    __slots__ = ('values', 'unit')
+
+    def __init__(self, amounts, unit: Unit | str = NoUnit, prefix: Prefix = prefixes.NoPrefix):
+        if isinstance(unit, str):
+            unit_prefix, unit = parse_unit(unit)
+            scale = (1 * unit_prefix) * prefix
+        else:
+            scale = 1 * prefix
+        values = np.array(amounts, dtype=np.float64)
+        if scale != 1:
+            values *= scale
+        self.values = values
+        self.unit = unit
+
+    @classmethod
+    def _from_values(cls, values: np.ndarray, unit: Unit) -> QuantityArray:
+        """
+        Wrap an array of base values without copying or scaling them
+
+        :param values: SI base values
+        :param unit: :mod:`Unit` of the values
+        :return: :mod:`QuantityArray`
+        """
+        obj = cls.__new__(cls)
+        obj.values = values
+        obj.unit = unit
+        return obj
+
+    @classmethod
+    def from_quantities(cls, quantities) -> QuantityArray:
+        """
+        Build an array from an iterable of :mod:`Quantity` objects, which must all have the same unit
+
+        :param quantities: iterable of :mod:`Quantity`
+        :return: :mod:`QuantityArray`
+        """
+        quantities = list(quantities)
+        unit = quantities[0].unit if quantities else NoUnit
+        for q in quantities:
+            assert q.unit is unit, (q.unit, unit)
+        return cls._from_values(np.fromiter((float(q) for q in quantities), dtype=np.float64, count=len(quantities)),
+                                unit)
+
+    @staticmethod
+    def _operand(o) -> tuple:
+        """
+        Split the other side of an operation into values and a unit
+
+        :param o: :mod:`QuantityArray`, :mod:`Quantity` or scalar / array
+        :return: (values, :mod:`Unit`)
+        """
+        if isinstance(o, QuantityArray):
+            return o.values, o.unit
+        if isinstance(o, Quantity):
+            return float(o), o.unit
+        return o, NoUnit
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self):
+        unit = self.unit
+        return (Quantity(float(v), unit) for v in self.values)
+
+    def __getitem__(self, index) -> Quantity | QuantityArray:
+        v = self.values[index]
+        if isinstance(v, np.ndarray):
+            return self._from_values(v, self.unit)
+        return Quantity(float(v), self.unit)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if dtype is None or self.values.dtype == dtype:
+            return self.values.copy() if copy else self.values
+        if copy is False:
+            raise ValueError(f'Converting to {dtype} needs a copy')
+        return self.values.astype(dtype)
+
+    @staticmethod
+    def _is_zero(o) -> bool:
+        """
+        Is the other side a plain 0, which adds to anything (so sum() works)
+        """
+        return isinstance(o, (int, float)) and o == 0
+
+    def __add__(self, o) -> QuantityArray:
+        if self._is_zero(o):
+            return self._from_values(self.values.copy(), self.unit)
+        values, unit = self._operand(o)
+        return self._from_values(self.values + values, self.unit + unit)
+
+    __radd__ = __add__
+
+    def __sub__(self, o) -> QuantityArray:
+        if self._is_zero(o):
+            return self._from_values(self.values.copy(), self.unit)
+        values, unit = self._operand(o)
+        return self._from_values(self.values - values, self.unit - unit)
+
+    def __rsub__(self, o) -> QuantityArray:
+        if self._is_zero(o):
+            return -self
+        values, unit = self._operand(o)
+        return self._from_values(values - self.values, unit - self.unit)
+
+    def __mul__(self, o) -> QuantityArray:
+        values, unit = self._operand(o)
+        return self._from_values(self.values * values, self.unit * unit)
+
+    def __rmul__(self, o) -> QuantityArray:
+        values, unit = self._operand(o)
+        return self._from_values(values * self.values, unit * self.unit)
+
+    def __truediv__(self, o) -> QuantityArray:
+        values, unit = self._operand(o)
+        return self._from_values(self.values / values, self.unit / unit)
+
+    def __rtruediv__(self, o) -> QuantityArray:
+        values, unit = self._operand(o)
+        return self._from_values(values / self.values, unit / self.unit)
+
+    def __neg__(self) -> QuantityArray:
+        return self._from_values(-self.values, self.unit)
+
+    def __abs__(self) -> QuantityArray:
+        return self._from_values(np.abs(self.values), self.unit)
+
+    def _compare_values(self, o):
+        """
+        Get the values to compare against, units must match unless we are unitless
+
+        :param o: :mod:`QuantityArray`, :mod:`Quantity` or scalar / array
+        :return: values to compare against
+        """
+        values, unit = self._operand(o)
+        assert unit is self.unit, (unit, self.unit)
+        return values
+
+    def __eq__(self, o) -> np.ndarray:
+        values, unit = self._operand(o)
+        if unit is not self.unit:
+            return np.zeros(self.values.shape, dtype=bool)
+        return self.values == values
+
+    def __ne__(self, o) -> np.ndarray:
+        return ~(self == o)
+
+    def __lt__(self, o) -> np.ndarray:
+        return self.values < self._compare_values(o)
+
+    def __le__(self, o) -> np.ndarray:
+        return self.values <= self._compare_values(o)
+
+    def __gt__(self, o) -> np.ndarray:
+        return self.values > self._compare_values(o)
+
+    def __ge__(self, o) -> np.ndarray:
+        return self.values >= self._compare_values(o)
+
+    def sum(self) -> Quantity:
+        return Quantity(float(self.values.sum()), self.unit)
+
+    def mean(self) -> Quantity:
+        return Quantity(float(self.values.mean()), self.unit)
+
+    def min(self) -> Quantity:
+        return Quantity(float(self.values.min()), self.unit)
+
+    def max(self) -> Quantity:
+        return Quantity(float(self.values.max()), self.unit)
+
+    def convert(self, unit: Unit) -> QuantityArray:
+        """
+        Convert every amount to another unit in one pass
+
+        :param unit: desired :mod:`Unit`
+        :return: :mod:`QuantityArray`
+        """
+        return self._from_values(np.asarray(self.unit.convert(unit, self.values), dtype=np.float64), unit)
+
+    def to(self, prefix: Prefix | str) -> np.ndarray | None:
+        """
+        Convert to different prefix (i.e. seconds to ms) with no units e.g.
+
+        >>> a = QuantityArray([1, 2], 'km')
+        >>> a.to('m')
+        array([1000., 2000.])
+
+        :param prefix: A prefix / unit to convert to
+        :return: A numpy array of floats or None for invalid prefix
+        """
+        if isinstance(prefix, Prefix):
+            return _unscale(self.values, prefix)
+
+        if self.unit.unit and prefix.endswith(self.unit.unit):
+            prefix = prefix[:-len(self.unit.unit)]
+
+        if not prefix:
+            return self.values.copy()
+
+        if has_prefix(prefix):
+            return _unscale(self.values, get_prefix(prefix))
+
+        return None
+
+    @property
+    def prefix(self) -> Prefix:
+        """
+        The prefix used for display, picked from the largest amount
+        """
+        if not len(self.values):
+            return prefixes.NoPrefix
+        return closest_prefix(float(np.abs(self.values).max()))[1]
+
+    def __repr__(self) -> str:
+        prefix = self.prefix
+        return f'{_unscale(self.values, prefix)} {prefix}{self.unit}'
+
+    __str__ = __repr__
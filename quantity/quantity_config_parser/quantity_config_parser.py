@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from functools import partial
+from functools import partial, wraps
 from configparser import ConfigParser
 from typing import Union, Callable, override
 
@@ -9,11 +9,45 @@ from quantity.unit import NoUnit
 _hex = partial(int, base=16)
 
 
+def _invalidates(method: Callable) -> Callable:
+    """
+    Wrap a :mod:`ConfigParser` method that can change values so it drops the cached quantities afterwards. The cache is
+    replaced rather than cleared, so a reader that looked up an old value while it was changing can only store it in
+    the cache that has been thrown away.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._quantities = {}
+    return wrapper
+
+
 class QuantityConfigParser(ConfigParser):
     """
-    A :mod:`SafeConfigParser` derivative that returns quantities
+    A :mod:`SafeConfigParser` derivative that returns quantities.
+
+    Quantities are cached per (section, option, converter), so reading the same setting again doesn't parse it again.
+    Anything that changes the values (setting or removing options or sections, reading more files, ...) empties the
+    cache. The same :mod:`Quantity` object is returned each time, so don't change it.
     """
 
+    def __init__(self, *args, **kwargs):
+        # {(section, option, converter): Quantity}
+        self._quantities = {}
+        super().__init__(*args, **kwargs)
+
+    set = _invalidates(ConfigParser.set)
+    remove_option = _invalidates(ConfigParser.remove_option)
+    remove_section = _invalidates(ConfigParser.remove_section)
+    add_section = _invalidates(ConfigParser.add_section)
+    read = _invalidates(ConfigParser.read)
+    # read_string goes through read_file and __delitem__ through remove_section
+    read_file = _invalidates(ConfigParser.read_file)
+    read_dict = _invalidates(ConfigParser.read_dict)
+    __setitem__ = _invalidates(ConfigParser.__setitem__)
+
     def get_as(self, section: str, option: str, converter: Callable) -> Quantity:
         """
         Convert a section to a coerced Quantity
@@ -22,8 +56,44 @@ class QuantityConfigParser(ConfigParser):
         :param converter: callable that returns a numeric type from a string (e.g int, float )
         :return: :mod:`Quantity`
         """
-        value, unit = self._split_section_item(section, option)
-        return self.__quantify(converter, value, unit)
+        quantities = self._quantities
+        key = (section, option, converter)
+        quantity = quantities.get(key)
+        if quantity is None:
+            value, unit = self._split_section_item(section, option)
+            quantity = quantities[key] = self.__quantify(converter, value, unit)
+        return quantity
+
+    def get_section_as(self, section: str, converter: Callable = float) -> dict:
+        """
+        Convert every option in a section (including the defaults) to a coerced Quantity in one pass, e.g.
+
+        >>> parser.read_string('[limits]\\ntimeout = 250 ms\\nmax_power = 1.5 kW\\n')
+        >>> parser.get_section_as('limits')
+        {'timeout': 250.0 ms, 'max_power': 1.5 kW}
+
+        :param section: Config section
+        :param converter: callable that returns a numeric type from a string (e.g int, float )
+        :return: {option: :mod:`Quantity`}
+        """
+        quantities = self._quantities
+        result = {}
+        for option, s in self.items(section):
+            key = (section, option, converter)
+            quantity = quantities.get(key)
+            if quantity is None:
+                quantity = quantities[key] = self.__quantify(converter, *self._split_value(s))
+            result[option] = quantity
+        return result
+
+    def get_all_as(self, converter: Callable = float) -> dict:
+        """
+        Convert every option in every section to a coerced Quantity
+
+        :param converter: callable that returns a numeric type from a string (e.g int, float )
+        :return: {section: {option: :mod:`Quantity`}}
+        """
+        return {section: self.get_section_as(section, converter) for section in self.sections()}
 
     @override
     def getint(self, section: str, option: str, converter: Callable = int) -> Quantity:
@@ -71,7 +141,15 @@ class QuantityConfigParser(ConfigParser):
         :param option: Config option
         :return: :mod:`tuple` of value and unit
         """
-        s = self.get(section, option)
+        return self._split_value(self.get(section, option))
+
+    @staticmethod
+    def _split_value(s: str) -> tuple:
+        """
+        Split a config value into value and unit
+        :param s: Config value
+        :return: :mod:`tuple` of value and unit
+        """
         try:
             value, unit = (x.strip() for x in s.split(None, 1))
         except ValueError:
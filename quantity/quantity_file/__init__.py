@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+from .quantity_file import QuantityFile, write_quantities
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+A compact binary file format for large columns of quantities, which is read through a memory map so columns can be
+used as zero copy views and reduced chunk by chunk without loading them.
+
+Layout (little endian)::
+
+    b'PYQC'             magic
+    uint16              format version
+    uint32              header length
+    header              utf-8 JSON with a unit table, a prefix table and the columns
+    padding             to an 8 byte boundary
+    data                each column as raw float64 ('d') or int64 ('q'), 8 byte aligned
+
+Units are stored as their exponent vector of named units, so compound units like m/s² survive the round trip and
+resolve back to the registered :mod:`Unit` objects.
+"""
+
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+
+from quantity.unit import Unit
+from quantity.unit.unit import _from_dimensions
+from quantity.registry.registry import current_snapshot
+from quantity.prefix import Prefix, get_power
+from quantity.quantity import Quantity
+from quantity.optional import import_numpy, is_ndarray
+import quantity.prefix.prefixes as prefixes
+
+MAGIC = b'PYQC'
+VERSION = 1
+_PREAMBLE = struct.Struct('<4sHI')
+_ALIGN = 8
+_INT_TYPECODES = frozenset('bBhHiIlLqQ')
+_LITTLE = sys.byteorder == 'little'
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) & ~(_ALIGN - 1)
+
+
+def _encode_unit(unit: Unit) -> list:
+    """
+    Describe a unit as its exponent vector
+
+    :param unit: :mod:`Unit`
+    :return: [[symbol, name, exponent], ...]
+    """
+    return [[u._unit, u.name, index] for u, index in unit.dimensions]
+
+
+def _decode_unit(dimensions: list) -> Unit:
+    """
+    Find the registered unit for an exponent vector, making temporary units for anything unknown
+
+    :param dimensions: [[symbol, name, exponent], ...]
+    :return: :mod:`Unit`
+    """
+    vector = {}
+    unit_index = current_snapshot().unit_index
+    for symbol, name, index in dimensions:
+        base = unit_index.get(name) or unit_index.get(symbol) or Unit(symbol, name, temp=True)
+        vector[base] = index
+    return _from_dimensions(vector)
+
+
+def _release(view):
+    """
+    Let go of a view on the memory map straight away rather than when it's collected
+    """
+    if isinstance(view, memoryview):
+        view.release()
+
+
+def _column_data(values) -> tuple:
+    """
+    Get the type code and raw bytes of a column
+
+    :param values: numpy array, :mod:`array.array`, buffer or iterable of numbers
+    :return: ('d' or 'q', count, bytes like object)
+    """
+    if is_ndarray(values):
+        numpy = import_numpy()
+        if values.dtype.kind == 'u' and values.dtype.itemsize >= 8:
+            # Values past 2 ** 63 don't fit in int64
+            raise TypeError(f'{values.dtype} columns are not supported, convert them to int64 or float64')
+        if values.dtype.kind in 'iub':
+            return 'q', len(values), numpy.ascontiguousarray(values, dtype='<i8')
+        return 'd', len(values), numpy.ascontiguousarray(values, dtype='<f8')
+
+    if not isinstance(values, array):
+        values = list(values)
+        typecode = 'q' if all(isinstance(v, int) for v in values) and values else 'd'
+        values = array(typecode, values)
+    elif values.typecode in _INT_TYPECODES and values.typecode != 'q':
+        values = array('q', values)
+    elif values.typecode not in 'dq':
+        values = array('d', values)
+    if not _LITTLE:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.typecode, len(values), values
+
+
+def write_quantities(path: str, columns: dict):
+    """
+    Write columns of quantities to a file.
+
+    >>> write_quantities('volts.pyqc', {'volts': ([1.0, 2.0, 3.0], units.volt, prefixes.kilo)})
+
+    :param path: file to write
+    :param columns: {name: (values, :mod:`Unit`[, :mod:`Prefix`])}, values can be a numpy array, an
+                    :mod:`array.array` or any iterable of numbers. A :mod:`QuantityArray` can be passed in place of the
+                    tuple.
+    """
+    units, prefixes_table, described, data = [], [], [], []
+    offset = 0
+    for name, column in columns.items():
+        if isinstance(column, tuple):
+            values, unit, prefix = (column + (prefixes.NoPrefix,))[:3]
+        else:
+            # QuantityArray
+            values, unit, prefix = column.values, column.unit, prefixes.NoPrefix
+        typecode, count, raw = _column_data(values)
+
+        encoded = _encode_unit(unit)
+        if encoded not in units:
+            units.append(encoded)
+        if prefix.power not in prefixes_table:
+            prefixes_table.append(prefix.power)
+        described.append({'name': name, 'unit': units.index(encoded), 'prefix': prefixes_table.index(prefix.power),
+                          'type': typecode, 'count': count, 'offset': offset})
+        data.append((offset, raw))
+        offset = _align(offset + count * 8)
+
+    header = json.dumps({'units': units, 'prefixes': prefixes_table, 'columns': described},
+                        ensure_ascii=False).encode('utf-8')
+    start = _align(_PREAMBLE.size + len(header))
+    with open(path, 'wb') as fp:
+        fp.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        fp.write(header)
+        for column_offset, raw in data:
+            fp.write(b'\0' * (start + column_offset - fp.tell()))
+            fp.write(memoryview(raw).cast('B'))
+
+
+class QuantityFile:
+    """
+    Read a file written by :func:`write_quantities` through a memory map.
+
+    >>> with QuantityFile('volts.pyqc') as qf:
+    ...     qf.max('volts')
+    3.0 kV
+
+    Views handed out by :meth:`column` share the memory map, release them before closing the file.
+
+    :param path: file to read
+    """
+
+    def __init__(self, path: str):
+        self._fp = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            self._fp.close()
+            raise ValueError(f'{path} is not a quantity file')
+        try:
+            self._read_header()
+        except (struct.error, ValueError, KeyError, IndexError, TypeError) as error:
+            # Truncated or corrupt, don't leave the file open
+            self.close()
+            raise ValueError(f'{path} is not a quantity file: {error}') from error
+
+    def _read_header(self):
+        """
+        Read the header and check every column fits in the file
+        """
+        magic, version, length = _PREAMBLE.unpack_from(self._map)
+        if magic != MAGIC or version > VERSION:
+            raise ValueError('bad magic or version')
+        end = _PREAMBLE.size + length
+        if end > len(self._map):
+            raise ValueError('the header runs past the end of the file')
+        header = json.loads(bytes(self._map[_PREAMBLE.size:end]).decode('utf-8'))
+        self._start = _align(end)
+        units = [_decode_unit(u) for u in header['units']]
+        powers = [get_power(p) for p in header['prefixes']]
+        self._columns = {c['name']: (c, units[c['unit']], powers[c['prefix']]) for c in header['columns']}
+        for name, (described, _, _) in self._columns.items():
+            if described['type'] not in ('d', 'q'):
+                raise ValueError(f'column {name!r} has an unknown type {described["type"]!r}')
+            if self._start + described['offset'] + described['count'] * 8 > len(self._map):
+                raise ValueError(f'column {name!r} runs past the end of the file')
+
+    def __enter__(self) -> QuantityFile:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Close the memory map and file
+        """
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Views are still alive, the map goes when they do
+                pass
+            self._map = None
+        self._fp.close()
+
+    @property
+    def columns(self) -> list:
+        return list(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def unit(self, name: str) -> Unit:
+        return self._columns[name][1]
+
+    def prefix(self, name: str) -> Prefix:
+        return self._columns[name][2]
+
+    def column(self, name: str, start: int = 0, stop: int = None) -> memoryview | array:
+        """
+        Get a zero copy view of (part of) a column
+
+        :param name: column name
+        :param start: first value, negative values are clamped to 0
+        :param stop: one past the last value, defaults to the end of the column
+        :return: memoryview of 'd' or 'q' values (a byte swapped copy on big endian machines)
+        """
+        described = self._columns[name][0]
+        count = described['count']
+        stop = count if stop is None else min(max(stop, 0), count)
+        start = min(max(start, 0), stop)
+        offset = self._start + described['offset']
+        view = memoryview(self._map)[offset + start * 8:offset + stop * 8].cast(described['type'])
+        if not _LITTLE:
+            values = array(described['type'], view)
+            values.byteswap()
+            return values
+        return view
+
+    __getitem__ = column
+
+    def array(self, name: str):
+        """
+        Get a column as a read only numpy array sharing the memory map
+
+        :param name: column name
+        :return: numpy array
+        """
+        import numpy
+        described = self._columns[name][0]
+        dtype = '<f8' if described['type'] == 'd' else '<i8'
+        return numpy.frombuffer(self._map, dtype=dtype, count=described['count'],
+                                offset=self._start + described['offset'])
+
+    def quantity(self, name: str, index: int) -> Quantity:
+        """
+        Get one value of a column as a :mod:`Quantity`, negative indices count back from the end
+        """
+        described, unit, prefix = self._columns[name]
+        count = described['count']
+        position = index + count if index < 0 else index
+        if not 0 <= position < count:
+            raise IndexError(index)
+        view = self.column(name, position, position + 1)
+        try:
+            return Quantity(view[0], unit, prefix)
+        finally:
+            _release(view)
+
+    def chunks(self, name: str, chunk_size: int = 1 << 16):
+        """
+        Iterate over a column in chunks of views
+
+        :param name: column name
+        :param chunk_size: values per chunk
+        :return: generator of memoryview
+        """
+        count = self._columns[name][0]['count']
+        for start in range(0, count, chunk_size):
+            yield self.column(name, start, start + chunk_size)
+
+    def _reduce(self, name: str, chunk_size: int) -> tuple:
+        """
+        Reduce a column chunk by chunk
+
+        :return: (count, total, minimum, maximum)
+        """
+        numpy = import_numpy()
+        count, partials, lo, hi = 0, [], None, None
+        for chunk in self.chunks(name, chunk_size):
+            if numpy is not None:
+                values = numpy.asarray(chunk)
+                partials.append(float(values.sum(dtype=numpy.float64)))
+                c_lo, c_hi = values.min().item(), values.max().item()
+                del values
+            else:
+                partials.append(math.fsum(chunk))
+                c_lo, c_hi = min(chunk), max(chunk)
+            lo = c_lo if lo is None else min(lo, c_lo)
+            hi = c_hi if hi is None else max(hi, c_hi)
+            count += len(chunk)
+            _release(chunk)
+        return count, math.fsum(partials), lo, hi
+
+    def _quantity(self, name: str, value) -> Quantity:
+        _, unit, prefix = self._columns[name]
+        return Quantity(value, unit, prefix)
+
+    def sum(self, name: str, chunk_size: int = 1 << 16) -> Quantity:
+        return self._quantity(name, self._reduce(name, chunk_size)[1])
+
+    def mean(self, name: str, chunk_size: int = 1 << 16) -> Quantity | None:
+        count, total, _, _ = self._reduce(name, chunk_size)
+        return self._quantity(name, total / count) if count else None
+
+    def min(self, name: str, chunk_size: int = 1 << 16) -> Quantity | None:
+        lo = self._reduce(name, chunk_size)[2]
+        return None if lo is None else self._quantity(name, lo)
+
+    def max(self, name: str, chunk_size: int = 1 << 16) -> Quantity | None:
+        hi = self._reduce(name, chunk_size)[3]
+        return None if hi is None else self._quantity(name, hi)
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+A sorted index of quantities with a single unit. Entries are kept in order of their SI base values, so range, top-k
+and nearest value queries are a binary search away instead of a scan over every reading.
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+from quantity.unit import Unit, NoUnit
+from quantity.quantity import Quantity
+
+
+class QuantityIndex:
+    """
+    Quantities of one unit, sorted by size whatever their prefixes. Each entry can carry an item (a reading, a row,
+    ...) that queries return instead of the quantity.
+
+    >>> index = QuantityIndex([Quantity(1.2, 'kW'), Quantity(900, 'W'), Quantity(50, 'W')])
+    >>> index.range(Quantity(100, 'W'), Quantity(1, 'kW'))
+    [0.9 kW]
+    >>> index.top(2)
+    [1.2 kW, 0.9 kW]
+    >>> index.nearest(Quantity(1, 'kW'))
+    [0.9 kW]
+
+    :param quantities: iterable of :mod:`Quantity` to start with
+    :param items: iterable of items to go with the quantities, the quantities themselves if not given
+    :param unit: :mod:`Unit` of the index, taken from the first quantity if not given
+    """
+
+    __slots__ = ('unit', 'values', 'items')
+
+    def __init__(self, quantities=(), items=None, unit: Unit | None = None):
+        quantities = list(quantities)
+        if unit is None:
+            unit = quantities[0].unit if quantities else NoUnit
+        self.unit = unit
+        items = quantities if items is None else list(items)
+        assert len(items) == len(quantities), (len(items), len(quantities))
+        entries = sorted(zip(map(self._key, quantities), range(len(items))))
+        # Base values in ascending order, and the item for each one
+        self.values = [value for value, _ in entries]
+        self.items = [items[i] for _, i in entries]
+
+    @classmethod
+    def by_unit(cls, quantities, items=None) -> dict:
+        """
+        Index a mix of quantities, one index per unit
+
+        :param quantities: iterable of :mod:`Quantity`
+        :param items: iterable of items to go with the quantities, the quantities themselves if not given
+        :return: {:mod:`Unit`: :mod:`QuantityIndex`}
+        """
+        quantities = list(quantities)
+        items = quantities if items is None else list(items)
+        groups = {}
+        for q, item in zip(quantities, items):
+            group = groups.setdefault(q.unit, ([], []))
+            group[0].append(q)
+            group[1].append(item)
+        return {unit: cls(group[0], group[1], unit) for unit, group in groups.items()}
+
+    def _key(self, q: Quantity | int | float) -> int | float:
+        """
+        Get the base value to index or search by, units have to match and numbers are only allowed without a unit
+
+        :param q: :mod:`Quantity` or number
+        :return: base value
+        """
+        if isinstance(q, Quantity):
+            assert q.unit is self.unit, (q.unit, self.unit)
+            return float(q)
+        assert self.unit is NoUnit, (self.unit, q)
+        return q
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self):
+        """
+        Iterate over the items in ascending order
+        """
+        return iter(self.items)
+
+    def __contains__(self, q: Quantity) -> bool:
+        value = self._key(q)
+        i = bisect_left(self.values, value)
+        return i < len(self.values) and self.values[i] == value
+
+    def add(self, q: Quantity, item=None):
+        """
+        Add a quantity, keeping the index in order
+
+        :param q: :mod:`Quantity`
+        :param item: item to go with it, the quantity itself if not given
+        """
+        value = self._key(q)
+        i = bisect_right(self.values, value)
+        self.values.insert(i, value)
+        self.items.insert(i, q if item is None else item)
+
+    def remove(self, q: Quantity, item=None):
+        """
+        Remove an entry
+
+        :param q: :mod:`Quantity`
+        :param item: the item that went with it, the first entry with the same size if not given
+        :raises ValueError: if there is no such entry
+        """
+        value = self._key(q)
+        i = bisect_left(self.values, value)
+        end = bisect_right(self.values, value, i)
+        for j in range(i, end):
+            if item is None or self.items[j] is item or self.items[j] == item:
+                del self.values[j]
+                del self.items[j]
+                return
+        raise ValueError(f'{q} is not in the index')
+
+    def _bounds(self, low, high, inclusive: bool) -> tuple:
+        """
+        Get the slice of entries between two sizes
+        """
+        start = 0
+        end = len(self.values)
+        if low is not None:
+            low = self._key(low)
+            start = bisect_left(self.values, low) if inclusive else bisect_right(self.values, low)
+        if high is not None:
+            high = self._key(high)
+            end = bisect_right(self.values, high) if inclusive else bisect_left(self.values, high)
+        return start, max(start, end)
+
+    def range(self, low: Quantity | None = None, high: Quantity | None = None, inclusive: bool = True) -> list:
+        """
+        Get the items between two sizes, in ascending order
+
+        :param low: smallest size, None for no lower limit
+        :param high: largest size, None for no upper limit
+        :param inclusive: include items equal to the limits
+        :return: list of items
+        """
+        start, end = self._bounds(low, high, inclusive)
+        return self.items[start:end]
+
+    def count(self, low: Quantity | None = None, high: Quantity | None = None, inclusive: bool = True) -> int:
+        """
+        Count the items between two sizes without copying them
+
+        :param low: smallest size, None for no lower limit
+        :param high: largest size, None for no upper limit
+        :param inclusive: include items equal to the limits
+        :return: number of items
+        """
+        start, end = self._bounds(low, high, inclusive)
+        return end - start
+
+    def top(self, k: int) -> list:
+        """
+        Get the k largest items, largest first
+        """
+        return self.items[:-k - 1:-1] if k > 0 else []
+
+    def bottom(self, k: int) -> list:
+        """
+        Get the k smallest items, smallest first
+        """
+        return self.items[:max(k, 0)]
+
+    def nearest(self, q: Quantity, k: int = 1) -> list:
+        """
+        Get the k items closest in size to a quantity, closest first
+
+        :param q: :mod:`Quantity` to search around
+        :param k: number of items
+        :return: list of items
+        """
+        value = self._key(q)
+        values = self.values
+        right = bisect_left(values, value)
+        left = right - 1
+        nearest = []
+        while len(nearest) < k and (left >= 0 or right < len(values)):
+            if right >= len(values) or (left >= 0 and value - values[left] <= values[right] - value):
+                nearest.append(self.items[left])
+                left -= 1
+            else:
+                nearest.append(self.items[right])
+                right += 1
+        return nearest
+
+    def min(self) -> Quantity:
+        return Quantity._from_base(self.values[0], self.unit)
+
+    def max(self) -> Quantity:
+        return Quantity._from_base(self.values[-1], self.unit)
+
+    def __repr__(self) -> str:
+        items = ', '.join(repr(item) for item in islice(self.items, 10))
+        more = ', ...' if len(self.items) > 10 else ''
+        return f'<QuantityIndex {self.unit}: [{items}{more}]>'
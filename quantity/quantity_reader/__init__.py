@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+from .quantity_reader import Batch, read_quantities
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+Streaming ingestion of text/CSV columns holding values like "12.5 kV". Rows are read one at a time, each distinct unit
+string in a column is resolved once, and values are handed back in fixed size batches of floats per column and unit,
+so memory use doesn't depend on the size of the input.
+"""
+
+import csv
+import re
+from array import array
+from collections import namedtuple
+from typing import Iterable
+
+from quantity.unit import Unit
+from quantity.converter import Converter
+from quantity.unit_parser import parse_unit
+import quantity.prefix.prefixes as prefixes
+
+Batch = namedtuple('Batch', 'column unit prefix values')
+Batch.__doc__ = """
+A batch of values from one column that share a unit.
+
+:param column: column name (or index when there is no header)
+:param unit: :mod:`Unit` of the values
+:param prefix: :mod:`Prefix` the values are expressed in
+:param values: ``array('d')`` of values
+"""
+
+# A number with the unit hard up against it e.g. 12.5kV
+_VALUE_UNIT = re.compile(r'\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*(.*?)\s*$')
+
+
+def _split_value(text: str) -> tuple:
+    """
+    Split a cell into a value and unit string
+
+    :param text: cell text, e.g. '12.5 kV'
+    :return: (value string, unit string)
+    """
+    parts = text.split(None, 1)
+    if len(parts) == 2:
+        return parts[0], parts[1].strip()
+    match = _VALUE_UNIT.match(text)
+    if match is None:
+        return text, ''
+    return match.groups()
+
+
+def _power_scaling(power: int) -> tuple:
+    """
+    Scale by a power of 10 as a multiplier and a divisor, dividing by an exact power of 10 rounds once, so 9 ms is the
+    same float as 0.009 rather than 9 * 0.001
+
+    :param power: power of 10
+    :return: (multiplier, divisor)
+    """
+    if power < 0:
+        return 1, 10 ** -power
+    return 10 ** power, 1
+
+
+def _resolver(target: Unit | str | None):
+    """
+    Make a function that resolves a unit string to how its values are scaled and where they go
+
+    :param target: Unit to convert every value to, or None to keep SI base values in their own unit
+    :return: callable taking a unit string and returning (multiplier, divisor, offset, :mod:`Unit`, :mod:`Prefix`)
+    """
+    if target is None:
+        def resolve(unit: str) -> tuple:
+            prefix, unit = parse_unit(unit)
+            return (*_power_scaling(prefix.power), 0.0, unit, prefixes.NoPrefix)
+        return resolve
+
+    if isinstance(target, str):
+        target_prefix, target_unit = parse_unit(target)
+    else:
+        target_prefix, target_unit = prefixes.NoPrefix, target
+
+    def resolve(unit: str) -> tuple:
+        prefix, source_unit = parse_unit(unit)
+        if source_unit is target_unit:
+            # Only the prefix changes
+            return (*_power_scaling(prefix.power - target_prefix.power), 0.0, target_unit, target_prefix)
+        converter = Converter(unit, target_unit, target_prefix=target_prefix)
+        return converter.scale, 1, converter.offset, target_unit, target_prefix
+    return resolve
+
+
+def read_quantities(stream: Iterable[str], columns: Iterable = None, targets: dict = None, batch_size: int = 4096,
+                    header: bool = True, **fmtparams):
+    """
+    Read a CSV stream and yield batches of values per column and unit.
+
+    >>> import io
+    >>> for batch in read_quantities(io.StringIO('volts,amps\\n12.5 kV,300 mA\\n11 kV,250 mA\\n')):
+    ...     print(batch.column, batch.unit, list(batch.values))
+    volts V [12500.0, 11000.0]
+    amps A [0.3, 0.25]
+
+    :param stream: a text file or any iterable of lines
+    :param columns: column names (or indices) to read, defaults to all columns
+    :param targets: {column: unit string or :mod:`Unit`} to convert values of a column to. Values in other columns
+                    are SI base values (no prefix) of whatever unit they were written with
+    :param batch_size: most values to hold per column and unit before yielding them
+    :param header: the first row holds column names
+    :param fmtparams: passed on to :func:`csv.reader`, e.g. delimiter
+    :return: generator of :mod:`Batch`
+    """
+    rows = csv.reader(stream, **fmtparams)
+    names = next(rows, None) if header else None
+    if names is None and header:
+        return
+
+    targets = targets or {}
+    wanted = None
+    if columns is not None:
+        wanted = list(columns)
+        if names is not None:
+            wanted = [names.index(c) if isinstance(c, str) else c for c in wanted]
+
+    # Per column: {unit string: (multiplier, divisor, offset, bucket key)}, resolved lazily
+    resolved = {}
+    resolvers = {}
+    buckets = {}
+
+    for row in rows:
+        for i in (wanted if wanted is not None else range(len(row))):
+            if i >= len(row):
+                continue
+            text = row[i]
+            if not text or text.isspace():
+                continue
+            column = names[i] if names is not None else i
+            value, unit = _split_value(text)
+
+            known = resolved.get(column)
+            if known is None:
+                known = resolved[column] = {}
+                resolvers[column] = _resolver(targets.get(column))
+            scaling = known.get(unit)
+            if scaling is None:
+                scale, divisor, offset, to_unit, to_prefix = resolvers[column](unit)
+                scaling = known[unit] = (scale, divisor, offset, (column, to_unit, to_prefix))
+            scale, divisor, offset, key = scaling
+
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = array('d')
+            bucket.append(float(value) * scale / divisor + offset)
+            if len(bucket) >= batch_size:
+                yield Batch(*key, bucket)
+                buckets[key] = array('d')
+
+    for key, bucket in buckets.items():
+        if bucket:
+            yield Batch(*key, bucket)
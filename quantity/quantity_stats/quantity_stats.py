@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+Running statistics over a stream of quantities in constant memory. The count, mean and sum of squared differences
+are updated with Welford's method as values arrive, and accumulators from different workers combine with the
+parallel form of the same update, so nothing needs to keep the values themselves.
+"""
+
+import math
+
+from quantity.unit import Unit, NoUnit
+from quantity.quantity import Quantity
+from quantity.optional import is_quantity_array
+
+
+class QuantityStats:
+    """
+    Count, mean, variance, min and max of a stream of quantities. The unit is fixed by the first value.
+
+    >>> stats = QuantityStats()
+    >>> stats.update(Quantity(v, 'W') for v in (2, 4, 4, 4, 5, 5, 7, 9))
+    >>> stats.mean, stats.pstdev, stats.max
+    (5.0 W, 2.0 W, 9.0 W)
+
+    :param quantities: optional iterable of :mod:`Quantity` (or a :mod:`QuantityArray`) to start with
+    """
+
+    __slots__ = ('unit', 'count', '_mean', '_m2', '_min', '_max')
+
+    def __init__(self, quantities=()):
+        self.unit = None
+        self.count = 0
+        self._mean = 0.0
+        # Sum of squared differences from the mean
+        self._m2 = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self.update(quantities)
+
+    def _check_unit(self, unit: Unit):
+        """
+        Fix the unit on the first value and make sure the rest match it
+        """
+        if self.unit is None:
+            self.unit = unit
+        else:
+            assert unit is self.unit, (unit, self.unit)
+
+    def add(self, q: Quantity | int | float):
+        """
+        Add one value
+
+        :param q: :mod:`Quantity`, or a number if we have no unit
+        """
+        if isinstance(q, Quantity):
+            self._check_unit(q.unit)
+            value = q._value
+        else:
+            self._check_unit(NoUnit)
+            value = q
+        self.count += 1
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+
+    def update(self, quantities):
+        """
+        Add a batch of values
+
+        :param quantities: iterable of :mod:`Quantity` (or numbers if we have no unit) or a :mod:`QuantityArray`
+        """
+        if is_quantity_array(quantities):
+            values = quantities.values
+            if len(values):
+                self._check_unit(quantities.unit)
+                mean = float(values.mean())
+                self._combine(len(values), mean, float(((values - mean) ** 2).sum()), float(values.min()),
+                              float(values.max()))
+            return
+
+        iterator = iter(quantities)
+        for first in iterator:
+            break
+        else:
+            return
+        # A bad value leaves us as we were before the batch
+        saved = self.unit, self.count, self._mean, self._m2, self._min, self._max
+        try:
+            self.add(first)
+
+            # Welford's update with everything in locals
+            unit = self.unit
+            count, mean, m2, lo, hi = self.count, self._mean, self._m2, self._min, self._max
+            for q in iterator:
+                if isinstance(q, Quantity):
+                    assert q.unit is unit, (q.unit, unit)
+                    value = q._value
+                else:
+                    assert unit is NoUnit, (NoUnit, unit)
+                    value = q
+                count += 1
+                delta = value - mean
+                mean += delta / count
+                m2 += delta * (value - mean)
+                if value < lo:
+                    lo = value
+                if value > hi:
+                    hi = value
+        except BaseException:
+            self.unit, self.count, self._mean, self._m2, self._min, self._max = saved
+            raise
+        self.count, self._mean, self._m2, self._min, self._max = count, mean, m2, lo, hi
+
+    def _combine(self, count: int, mean: float, m2: float, lo: float, hi: float):
+        """
+        Fold in the statistics of another set of values
+        """
+        if not count:
+            return
+        total = self.count + count
+        delta = mean - self._mean
+        self._mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self._min = min(self._min, lo)
+        self._max = max(self._max, hi)
+
+    def merge(self, other: QuantityStats) -> QuantityStats:
+        """
+        Fold another accumulator (e.g. from another worker) into this one
+
+        :param other: :mod:`QuantityStats`
+        :return: self
+        """
+        if other.count:
+            self._check_unit(other.unit)
+            self._combine(other.count, other._mean, other._m2, other._min, other._max)
+        return self
+
+    def copy(self) -> QuantityStats:
+        obj = QuantityStats.__new__(QuantityStats)
+        obj.unit, obj.count, obj._mean, obj._m2, obj._min, obj._max = (self.unit, self.count, self._mean, self._m2,
+                                                                        self._min, self._max)
+        return obj
+
+    def __add__(self, other: QuantityStats) -> QuantityStats:
+        return self.copy().merge(other)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _quantity(self, value: float, unit: Unit | None = None) -> Quantity:
+        return Quantity._from_base(value, self.unit if unit is None else unit)
+
+    def _require(self, count: int):
+        if self.count < count:
+            raise ValueError(f'needs at least {count} value{"s" if count > 1 else ""}')
+
+    @property
+    def mean(self) -> Quantity:
+        self._require(1)
+        return self._quantity(self._mean)
+
+    @property
+    def min(self) -> Quantity:
+        self._require(1)
+        return self._quantity(self._min)
+
+    @property
+    def max(self) -> Quantity:
+        self._require(1)
+        return self._quantity(self._max)
+
+    @property
+    def variance(self) -> Quantity:
+        """
+        The sample variance, in the square of the unit
+        """
+        self._require(2)
+        return self._quantity(self._m2 / (self.count - 1), self.unit ** 2)
+
+    @property
+    def pvariance(self) -> Quantity:
+        """
+        The population variance, in the square of the unit
+        """
+        self._require(1)
+        return self._quantity(self._m2 / self.count, self.unit ** 2)
+
+    @property
+    def stdev(self) -> Quantity:
+        """
+        The sample standard deviation
+        """
+        self._require(2)
+        return self._quantity(math.sqrt(self._m2 / (self.count - 1)))
+
+    @property
+    def pstdev(self) -> Quantity:
+        """
+        The population standard deviation
+        """
+        self._require(1)
+        return self._quantity(math.sqrt(self._m2 / self.count))
+
+    def __repr__(self) -> str:
+        if not self.count:
+            return '<QuantityStats: no values>'
+        return f'<QuantityStats: {self.count} values, mean {self.mean}, min {self.min}, max {self.max}>'
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+from .registry import Registry, Snapshot, current_registry, current_snapshot, use_registry, default_registry
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+Registries of units, prefixes and the conversions between them. Writers change a registry's tables while holding its
+lock; readers never touch the tables, they use an immutable :mod:`Snapshot` copied from them, so lookups take no lock
+and always see a consistent set of units. Anything worked out from the tables (unit products, compiled conversions,
+prefix tables, ...) is cached on the snapshot and is dropped along with it when the registry changes.
+
+Each context has a current registry, the shared default one unless :func:`use_registry` says otherwise, so a
+thread or task can work with its own set of units.
+"""
+
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
+
+# The tables every registry holds
+TABLES = ('unit_index', 'combined_units', 'divided_units', 'conversions', 'power_index', 'prefix_index')
+
+# Numbers each snapshot, so caches can key on a snapshot without keeping it alive
+_versions = itertools.count()
+
+
+class RegistryDict(dict):
+    """
+    A registry table, which tells its registry whenever it changes so the next reader gets a fresh snapshot. Changes
+    are made holding the registry's lock, so a snapshot is never copied from a table that is half way through one.
+    """
+
+    def __init__(self, *args, changed=None, lock=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.changed = changed
+        self.lock = threading.RLock() if lock is None else lock
+
+    def _changed(self):
+        if self.changed is not None:
+            self.changed()
+
+    def __setitem__(self, key, value):
+        with self.lock:
+            super().__setitem__(key, value)
+            self._changed()
+
+    def __delitem__(self, key):
+        with self.lock:
+            super().__delitem__(key)
+            self._changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        with self.lock:
+            super().update(*args, **kwargs)
+            self._changed()
+
+    def setdefault(self, key, default=None):
+        with self.lock:
+            value = super().setdefault(key, default)
+            self._changed()
+            return value
+
+    def pop(self, *args):
+        with self.lock:
+            value = super().pop(*args)
+            self._changed()
+            return value
+
+    def popitem(self):
+        with self.lock:
+            item = super().popitem()
+            self._changed()
+            return item
+
+    def clear(self):
+        with self.lock:
+            super().clear()
+            self._changed()
+
+
+class Snapshot:
+    """
+    A read only copy of a registry's tables, along with the lookups worked out from them.
+
+    The caches are filled in on demand by the unit, prefix and parser modules. Two threads may both work out the same
+    entry, but they always agree on it, so nothing needs locking.
+    """
+
+    __slots__ = TABLES + ('version', 'products', 'quotients', 'compiled_conversions', 'conversion_graph',
+                          'exponent_table', 'derived')
+
+    def __init__(self, tables: dict):
+        # Unique across every registry, a new snapshot always gets a new version
+        self.version = next(_versions)
+        for name in TABLES:
+            setattr(self, name, MappingProxyType(dict(tables[name])))
+        # Unit products and quotients, {(:mod:`Unit`, :mod:`Unit`): :mod:`Unit`}
+        self.products = {}
+        self.quotients = {}
+        # Conversions folded to (scale, offset), {(:mod:`Unit`, :mod:`Unit`): (scale, offset) or None}
+        self.compiled_conversions = {}
+        # {:mod:`Unit`: [(:mod:`Unit`, (scale, offset)), ...]}
+        self.conversion_graph = None
+        # (lowest power, highest power, tuple of :mod:`Prefix` by exponent)
+        self.exponent_table = None
+        # Anything else other modules want to keep per snapshot, by name
+        self.derived = {}
+
+
+class Registry:
+    """
+    A set of units, prefixes, derived units and conversions.
+
+    >>> tenant = default_registry.fork()
+    >>> with use_registry(tenant):
+    ...     furlong = Unit('fur', 'furlong')
+    >>> has_unit('fur')
+    False
+
+    :param source: :mod:`Registry` or :mod:`Snapshot` to copy the tables from, or None to start empty
+    """
+
+    __slots__ = TABLES + ('_lock', '_snapshot', '_writing')
+
+    def __init__(self, source: Registry | Snapshot | None = None):
+        self._lock = threading.RLock()
+        self._snapshot = None
+        self._writing = False
+        if isinstance(source, Registry):
+            source = source.snapshot()
+        for name in TABLES:
+            setattr(self, name, RegistryDict(getattr(source, name, ()), changed=self._changed, lock=self._lock))
+
+    def _changed(self):
+        """
+        Drop the snapshot after a change, unless a writer is batching changes and will drop it when they're done
+        """
+        if not self._writing:
+            self._snapshot = None
+
+    def snapshot(self) -> Snapshot:
+        """
+        Get the current snapshot of the tables
+
+        :return: :mod:`Snapshot`
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._snapshot = Snapshot({name: getattr(self, name) for name in TABLES})
+        return snapshot
+
+    @contextmanager
+    def write(self):
+        """
+        Change the tables while holding the lock. Readers keep using the old snapshot until the block finishes,
+        so they never see half of a change.
+
+        >>> with registry.write():
+        ...     registry.conversions[(inch, foot)] = ((operator.truediv, 12),)
+        """
+        with self._lock:
+            if self._writing:
+                yield self
+                return
+            self._writing = True
+            try:
+                yield self
+            finally:
+                self._writing = False
+                self._snapshot = None
+
+    def register_unit(self, unit):
+        """
+        Add a unit under its symbol and name
+
+        :param unit: :mod:`Unit`
+        """
+        with self.write():
+            self.unit_index[unit.unit] = unit
+            self.unit_index[unit.name] = unit
+
+    def register_prefix(self, prefix):
+        """
+        Add a prefix under its power and symbol
+
+        :param prefix: :mod:`Prefix`
+        """
+        with self.write():
+            self.power_index[prefix.power] = prefix
+            self.prefix_index[prefix.prefix] = prefix
+
+    def fork(self) -> Registry:
+        """
+        Make a new registry starting with a copy of this one's tables
+
+        :return: :mod:`Registry`
+        """
+        return Registry(self)
+
+
+# The registry everything is registered in unless a context says otherwise
+default_registry = Registry()
+
+_current = ContextVar('quantity_registry', default=default_registry)
+
+
+def current_registry() -> Registry:
+    """
+    Get the registry for the current context
+
+    :return: :mod:`Registry`
+    """
+    return _current.get()
+
+
+def current_snapshot() -> Snapshot:
+    """
+    Get the snapshot of the current context's registry, this is what lookups use
+
+    :return: :mod:`Snapshot`
+    """
+    registry = _current.get()
+    return registry._snapshot or registry.snapshot()
+
+
+@contextmanager
+def use_registry(registry: Registry):
+    """
+    Use a registry for units, prefixes and conversions within a block. It applies to the current thread or task,
+    others keep their own.
+
+    :param registry: :mod:`Registry`
+    """
+    token = _current.set(registry)
+    try:
+        yield registry
+    finally:
+        _current.reset(token)
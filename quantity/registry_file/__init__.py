@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+from .registry_file import parse_registry_file, install, compile_registry_file, load_registry_file
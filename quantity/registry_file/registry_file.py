@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+Declare units, prefixes, derived units and conversions in a data file instead of Python, e.g.::
+
+    # symbol = name
+    [units]
+    fur = furlong
+    ch = chain
+
+    # symbol = name power
+    [prefixes]
+    da = deca 1
+
+    [combined]
+    V * A = W
+
+    [divided]
+    W / A = V
+
+    # from -> to = operations, applied left to right. A bare number multiplies, so a negative scale is '* -1.5'
+    [conversions]
+    fur -> m = 201.168
+    ch -> fur = / 10
+    °F -> K = - 32, * 5, / 9, + 273.15
+
+Units in the derivations and conversions can be ones the file declares or ones already registered, by symbol or name.
+
+Parsing the file is the slow part, so :func:`load_registry_file` keeps a compiled snapshot next to it and loads that
+instead while it matches. The snapshot is marshalled plain data with a hash of the source file (and the snapshot
+format) in front, so an edited file or a snapshot from another version is rebuilt rather than trusted. Either way the
+units go into the registry in one write, so readers see all of them or none.
+
+Layout::
+
+    b'PYQR'             magic
+    uint16              format version
+    32 bytes            sha256 of the format version and the source file
+    payload             marshalled (units, prefixes, combined, divided, conversions)
+"""
+
+import hashlib
+import marshal
+import operator
+import os
+import struct
+from configparser import ConfigParser
+
+from quantity.unit import Unit
+from quantity.prefix import Prefix
+from quantity.registry.registry import Registry, current_registry
+
+MAGIC = b'PYQR'
+VERSION = 1
+_PREAMBLE = struct.Struct('<4sH32s')
+
+# Where the compiled snapshot goes, unless told otherwise
+SUFFIX = '.snapshot'
+
+_operators = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
+
+
+def _digest(source: bytes) -> bytes:
+    """
+    Hash a source file along with everything else the snapshot depends on
+    """
+    return hashlib.sha256(struct.pack('<HH', VERSION, marshal.version) + source).digest()
+
+
+def _split(key: str, separator: str, where: str) -> tuple:
+    parts = [part.strip() for part in key.split(separator)]
+    if len(parts) != 2 or not all(parts):
+        raise ValueError(f'{where}: expected "a {separator} b"')
+    return tuple(parts)
+
+
+def _operations(text: str, where: str) -> tuple:
+    """
+    Parse a conversion like '- 32, * 5, / 9' into (('-', 32.0), ('*', 5.0), ('/', 9.0))
+    """
+    operations = []
+    for step in text.split(','):
+        step = step.strip()
+        symbol = step[:1]
+        if symbol in _operators:
+            step = step[1:]
+        else:
+            symbol = '*'
+        try:
+            operations.append((symbol, float(step)))
+        except ValueError:
+            raise ValueError(f'{where}: bad conversion step {step!r}') from None
+    return tuple(operations)
+
+
+def parse_registry_file(text: str, path: str = '<string>') -> tuple:
+    """
+    Parse the text of a registry file into plain data
+
+    :param text: file contents
+    :param path: file name, for errors
+    :return: (units, prefixes, combined, divided, conversions) tuples of strings and numbers
+    """
+    parser = ConfigParser(delimiters=('=',), interpolation=None)
+    parser.optionxform = str
+    parser.read_string(text, path)
+    for section in parser.sections():
+        if section not in ('units', 'prefixes', 'combined', 'divided', 'conversions'):
+            raise ValueError(f'{path}: unknown section [{section}]')
+
+    def items(section):
+        if not parser.has_section(section):
+            return ()
+        return ((key, value.strip(), f'{path}: [{section}] {key}') for key, value in parser.items(section))
+
+    units = tuple((symbol, name) for symbol, name, _ in items('units'))
+    prefixes = []
+    for symbol, value, where in items('prefixes'):
+        try:
+            name, power = value.split()
+            prefixes.append((symbol, name, int(power)))
+        except ValueError:
+            raise ValueError(f'{where}: expected "name power"') from None
+    combined = tuple(_split(key, '*', where) + (value,) for key, value, where in items('combined'))
+    divided = tuple(_split(key, '/', where) + (value,) for key, value, where in items('divided'))
+    conversions = tuple(_split(key, '->', where) + (_operations(value, where),)
+                        for key, value, where in items('conversions'))
+    return units, tuple(prefixes), combined, divided, conversions
+
+
+def install(description: tuple, registry: Registry | None = None) -> Registry:
+    """
+    Add parsed registry data to a registry in one write. Everything is resolved before the registry is touched, so
+    an unknown unit leaves it as it was. Units and prefixes that are already registered with the same symbol, name
+    (and power) are kept, so existing :mod:`Unit` and :mod:`Prefix` objects stay valid.
+
+    :param description: what :func:`parse_registry_file` returns
+    :param registry: :mod:`Registry` to add to, the current one by default
+    :return: the :mod:`Registry`
+    """
+    if registry is None:
+        registry = current_registry()
+    units, prefixes, combined, divided, conversions = description
+    with registry.write():
+        unit_index = registry.unit_index
+        new_units = {}
+        for symbol, name in units:
+            unit = unit_index.get(symbol)
+            if unit is None or unit.unit != symbol or unit.name != name:
+                # Not through the metaclass, we register them all at once below
+                unit = Unit.__new__(Unit)
+                unit.__init__(symbol, name)
+            new_units[symbol] = unit
+            new_units[name] = unit
+
+        prefix_index = registry.prefix_index
+        new_prefixes = {}
+        new_powers = {}
+        for symbol, name, power in prefixes:
+            prefix = prefix_index.get(symbol)
+            if prefix is None or prefix.prefix != symbol or prefix.name != name or prefix.power != power:
+                prefix = Prefix.__new__(Prefix)
+                prefix.__init__(symbol, name, power)
+            new_prefixes[symbol] = prefix
+            new_powers[power] = prefix
+
+        # Each distinct chain of operations is only built once
+        steps = {operations: tuple((_operators[o], v) for o, v in operations) for _, _, operations in conversions}
+        index = dict(unit_index)
+        index.update(new_units)
+        try:
+            new_combined = {frozenset((index[a], index[b])): index[c] for a, b, c in combined}
+            new_divided = {(index[a], index[b]): index[c] for a, b, c in divided}
+            new_conversions = {(index[a], index[b]): steps[operations] for a, b, operations in conversions}
+        except KeyError as e:
+            raise ValueError(f'Unknown unit {e.args[0]!r}') from None
+
+        unit_index.update(new_units)
+        prefix_index.update(new_prefixes)
+        registry.power_index.update(new_powers)
+        registry.combined_units.update(new_combined)
+        registry.divided_units.update(new_divided)
+        registry.conversions.update(new_conversions)
+    return registry
+
+
+def _read_snapshot(path: str, digest: bytes) -> tuple | None:
+    """
+    Get the data from a compiled snapshot if it's for this source
+
+    :return: the description or None if it's missing, damaged or stale
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < _PREAMBLE.size:
+        return None
+    magic, version, stored = _PREAMBLE.unpack_from(data)
+    if magic != MAGIC or version != VERSION or stored != digest:
+        return None
+    try:
+        return marshal.loads(memoryview(data)[_PREAMBLE.size:])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_snapshot(path: str, digest: bytes, description: tuple):
+    """
+    Write a compiled snapshot, replacing any old one in one step so readers never see half a file
+    """
+    temp = f'{path}.{os.getpid()}.tmp'
+    with open(temp, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, digest))
+        f.write(marshal.dumps(description))
+    os.replace(temp, path)
+
+
+def compile_registry_file(path: str, snapshot: str | None = None) -> str:
+    """
+    Parse a registry file and write its compiled snapshot
+
+    :param path: registry file
+    :param snapshot: where to write it, the file name plus :data:`SUFFIX` by default
+    :return: the snapshot's path
+    """
+    with open(path, 'rb') as f:
+        source = f.read()
+    snapshot = snapshot or os.fspath(path) + SUFFIX
+    _write_snapshot(snapshot, _digest(source), parse_registry_file(source.decode('utf-8'), os.fspath(path)))
+    return snapshot
+
+
+def load_registry_file(path: str, registry: Registry | None = None, snapshot: str | bool | None = None) -> Registry:
+    """
+    Add the units in a registry file to a registry, using its compiled snapshot when it is up to date and
+    (re)building the snapshot when it isn't.
+
+    >>> tenant = load_registry_file('lengths.ini', default_registry.fork())
+    >>> with use_registry(tenant):
+    ...     print(Quantity(1, 'kfur').convert(get_unit('m')))
+    201.168 km
+
+    :param path: registry file
+    :param registry: :mod:`Registry` to add to, the current one by default
+    :param snapshot: where to keep the compiled snapshot, the file name plus :data:`SUFFIX` by default, or False to
+                     always parse the file
+    :return: the :mod:`Registry`
+    """
+    with open(path, 'rb') as f:
+        source = f.read()
+    if snapshot is False:
+        return install(parse_registry_file(source.decode('utf-8'), os.fspath(path)), registry)
+
+    snapshot = snapshot or os.fspath(path) + SUFFIX
+    digest = _digest(source)
+    description = _read_snapshot(snapshot, digest)
+    if description is None:
+        description = parse_registry_file(source.decode('utf-8'), os.fspath(path))
+        try:
+            _write_snapshot(snapshot, digest, description)
+        except OSError:
+            # Read only install, we'll just parse it again next time
+            pass
+    return install(description, registry)
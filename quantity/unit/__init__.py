@@ -1,4 +1,4 @@
 __author__ = 'akm'
-from .unit import (Unit, has_combined_unit, has_conversion, has_divided_unit, has_unit, get_conversion, get_unit,
-                   get_units, NoUnit)
+from .unit import (Unit, CompoundUnit, has_combined_unit, has_conversion, has_divided_unit, has_unit, get_conversion,
+                   get_affine_conversion, get_unit, get_units, NoUnit)
 from . import units
@@ -3,15 +3,23 @@ from __future__ import annotations
 
 """
 A class representing a unit of measure. Similar units can be added or subtracted, while any two units can be multiplied
-or divided. There are some lookups for units that can be derived from multiplying or dividing two units.
+or divided. There are some lookups for units that can be derived from multiplying or dividing two units, anything else
+becomes a compound unit made of powers of the named units.
 """
+import operator
+
+from quantity.registry.registry import default_registry, current_registry, current_snapshot
+import quantity.instrumentation.instrumentation as instrumentation
 
 
 class MetaUnit(type):
-    unit_index = {}
-    combined_units = {}
-    divided_units = {}
-    conversions = {}
+    # The default registry's tables, lookups go through the current context's registry (see quantity.registry)
+    unit_index = default_registry.unit_index
+    combined_units = default_registry.combined_units
+    divided_units = default_registry.divided_units
+    conversions = default_registry.conversions
+    # Interned compound units, keyed by their canonical exponent vector
+    compound_units = {}
 
     def __call__(cls, *args, **kwargs):
         """
@@ -19,11 +27,83 @@ class MetaUnit(type):
         """
         obj = super(MetaUnit, cls).__call__(*args, **kwargs)
         if not ('temp' in kwargs and kwargs.get('temp')) or (len(args) == 3 and not args[-1]):
-            MetaUnit.unit_index[obj.unit] = obj
-            MetaUnit.unit_index[obj.name] = obj
+            current_registry().register_unit(obj)
+        elif instrumentation.enabled:
+            instrumentation.record('unit.temp')
         return obj
 
 
+# Unicode superscripts for powers , 0, 1, 2, 3, 4, 5 etc..
+_supers = ('⁰', '¹', '²', '³', '⁴', '⁵', '⁶', '⁷', '⁸', '⁹')
+
+# Don't let the memoised products and quotients grow without bound
+_MEMO_SIZE = 4096
+
+
+def _superscript(index: int) -> str:
+    """
+    Render an exponent as unicode superscripts
+
+    :param index: exponent
+    :return: superscript string
+    """
+    sign = ''
+    if index < 0:
+        sign = '⁻'
+        index = -index
+    if index < 10:
+        return f'{sign}{_supers[index]}'
+    elif index < 100:
+        t, u = divmod(index, 10)
+        return f'{sign}{_supers[t]}{_supers[u]}'
+    return f'^{sign}{index}'
+
+
+def _dimension_order(item: tuple) -> tuple:
+    """
+    Sort key that puts an exponent vector in canonical order, numerator first.
+    """
+    unit, index = item
+    return index < 0, unit._unit, unit.name, id(unit)
+
+
+def _from_dimensions(dimensions: dict) -> Unit:
+    """
+    Get the unit for an exponent vector, interning new compound units
+
+    :param dimensions: {:mod:`Unit`: exponent} with no zero exponents
+    :return: :mod:`Unit`
+    """
+    if not dimensions:
+        return NoUnit
+    if len(dimensions) == 1:
+        ((unit, index),) = dimensions.items()
+        if index == 1:
+            return unit
+    key = tuple(sorted(dimensions.items(), key=_dimension_order))
+    unit = MetaUnit.compound_units.get(key)
+    if unit is None:
+        if instrumentation.enabled:
+            instrumentation.record('unit.compound')
+        # setdefault so racing threads still agree on one instance
+        unit = MetaUnit.compound_units.setdefault(key, CompoundUnit._from_dimensions(key))
+    return unit
+
+
+def _combine(a: Unit, b: Unit, sign: int) -> Unit:
+    """
+    Multiply (sign 1) or divide (sign -1) two units by adding their exponent vectors
+    """
+    dimensions = dict(a.dimensions)
+    for unit, index in b.dimensions:
+        index = dimensions.get(unit, 0) + sign * index
+        if index:
+            dimensions[unit] = index
+        else:
+            del dimensions[unit]
+    return _from_dimensions(dimensions)
+
+
 class Unit(metaclass=MetaUnit):
     """
     An SI unit of measure.
@@ -33,12 +113,13 @@ class Unit(metaclass=MetaUnit):
     :param temp: Is this a temporary unit (created when combining units)
     """
 
-    x_names = ('', '', 'square ', 'cubic ', 'quartic', 'quintic', 'sextic', 'septic', 'octic', 'nonic', 'decic')
+    x_names = ('', '', 'square ', 'cubic ', 'quartic ', 'quintic ', 'sextic ', 'septic ', 'octic ', 'nonic ',
+               'decic ')
 
     # Unicode superscripts for powers , 0, 1, 2, 3, 4, 5 etc..
-    supers = ('⁰', '¹', '²', '³', '⁴', '⁵', '⁶', '⁷', '⁸', '⁹')
+    supers = _supers
 
-    __slots__ = ('unit', 'name', '_unit', 'index', 'x_name')
+    __slots__ = ('unit', 'name', '_unit', 'index', 'x_name', 'dimensions')
 
     # temp is parsed by the metaclass...
     def __init__(self, unit: str, name: str, temp: bool = False):
@@ -47,6 +128,8 @@ class Unit(metaclass=MetaUnit):
         self.name = name
         self.index = 1
         self.x_name = ''
+        # Exponent vector over named units, a named unit is just itself
+        self.dimensions = ((self, 1),)
 
     def __add__(self, o):
         assert o is self
@@ -56,99 +139,61 @@ class Unit(metaclass=MetaUnit):
         assert o is self
         return self
 
-    # XXX mul and div need a new MultiUnit class that takes care of this
-    # and can deal with m/s/s actually being m/s² or ms-²
-
     def __mul__(self, o: Unit) -> Unit:
         """
         Multiple two units
         """
         if self is NoUnit:
-            unit = o
-        elif o is NoUnit:
-            unit = self
-        elif self._unit != o._unit:
-            k = frozenset((o, self))
-            if has_combined_unit(k):
-                unit = get_combined_unit(k)
-            else:
-                # Build a temporary unit
-                unit = Unit(f'{self.unit}{o.unit}',
-                            f'{self.name}-{o.name}',
-                            temp=True)
-        else:
-            unit = Unit(self._unit, self.name, True)
-            index = self.index + o.index - 1
-            for i in range(index):
-                unit._up()
+            return o
+        if o is NoUnit:
+            return self
+
+        snapshot = current_snapshot()
+        products = snapshot.products
+        k = (self, o)
+        unit = products.get(k)
+        if unit is None:
+            unit = snapshot.combined_units.get(frozenset(k))
+            if instrumentation.enabled:
+                instrumentation.record('unit.combined.miss' if unit is None else 'unit.combined.hit')
+            if unit is None:
+                unit = _combine(self, o, 1)
+            if len(products) >= _MEMO_SIZE:
+                products.clear()
+            products[k] = unit
         return unit
 
     def __truediv__(self, o: Unit) -> Unit:
         """
         Divide two units
         """
-        unit = self
         if o is NoUnit:
-            pass
-        elif unit is not o:
-            k = (self, o)
-            if self._unit == o._unit:
-                unit = Unit(self._unit, self.name, temp=True)
-                unit.index = self.index + o.index
-                for i in range(self.index - o.index + 1):
-                    unit._down()
-                if unit.index == 1:
-                    unit = unit._unit
-            elif has_divided_unit(k):
-                unit = get_divided_unit(k)
-            else:
-                unit = Unit(f'{self.unit}/{o.unit}',
-                            f'{self.name} per {o.name}',
-                            temp=True)
-        else:
-            unit = NoUnit
-
+            return self
+        if o is self:
+            return NoUnit
+
+        snapshot = current_snapshot()
+        quotients = snapshot.quotients
+        k = (self, o)
+        unit = quotients.get(k)
+        if unit is None:
+            unit = snapshot.divided_units.get(k)
+            if instrumentation.enabled:
+                instrumentation.record('unit.divided.miss' if unit is None else 'unit.divided.hit')
+            if unit is None:
+                unit = _combine(self, o, -1)
+            if len(quotients) >= _MEMO_SIZE:
+                quotients.clear()
+            quotients[k] = unit
         return unit
 
-    def _up(self):
+    def __pow__(self, index: int) -> Unit:
         """
-        Increase our exponent
+        Raise a unit to an integer power
         """
-        self.index += 1
-        self._update_name()
-        self._update_unit()
-
-    def _down(self):
-        """
-        decrease our exponent
-        """
-        self.index -= 1
-        self._update_name()
-        self._update_unit()
-
-    def _update_unit(self):
-        """
-        Our unit changed to have an exponent, update our representation
-        """
-        if self.index > 1:
-            if self.index < 10:
-                self.unit = f'{self._unit}{self.supers[self.index]}'
-            elif self.index < 100:
-                t, u = divmod(self.index, 10)
-                self.unit = f'{self._unit}{self.supers[t]}{self.supers[u]}'
-            else:
-                self.unit = f'{self._unit}^{self.index}'
-        else:
-            self.unit = self._unit
-
-    def _update_name(self):
-        """
-        Our unit changed to have an exponent, update our representation
-        """
-        if 1 <= self.index <= len(self.x_names):
-            self.x_name = self.x_names[self.index]
-        else:
-            self.x_name = f'{self.index}th '
+        if self is NoUnit:
+            return self
+        return _from_dimensions({unit: i * index for unit, i in self.dimensions if i * index})
 
     def __repr__(self) -> str:
         return f'{self.x_name}{self.name}'
@@ -156,75 +201,305 @@ class Unit(metaclass=MetaUnit):
     def __str__(self) -> str:
         return self.unit
 
+    def __reduce__(self):
+        """
+        Pickle registered units by their registry key so they unpickle to the same object
+        """
+        unit_index = current_snapshot().unit_index
+        for key in (self.name, self.unit):
+            if unit_index.get(key) is self:
+                return get_unit, (key,)
+        return _restore_unit, (self.unit, self.name)
+
     def convert(self, to: Unit, value: float | int) -> float | int:
         """
-        Convert from this to another unit
+        Convert from this to another unit, going through as many registered conversions as needed.
 
         :param to: desired :mod:`Unit`
-        :param value: starting value
+        :param value: starting value, which can also be an array type that supports * and +
         :return: unitless value
         """
-        operations = get_conversion((self, to))
-        for operation, v in operations:
-            value = operation(value, v)
-        return value
+        if to is self:
+            return value
+        conversion = get_affine_conversion((self, to))
+        if conversion is None:
+            operations = get_conversion((self, to))
+            if operations is None:
+                raise ValueError(f'No conversion from {self!r} to {to!r}')
+            if instrumentation.enabled:
+                return instrumentation.timed('unit.convert.chain', _apply_operations, operations, value)
+            return _apply_operations(operations, value)
+        if instrumentation.enabled:
+            instrumentation.record('unit.convert.affine')
+        scale, offset = conversion
+        return value * scale + offset
 
     @staticmethod
     def NoUnit():
-        return Unit('', '')
+        unit = Unit('', '')
+        unit.dimensions = ()
+        return unit
+
+
+class CompoundUnit(Unit):
+    """
+    A unit made by multiplying and dividing other units, held as a canonical exponent vector e.g. ((metre, 1),
+    (second, -2)). These are interned, so equal dimensions are always the same object, and they are only rendered
+    to strings when displayed.
+    """
+
+    __slots__ = ('_text',)
+
+    @classmethod
+    def _from_dimensions(cls, dimensions: tuple) -> CompoundUnit:
+        """
+        Make a compound unit without registering it
+
+        :param dimensions: canonical exponent vector
+        :return: :mod:`CompoundUnit`
+        """
+        obj = cls.__new__(cls)
+        obj.dimensions = dimensions
+        obj._text = None
+        return obj
+
+    def _render(self) -> tuple:
+        """
+        Work out our unit, name, base unit, index and index name
+
+        :return: (unit, name, _unit, index, x_name)
+        """
+        if self._text is None:
+            if len(self.dimensions) == 1 and self.dimensions[0][1] > 0:
+                # A power of one unit, e.g. m² is a square metre
+                unit, index = self.dimensions[0]
+                self._text = (f'{unit._unit}{_superscript(index)}', unit.name, unit._unit, index,
+                              self._index_name(index))
+            else:
+                numerator = [(u, i) for u, i in self.dimensions if i > 0]
+                denominator = [(u, -i) for u, i in self.dimensions if i < 0]
+                if numerator:
+                    text = ''.join(self._power_unit(u, i) for u, i in numerator)
+                    text += ''.join(f'/{self._power_unit(u, i)}' for u, i in denominator)
+                    name = '-'.join(self._power_name(u, i) for u, i in numerator)
+                    name += ''.join(f' per {self._power_name(u, i)}' for u, i in denominator)
+                else:
+                    text = ''.join(self._power_unit(u, -i) for u, i in denominator)
+                    name = ' '.join(f'per {self._power_name(u, i)}' for u, i in denominator)
+                self._text = (text, name, text, 1, '')
+        return self._text
+
+    @classmethod
+    def _index_name(cls, index: int) -> str:
+        if index < len(cls.x_names):
+            return cls.x_names[index]
+        return f'{index}th '
+
+    @staticmethod
+    def _power_unit(unit: Unit, index: int) -> str:
+        return f'{unit._unit}{_superscript(index)}' if index != 1 else unit._unit
+
+    @classmethod
+    def _power_name(cls, unit: Unit, index: int) -> str:
+        return f'{cls._index_name(index)}{unit.name}'
+
+    def __reduce__(self):
+        """
+        Pickle by exponent vector, the named units in it pickle by registry key
+        """
+        return _restore_compound, (self.dimensions,)
+
+    @property
+    def unit(self) -> str:
+        return self._render()[0]
+
+    @property
+    def name(self) -> str:
+        return self._render()[1]
+
+    @property
+    def _unit(self) -> str:
+        return self._render()[2]
+
+    @property
+    def index(self) -> int:
+        return self._render()[3]
+
+    @property
+    def x_name(self) -> str:
+        return self._render()[4]
 
 
 # Empty Unit
 NoUnit = Unit.NoUnit()
 
 
+def _restore_unit(unit: str, name: str) -> Unit:
+    """
+    Unpickle a unit that isn't registered, as a temporary unit
+    """
+    return Unit(unit, name, temp=True)
+
+
+def _restore_compound(dimensions: tuple) -> Unit:
+    """
+    Unpickle a compound unit to its interned instance
+    """
+    return _from_dimensions(dict(dimensions))
+
+
 def get_units() -> tuple:
     """
     Get all the units
     :return:
     """
-    return tuple(MetaUnit.unit_index.keys())
+    return tuple(current_snapshot().unit_index.keys())
 
 
 def get_all_conversions() -> dict:
-    return MetaUnit.conversions
+    return current_registry().conversions
 
 
 def get_all_divided_units() -> dict:
-    return MetaUnit.divided_units
+    return current_registry().divided_units
 
 
 def get_all_combined_units() -> dict:
-    return MetaUnit.combined_units
+    return current_registry().combined_units
 
 
 def get_unit(unitName) -> Unit:
-    return MetaUnit.unit_index[unitName]
+    return current_snapshot().unit_index[unitName]
 
 
 def get_combined_unit(unit) -> Unit:
-    return MetaUnit.combined_units[unit]
+    return current_snapshot().combined_units[unit]
 
 
 def get_conversion(units):
-    return MetaUnit.conversions.get(units)
+    return current_snapshot().conversions.get(units)
+
+
+# How each operator used in a conversion chain changes (scale, offset)
+_affine_operations = {
+    operator.add: lambda scale, offset, v: (scale, offset + v),
+    operator.sub: lambda scale, offset, v: (scale, offset - v),
+    operator.mul: lambda scale, offset, v: (scale * v, offset * v),
+    operator.truediv: lambda scale, offset, v: (scale / v, offset / v),
+}
+
+
+def _fold_operations(operations) -> tuple | None:
+    """
+    Fold a chain of conversion operations into a single value * scale + offset
+
+    :param operations: tuple of (operator, value)
+    :return: (scale, offset) or None if the chain isn't affine
+    """
+    scale, offset = 1.0, 0.0
+    for operation, v in operations:
+        fold = _affine_operations.get(operation)
+        if fold is None:
+            return None
+        scale, offset = fold(scale, offset, v)
+    return scale, offset
+
+
+def _apply_operations(operations, value):
+    """
+    Run a value through a registered conversion's operations in turn
+
+    :param operations: ((operator, value), ...)
+    :param value: starting value
+    :return: converted value
+    """
+    for operation, v in operations:
+        value = operation(value, v)
+    return value
+
+
+def _conversion_graph(snapshot) -> dict:
+    """
+    Get the graph of a snapshot's affine conversions, building it on first use
+
+    :param snapshot: registry :mod:`Snapshot`
+    :return: {:mod:`Unit`: [(:mod:`Unit`, (scale, offset)), ...]}
+    """
+    graph = snapshot.conversion_graph
+    if graph is None:
+        graph = {}
+        for (source, target), operations in snapshot.conversions.items():
+            folded = _fold_operations(operations)
+            if folded is not None:
+                graph.setdefault(source, []).append((target, folded))
+        snapshot.conversion_graph = graph
+    return graph
+
+
+def _compile_conversion(source: Unit, target: Unit, graph: dict) -> tuple | None:
+    """
+    Find the shortest chain of conversions between two units and fold it into one (scale, offset)
+
+    :param source: :mod:`Unit` to convert from
+    :param target: :mod:`Unit` to convert to
+    :param graph: conversion graph
+    :return: (scale, offset) or None if there is no path
+    """
+    seen = {source: (1.0, 0.0)}
+    frontier = [source]
+    while frontier:
+        next_frontier = []
+        for unit in frontier:
+            scale, offset = seen[unit]
+            for to, (s, o) in graph.get(unit, ()):
+                if to in seen:
+                    continue
+                # s * (scale * x + offset) + o
+                seen[to] = (scale * s, offset * s + o)
+                if to is target:
+                    return seen[to]
+                next_frontier.append(to)
+        frontier = next_frontier
+    return None
+
+
+def get_affine_conversion(units) -> tuple | None:
+    """
+    Get a conversion between two units as a single value * scale + offset, following chains of registered
+    conversions e.g. inch -> foot -> mile.
+
+    :param units: (from :mod:`Unit`, to :mod:`Unit`)
+    :return: (scale, offset) or None if the units can't be converted
+    """
+    snapshot = current_snapshot()
+    compiled = snapshot.compiled_conversions
+    try:
+        return compiled[units]
+    except KeyError:
+        graph = _conversion_graph(snapshot)
+        if instrumentation.enabled:
+            conversion = instrumentation.timed('unit.convert.compile', _compile_conversion, units[0], units[1], graph)
+        else:
+            conversion = _compile_conversion(units[0], units[1], graph)
+        compiled[units] = conversion
+        return conversion
 
 
 def get_divided_unit(unit) -> Unit:
-    return MetaUnit.divided_units[unit]
+    return current_snapshot().divided_units[unit]
 
 
 def has_unit(unit_id: str) -> bool:
-    return unit_id in MetaUnit.unit_index
+    return unit_id in current_snapshot().unit_index
 
 
 def has_combined_unit(unit_id) -> bool:
-    return unit_id in MetaUnit.combined_units
+    return unit_id in current_snapshot().combined_units
 
 
 def has_conversion(units) -> bool:
-    return units in MetaUnit.conversions
+    return units in current_snapshot().conversions
 
 
 def has_divided_unit(units) -> bool:
-    return units in MetaUnit.divided_units
+    return units in current_snapshot().divided_units
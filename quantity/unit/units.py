@@ -132,18 +132,20 @@ get_all_divided_units().update({
     (mole, second): katal
 })
 
+# Conversions chain, so e.g. inch -> mile goes through foot. Each chain of operators must be
+# affine (add, sub, mul, truediv) to be used as part of a longer path.
 get_all_conversions().update({
     (celsius, kelvin): ((operator.add, 273.15),),
     (kelvin, celsius): ((operator.sub, 273.15),),
     # You can chain operators...
     (celsius, fahrenheit): ((operator.mul, 9.0), (operator.truediv, 5.0), (operator.add, 32.0)),
     (fahrenheit, celsius): ((operator.sub, 32.0), (operator.mul, 5.0), (operator.truediv, 9.0)),
-    (second, minute): ((operator.mul, 60.0),),
-    (minute, second): ((operator.truediv, 60.0),),
-    (second, hour): ((operator.mul, 3600.0),),
-    (hour, second): ((operator.truediv, 3600.0),),
-    (minute, hour): ((operator.mul, 60.0),),
-    (hour, minute): ((operator.truediv, 60.0),),
+    (second, minute): ((operator.truediv, 60.0),),
+    (minute, second): ((operator.mul, 60.0),),
+    (second, hour): ((operator.truediv, 3600.0),),
+    (hour, second): ((operator.mul, 3600.0),),
+    (minute, hour): ((operator.truediv, 60.0),),
+    (hour, minute): ((operator.mul, 60.0),),
     (inch, foot): ((operator.truediv, 12.0),),
     (foot, inch): ((operator.mul, 12.0),),
     (inch, metre): ((operator.mul, 0.0254),),
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+A decorator that declares the units of a function's arguments and result. Arguments are checked against the unit
+registry the first time each combination of argument units is seen; the conversions that were worked out are then
+kept for that signature, so later calls just scale the raw numbers and pass plain floats (or arrays) to the function.
+"""
+
+import inspect
+from functools import wraps
+
+from quantity.unit import Unit, NoUnit
+from quantity.prefix import Prefix
+from quantity.quantity import Quantity
+from quantity.converter import Converter
+from quantity.unit_parser import parse_unit
+from quantity.optional import is_ndarray, is_quantity_array
+import quantity.prefix.prefixes as prefixes
+
+# Passes a plain number straight through
+_unchanged = None
+
+# A declared argument that wasn't passed
+_missing = object()
+
+
+def _declared(spec: Unit | str | None) -> tuple:
+    """
+    Get the prefix and unit of a declaration
+
+    :param spec: unit string (with optional prefix), :mod:`Unit` or None for unitless
+    :return: (:mod:`Prefix`, :mod:`Unit`)
+    """
+    if spec is None:
+        return prefixes.NoPrefix, NoUnit
+    if isinstance(spec, str):
+        return parse_unit(spec)
+    return prefixes.NoPrefix, spec
+
+
+def _array_values(value):
+    """
+    Get the SI base values out of a :mod:`QuantityArray`
+    """
+    return value.values
+
+
+def _argument_step(name: str, value, prefix: Prefix, unit: Unit) -> tuple | None:
+    """
+    Work out how to turn an argument into raw numbers in its declared unit and prefix
+
+    :param name: argument name, for errors
+    :param value: the argument
+    :param prefix: declared :mod:`Prefix`
+    :param unit: declared :mod:`Unit`
+    :return: (function getting base values, scale, offset) or None to pass the value unchanged
+    """
+    value_unit = getattr(value, 'unit', None)
+    if not isinstance(value_unit, Unit):
+        if unit is NoUnit:
+            return _unchanged
+        raise TypeError(f'{name} should be in {prefix}{unit}, not {value!r}')
+    try:
+        converter = Converter(value_unit, unit, prefixes.NoPrefix, prefix)
+    except ValueError:
+        raise ValueError(f'{name} should be in {prefix}{unit}, not {value_unit}') from None
+    return float if isinstance(value, Quantity) else _array_values, converter.scale, converter.offset
+
+
+def _plan(checks: tuple, values: list) -> tuple:
+    """
+    Check a new signature of arguments and work out the conversions for it
+
+    :param checks: (name, position or None if it can only be a keyword, prefix, unit) of each declared argument
+    :param values: the declared arguments, in the same order
+    :return: ((index into values, position, name, get base values, scale, offset), ...) for the arguments to convert
+    """
+    steps = []
+    for index, ((name, position, prefix, unit), value) in enumerate(zip(checks, values)):
+        if value is _missing:
+            continue
+        step = _argument_step(name, value, prefix, unit)
+        if step is not _unchanged:
+            steps.append((index, position, name, *step))
+    return tuple(steps)
+
+
+def units(returns: Unit | str | None = None, **declared):
+    """
+    Declare the units of a function's arguments and result.
+
+    >>> @units(v='V', i='mA', returns='W')
+    ... def power(v, i):
+    ...     return v * i / 1000
+    >>> power(Quantity(2, 'kV'), Quantity(3, 'A'))
+    6.0 kW
+
+    Arguments in ``declared`` must be given as a :mod:`Quantity` (or :mod:`QuantityArray`) with a unit that converts
+    to the declared unit, and the function sees raw numbers in the declared unit and prefix. Unitless declarations
+    (``None`` or ``''``) also take plain numbers. Undeclared arguments are passed unchanged, as are declared
+    arguments left to their defaults.
+
+    The result is wrapped as ``returns`` if it is declared, a :mod:`Quantity` result must convert to it.
+
+    :param returns: unit string (with optional prefix) or :mod:`Unit` of the result, None to leave it alone
+    :param declared: {argument name: unit string (with optional prefix) or :mod:`Unit`}
+    :return: decorator
+    """
+    declared = {name: _declared(spec) for name, spec in declared.items()}
+    returns = None if returns is None else _declared(returns)
+
+    def decorate(function):
+        parameters = inspect.signature(function).parameters
+        missing = set(declared) - set(parameters)
+        if missing:
+            raise TypeError(f'{function.__name__} has no arguments {", ".join(sorted(missing))}')
+        # Only the parameters before any *args can be passed by position
+        positions = {}
+        for position, parameter in enumerate(parameters.values()):
+            if parameter.kind not in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+                break
+            positions[parameter.name] = position
+        # (name, position or None, prefix, unit) for each declared argument
+        checks = tuple((name, positions.get(name), *declared[name]) for name in parameters if name in declared)
+
+        if returns is not None:
+            return_prefix, return_unit = returns
+            return_scale = Converter(return_unit, return_unit, return_prefix).scale
+        # {argument signature: conversion steps}
+        signatures = {}
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            count = len(args)
+            values = [args[position] if position is not None and position < count else kwargs.get(name, _missing)
+                      for name, position, _, _ in checks]
+            signature = tuple([(v.__class__, getattr(v, 'unit', None)) for v in values])
+            steps = signatures.get(signature)
+            if steps is None:
+                steps = signatures[signature] = _plan(checks, values)
+
+            args = list(args)
+            for index, position, name, base_values, scale, offset in steps:
+                raw = base_values(values[index]) * scale + offset
+                if position is not None and position < count:
+                    args[position] = raw
+                else:
+                    kwargs[name] = raw
+
+            result = function(*args, **kwargs)
+            if returns is None:
+                return result
+            if isinstance(result, Quantity) or is_quantity_array(result):
+                return result.convert(return_unit)
+            if is_ndarray(result):
+                from quantity.quantity_array import QuantityArray
+                return QuantityArray._from_values(result * return_scale, return_unit)
+            return Quantity._from_base(result * return_scale, return_unit)
+
+        wrapper.signatures = signatures
+        return wrapper
+
+    return decorate
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+from .unit_parser import parse_unit, clear_cache
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+"""
+Split unit strings like 'kV' into a :mod:`Prefix` and a :mod:`Unit`. The registered units are held in a trie keyed
+on their reversed spelling, so every unit that ends a string is found in one walk back from its last character.
+The trie is built once per registry snapshot and resolved strings are kept in a bounded LRU cache keyed on the
+snapshot, so registering a unit or prefix (or switching registry) never returns a stale answer.
+"""
+
+from functools import lru_cache
+
+from quantity.unit import Unit, NoUnit
+from quantity.registry.registry import current_snapshot
+import quantity.instrumentation.instrumentation as instrumentation
+import quantity.prefix.prefixes as prefixes
+
+# How many distinct unit strings to remember
+CACHE_SIZE = 1024
+
+# Marks a trie node that ends a unit
+_END = ''
+
+
+def _trie(snapshot) -> dict:
+    """
+    Get the trie of a snapshot's units, keyed on their characters from last to first
+
+    :param snapshot: registry :mod:`Snapshot`
+    :return: The root trie node
+    """
+    root = snapshot.derived.get('unit_trie')
+    if root is None:
+        root = {}
+        for text, unit in snapshot.unit_index.items():
+            node = root
+            for c in reversed(text):
+                node = node.setdefault(c, {})
+            node[_END] = unit
+        snapshot.derived['unit_trie'] = root
+    return root
+
+
+def _unit_suffixes(text: str, snapshot) -> list:
+    """
+    Find every registered unit that ends the text
+
+    :param text: unit string
+    :param snapshot: registry :mod:`Snapshot`
+    :return: list of (offset the unit starts at, :mod:`Unit`), shortest unit first
+    """
+    matches = []
+    node = _trie(snapshot)
+    for i in range(len(text) - 1, -1, -1):
+        node = node.get(text[i])
+        if node is None:
+            break
+        if _END in node:
+            matches.append((i, node[_END]))
+    return matches
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse(text: str, snapshot) -> tuple:
+    """
+    Work out the prefix and unit of a unit string, obviously there is scope for collision between units and
+    prefixes, so a whole unit always wins and otherwise the shortest unit with a valid prefix in front of it.
+
+    :param text: unit string
+    :param snapshot: registry :mod:`Snapshot` to look the units and prefixes up in
+    :return: (:mod:`Prefix`, :mod:`Unit`)
+    """
+    unit = snapshot.unit_index.get(text)
+    if unit is not None:
+        return prefixes.NoPrefix, unit
+
+    if instrumentation.enabled:
+        matches = instrumentation.timed('unit_parser.suffix_scan', _unit_suffixes, text, snapshot)
+    else:
+        matches = _unit_suffixes(text, snapshot)
+    for i, unit in matches:
+        prefix = snapshot.prefix_index.get(text[:i])
+        if prefix is not None:
+            return prefix, unit
+
+    if matches:
+        # Leftovers that aren't a prefix are ignored
+        return prefixes.NoPrefix, matches[0][1]
+
+    # Make a temporary unit, since we don't know what this is
+    return prefixes.NoPrefix, Unit(text, text, temp=True)
+
+
+def parse_unit(text: str) -> tuple:
+    """
+    Take a string like kV and work out prefix and units
+
+    >>> parse_unit('kV')
+    (10³, volt)
+
+    :param text: unit string, with an optional prefix
+    :return: (:mod:`Prefix`, :mod:`Unit`)
+    """
+    if not text:
+        return prefixes.NoPrefix, NoUnit
+    return _parse(text, current_snapshot())
+
+
+def clear_cache():
+    """
+    Forget every resolved unit string
+    """
+    _parse.cache_clear()
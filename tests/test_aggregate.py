@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from quantity import aggregate
+from quantity.quantity import Quantity
+import quantity.unit.units as units
+
+
+class TestAggregate(unittest.TestCase):
+
+    def test_sum(self):
+        total = aggregate.sum(Quantity(0.1, 'W') for _ in range(100000))
+        assert float(total) == 10000.0
+        assert total.unit is units.watt
+        assert aggregate.sum([Quantity(1, 'kV'), Quantity(500, 'V')]) == Quantity(1500, 'V')
+        assert aggregate.sum([]) == 0
+        assert aggregate.sum([], units.volt) == Quantity(0, 'V')
+
+    def test_mean(self):
+        assert aggregate.mean(iter([Quantity(1, 'kW'), Quantity(500, 'W')])) == Quantity(750, 'W')
+        self.assertRaises(ValueError, aggregate.mean, [])
+        assert aggregate.mean(Quantity(v, 'V') for v in range(1, 100001)) == Quantity(50000.5, 'V')
+        assert aggregate.mean(iter([Quantity(3, 'A')])) == Quantity(3, 'A')
+        self.assertRaises(AssertionError, aggregate.mean, (Quantity(1, 'V'), Quantity(1, 'A')))
+
+    def test_min_max(self):
+        readings = [Quantity(1, 'kW'), Quantity(500, 'W'), Quantity(1000, 'W'), Quantity(2, 'mW')]
+        assert aggregate.min(readings) is readings[3]
+        assert aggregate.max(readings) is readings[0]
+        assert aggregate.max(q for q in readings[1:]) is readings[2]
+        self.assertRaises(ValueError, aggregate.min, [])
+        self.assertRaises(ValueError, aggregate.max, iter(()))
+
+    def test_units_must_match(self):
+        mixed = [Quantity(1, 'V'), Quantity(1, 'A')]
+        self.assertRaises(AssertionError, aggregate.sum, mixed)
+        self.assertRaises(AssertionError, aggregate.mean, mixed)
+        self.assertRaises(AssertionError, aggregate.max, mixed)
+
+    @unittest.skipIf(np is None, 'numpy not installed')
+    def test_quantity_array(self):
+        from quantity.quantity_array import QuantityArray
+        a = QuantityArray([0.1] * 10, 'V')
+        assert float(aggregate.sum(a)) == 1.0
+        assert aggregate.mean(a).unit is units.volt
+        assert aggregate.max(QuantityArray([1, 3], 'kV')) == Quantity(3, 'kV')
+        assert aggregate.min(QuantityArray([1, 3], 'kV')) == Quantity(1, 'kV')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks import suite
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_cases_registered(self):
+        names = suite._selected(())
+        for name in ('quantity.from_string', 'unit.mul', 'prefix.closest_prefix', 'config.getfloat',
+                     'bit_field.from_word_set'):
+            assert name in names, name
+        assert suite._selected(['unit.mul*']) == ['unit.mul', 'unit.mul_compound']
+
+    def test_run_and_save(self):
+        document = suite.run(['unit.mul'], repeat=1)
+        result = document['results']['unit.mul']
+        assert result['ns_per_op'] > 0
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'baseline.json')
+            suite.save(document, path)
+            assert suite.load(path) == json.loads(json.dumps(document))
+
+    def test_compare(self):
+        baseline = {'results': {'a': {'ns_per_op': 100.0}, 'b': {'ns_per_op': 100.0}, 'c': {'ns_per_op': 1.0}}}
+        current = {'results': {'a': {'ns_per_op': 105.0}, 'b': {'ns_per_op': 150.0}, 'd': {'ns_per_op': 1.0}}}
+        rows = {row[0]: row for row in suite.compare(baseline, current, threshold=0.1)}
+        assert rows['a'][4] is False
+        assert rows['b'][4] is True
+        assert rows['b'][3] == 1.5
+        assert rows['c'][2] is None and rows['c'][4] is False
+        assert rows['d'][1] is None
+        assert suite.compare(baseline, current, threshold=0.6)[1][4] is False
+
+    def test_main_exit_code(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            fast = dict(suite.run(['unit.mul'], repeat=1))
+            fast['results'] = {'unit.mul': dict(fast['results']['unit.mul'])}
+            slow = json.loads(json.dumps(fast))
+            slow['results']['unit.mul']['ns_per_op'] *= 2
+            suite.save(fast, os.path.join(tmp, 'fast.json'))
+            suite.save(slow, os.path.join(tmp, 'slow.json'))
+            assert suite.main(['compare', os.path.join(tmp, 'fast.json'), os.path.join(tmp, 'slow.json')]) == 1
+            assert suite.main(['compare', os.path.join(tmp, 'slow.json'), os.path.join(tmp, 'fast.json')]) == 0
+
+
+if __name__ == '__main__':
+    unittest.main()
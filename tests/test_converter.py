@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import unittest
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from quantity.converter import Converter
+import quantity.unit.units as units
+import quantity.prefix.prefixes as prefixes
+
+
+class TestConverter(unittest.TestCase):
+
+    def test_prefix_conversion(self):
+        c = Converter('kV', 'mV')
+        assert c.source is units.volt
+        assert c.target is units.volt
+        assert c(1.5) == 1500000.0
+        assert Converter(units.volt, units.volt, prefixes.kilo, prefixes.milli)(1.5) == 1500000.0
+
+    def test_affine_conversion(self):
+        c = Converter('°C', '°F')
+        assert c(100) == 212.0
+        assert c.inverse()(212) == 100.0
+        assert round(Converter('kK', '°C')(0.37315), 10) == 100.0
+
+    def test_sequences(self):
+        c = Converter('°C', '°F')
+        assert c([0, 100]) == [32.0, 212.0]
+        assert c(v for v in (0, 100)) == [32.0, 212.0]
+        converted = c(array('i', [0, 100]))
+        assert isinstance(converted, array)
+        assert list(converted) == [32.0, 212.0]
+        assert list(c(memoryview(array('d', [0, 100])))) == [32.0, 212.0]
+        assert list(c(memoryview(array('f', [0, 100])))) == [32.0, 212.0]
+
+    def test_buffer_formats(self):
+        c = Converter('°C', '°F')
+        # Raw bytes are the doubles they hold, not one value per byte
+        raw = memoryview(array('d', [0, 100]).tobytes())
+        assert raw.format == 'B'
+        assert list(c(raw)) == [32.0, 212.0]
+        self.assertRaises(TypeError, c, memoryview(array('i', [0, 100])))
+        self.assertRaises(TypeError, c, memoryview(b'odd'))
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_numpy(self):
+        c = Converter('°C', '°F')
+        assert list(c(np.array([0.0, 100.0]))) == [32.0, 212.0]
+
+    def test_no_conversion(self):
+        self.assertRaises(ValueError, Converter, 'V', 'A')
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from quantity.expression import Expression, Symbol, Constant, lazy
+from quantity.quantity import Quantity
+import quantity.unit.units as units
+import quantity.prefix.prefixes as prefixes
+
+
+class TestExpression(unittest.TestCase):
+
+    def test_unit_resolution(self):
+        v = Symbol('v', 'V')
+        i = Symbol('i', 'A')
+        t = Symbol('t', 's')
+        assert (v * i).unit is units.watt
+        assert (v * i * t).unit is (units.watt * units.second)
+        assert (v ** 2).unit is (units.volt * units.volt)
+        assert (-v).unit is units.volt
+        with self.assertRaises(AssertionError):
+            (v + i).unit
+
+    def test_compile(self):
+        v = Symbol('v', 'kV')
+        i = Symbol('i', 'A')
+        power = (v * i).compile()
+        assert power.unit is units.watt
+        assert power.symbols == ('v', 'i')
+        assert power(2, 3) == 6000.0
+        assert power(i=3, v=2) == 6000.0
+        assert power(2, i=3) == 6000.0
+        assert (v * i).evaluate(2, 3) == Quantity(6, units.watt, prefixes.kilo)
+        with self.assertRaises(TypeError):
+            power(2, 3, x=1)
+
+    def test_repeated_symbols(self):
+        x = Symbol('x', 'm')
+        area = (x * x + 2 * x * Constant(Quantity(1, 'm'))).compile()
+        assert area.symbols == ('x',)
+        assert area(3) == 15.0
+        with self.assertRaises(ValueError):
+            (x + Symbol('x', 'km')).compile()
+
+    def test_constants(self):
+        v = Symbol('v', 'V')
+        offset = Quantity(500, 'mV')
+        e = (v - offset) / 2
+        assert e.unit is units.volt
+        assert e.compile()(1.5) == 0.5
+        assert (offset - v).compile()(1.5) == -1.0
+        assert (Quantity(2, 'A') * v).unit is units.watt
+        assert lazy(v) is v
+        with self.assertRaises(TypeError):
+            lazy('nope')
+
+    def test_symbol_arguments(self):
+        f = (Symbol('a') * Symbol('b')).compile()
+        assert f(2, b=3) == f(a=2, b=3) == 6
+        with self.assertRaisesRegex(TypeError, 'missing symbol b'):
+            f(a=2)
+        with self.assertRaisesRegex(TypeError, 'Unknown symbols c'):
+            f(a=2, b=3, c=4)
+        with self.assertRaises(TypeError):
+            Expression()
+
+    def test_compiled_once(self):
+        e = Symbol('a') * Symbol('b')
+        assert e.compile() is e.compile()
+
+    @unittest.skipIf(np is None, 'numpy not installed')
+    def test_arrays(self):
+        v = Symbol('v', 'mV')
+        i = Symbol('i', 'A')
+        power = (v * i).compile()
+        result = power(np.array([1000.0, 2000.0]), np.array([1.0, 3.0]))
+        assert list(result) == [1.0, 6.0]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import pickle
+import unittest
+from decimal import Decimal
+
+from quantity.fixed_quantity import FixedQuantity
+from quantity.quantity import Quantity
+import quantity.unit.units as units
+import quantity.prefix.prefixes as prefixes
+
+
+class TestFixedQuantity(unittest.TestCase):
+
+    def test_construction(self):
+        q = FixedQuantity(1536, 'B')
+        assert (q.mantissa, q.exponent, q.unit) == (1536, 0, units.byte)
+        q = FixedQuantity(2, 'kB')
+        assert (q.mantissa, q.exponent) == (2, 3)
+        q = FixedQuantity('1.25', 'mV')
+        assert (q.mantissa, q.exponent) == (125, -5)
+        q = FixedQuantity(Decimal('-0.5'), units.volt, prefixes.kilo)
+        assert (q.mantissa, q.exponent) == (-5, 2)
+        q = FixedQuantity(3, 'kW', exponent=0)
+        assert (q.mantissa, q.exponent) == (3000, 0)
+        self.assertRaises(TypeError, FixedQuantity, 1.5, 'V')
+        self.assertRaises(ValueError, FixedQuantity, 'nan', 'V')
+
+    def test_exact_arithmetic(self):
+        tenth = FixedQuantity('0.1', 'W')
+        total = FixedQuantity(0, 'W')
+        for _ in range(1000):
+            total = total + tenth
+        assert total == FixedQuantity(100, 'W')
+        assert FixedQuantity(1536, 'B') + FixedQuantity(2, 'kB') == FixedQuantity(3536, 'B')
+        assert FixedQuantity(2, 'kB') - FixedQuantity(1536, 'B') == FixedQuantity(464, 'B')
+        assert FixedQuantity(3, 'V') * FixedQuantity(2, 'mA') == FixedQuantity(6, 'mW')
+        assert 3 * FixedQuantity(2, 'kB') == FixedQuantity(6, 'kB')
+        assert FixedQuantity(2, 'm') ** 2 == FixedQuantity(4, units.metre ** 2)
+        assert -FixedQuantity(5, 's') == FixedQuantity(-5, 's')
+        assert abs(FixedQuantity(-5, 's')) == FixedQuantity(5, 's')
+        self.assertRaises(AssertionError, lambda: FixedQuantity(1, 'V') + FixedQuantity(1, 'A'))
+        self.assertRaises(TypeError, lambda: FixedQuantity(1, 'V') + Quantity(1, 'V'))
+        self.assertRaises(TypeError, lambda: FixedQuantity(1, 'V') * 1.5)
+
+    def test_division(self):
+        assert FixedQuantity(15000, 'J') / 4 == FixedQuantity(3750, 'J')
+        # Rounded half to even at the dividend's exponent
+        assert FixedQuantity(15, 'kJ') / 4 == FixedQuantity(4, 'kJ')
+        assert FixedQuantity(10, 'kJ') / 4 == FixedQuantity(2, 'kJ')
+        assert FixedQuantity(10, 'V').divide(FixedQuantity(3, 'A'), -3) == FixedQuantity('3.333', units.ohm)
+        assert (FixedQuantity(10, 'J') / FixedQuantity(2, 's')).unit is units.watt
+        self.assertRaises(ZeroDivisionError, lambda: FixedQuantity(1, 'V') / 0)
+
+    def test_rescale(self):
+        assert FixedQuantity('0.125', 's').rescale(-2).mantissa == 12
+        assert FixedQuantity('0.135', 's').rescale(-2).mantissa == 14
+        assert FixedQuantity(2, 's').rescale(-3).mantissa == 2000
+        assert FixedQuantity(1536, 'B').to('kB') == 2
+        assert FixedQuantity(1536, 'B').to(prefixes.milli) == 1536000
+        assert FixedQuantity(1536, 'B').to('B') == 1536
+        assert FixedQuantity(1536, 'B').to('XB') is None
+        assert int(FixedQuantity('2.5')) == 2
+        assert float(FixedQuantity('1.5', 'mV')) == 0.0015
+
+    def test_display(self):
+        assert repr(FixedQuantity(1536, 'B')) == '1.536 kB'
+        assert repr(FixedQuantity(10 ** 30, 'B')) == '1000000 YB'
+        assert repr(FixedQuantity('-0.0025', 'A')) == '-2.5 mA'
+        assert repr(FixedQuantity(0, 's')) == '0 s'
+        assert FixedQuantity(1536, 'B').amount == Decimal('1.536')
+        assert FixedQuantity(1536, 'B').prefix is prefixes.kilo
+
+    def test_comparison_and_hash(self):
+        assert FixedQuantity(1, 'kV') == FixedQuantity(1000, 'V')
+        assert hash(FixedQuantity(1, 'kV')) == hash(FixedQuantity(1000, 'V'))
+        assert FixedQuantity(1, 'kV') != FixedQuantity(1, 'kA')
+        assert FixedQuantity(900, 'W') < FixedQuantity('1.2', 'kW')
+        assert sorted([FixedQuantity(2, 'kB'), FixedQuantity(900, 'B')])[0] == FixedQuantity(900, 'B')
+        assert FixedQuantity(3) == 3
+        assert {FixedQuantity('3.0'): 'three'}[3] == 'three'
+
+    def test_quantity_conversion(self):
+        q = FixedQuantity.from_quantity(Quantity(1.2345, 'kV'), -1)
+        assert (q.mantissa, q.exponent) == (12345, -1)
+        assert FixedQuantity(1, 'kV').to_quantity() == Quantity(1, 'kV')
+        q = FixedQuantity(1536, 'B')
+        assert pickle.loads(pickle.dumps(q)) == q
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import quantity
+from quantity import instrumentation
+from quantity.instrumentation import instrumented, stats
+from quantity.quantity import Quantity
+from quantity.prefix import closest_prefix, closest_prefixes
+from quantity.registry import Registry, default_registry, use_registry
+from quantity.unit import Unit
+import quantity.unit.units as units
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_disabled(self):
+        instrumentation.reset()
+        closest_prefix(1000)
+        Quantity(1, 'kV').convert(units.volt)
+        assert stats() == {}
+        assert quantity.stats() == {}
+
+    def test_closest_prefix(self):
+        with instrumented():
+            closest_prefix(1000)
+            closest_prefix(0)
+            closest_prefixes([1, 2, 0])
+        counts = stats()
+        # Every value counts once, zeros included, whichever function reduced it
+        assert counts['prefix.closest_prefix']['count'] == 5
+        assert counts['prefix.closest_prefix']['seconds'] > 0
+
+    def test_units(self):
+        # A fork so the memoised products and parsed unit strings start empty
+        with use_registry(Registry(default_registry)), instrumented():
+            assert units.volt * units.ampere is units.watt
+            assert units.volt * units.ampere is units.watt
+            units.volt * units.foot
+            assert units.watt / units.ampere is units.volt
+            units.watt / units.foot
+            Quantity(1, 'kV')
+            Quantity(1, 'whatsit')
+            counts = stats()
+        assert counts['unit.combined.hit']['count'] == 1
+        assert counts['unit.combined.miss']['count'] == 1
+        assert counts['unit.divided.hit']['count'] == 1
+        assert counts['unit.divided.miss']['count'] == 1
+        assert counts['unit_parser.suffix_scan']['count'] == 2
+        assert counts['unit.temp']['count'] == 1
+
+    def test_compound(self):
+        with instrumented():
+            Unit('Qz', 'quiz', temp=True) ** 3
+            counts = stats()
+        assert counts['unit.compound']['count'] == 1
+        assert counts['unit.temp']['count'] == 1
+
+    def test_conversions(self):
+        with instrumented():
+            Quantity(1, 'm').convert(units.foot)
+            Quantity(1, 'm').convert(units.foot)
+            counts = stats()
+        assert counts['unit.convert.affine']['count'] == 2
+        assert counts.get('unit.convert.compile', {'count': 0})['count'] <= 1
+
+    def test_reset(self):
+        instrumentation.enable()
+        closest_prefix(1000)
+        assert quantity.stats()
+        quantity.reset_stats()
+        assert quantity.stats() == {}
+        instrumentation.disable()
+        closest_prefix(1000)
+        assert quantity.stats() == {}
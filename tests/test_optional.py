@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import quantity
+from quantity.optional import import_numpy, is_ndarray, is_quantity_array
+from quantity.quantity import Quantity
+
+
+def _fresh(code: str) -> str:
+    """
+    Run some code in a new interpreter and get what it prints
+    """
+    return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout.strip()
+
+
+class TestOptional(unittest.TestCase):
+
+    def test_lazy_imports(self):
+        loaded = _fresh('import sys, quantity.quantity, quantity.aggregate, quantity.converter, '
+                        'quantity.quantity_config_parser\n'
+                        'heavy = ("numpy", "multiprocessing", "quantity.parallel")\n'
+                        'print(sorted(m for m in heavy if m in sys.modules))')
+        assert loaded == '[]', loaded
+
+    def test_package_attributes(self):
+        assert quantity.aggregate.sum([Quantity(1, 'V')]) == Quantity(1, 'V')
+        assert callable(quantity.stats)
+        assert callable(quantity.reset_stats)
+        assert 'parallel' in dir(quantity)
+        self.assertRaises(AttributeError, getattr, quantity, 'nothing_here')
+
+    def test_checks(self):
+        assert not is_ndarray([1.0])
+        assert not is_quantity_array(Quantity(1, 'V'))
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_numpy(self):
+        from quantity.quantity_array import QuantityArray
+        assert import_numpy() is np
+        assert is_ndarray(np.zeros(2))
+        assert is_quantity_array(QuantityArray([1, 2], 'V'))
+        assert not is_quantity_array(np.zeros(2))
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import pickle
+import unittest
+
+from quantity.packing import pack_quantities, unpack_quantities
+from quantity.quantity import Quantity
+from quantity.unit import NoUnit
+import quantity.unit.units as units
+import quantity.prefix.prefixes as prefixes
+
+
+class TestPacking(unittest.TestCase):
+
+    def test_pickle_identity(self):
+        for unit in (units.volt, units.ohm, NoUnit, units.metre / units.second ** 2, units.metre ** 2):
+            assert pickle.loads(pickle.dumps(unit)) is unit, unit
+        for prefix in (prefixes.kilo, prefixes.NoPrefix, prefixes.micro, prefixes.micro_):
+            assert pickle.loads(pickle.dumps(prefix)) is prefix, prefix
+
+    def test_pickle_quantity(self):
+        q = Quantity(3, 'kV')
+        r = pickle.loads(pickle.dumps(q))
+        assert r == q
+        assert r.unit is units.volt
+        assert r.prefix is prefixes.kilo
+
+    def test_pack(self):
+        qs = [Quantity(i, 'V') for i in range(100)] + [Quantity(1.5, 'mA'), Quantity(2, units.metre ** 2)]
+        data = pack_quantities(qs)
+        assert len(data) < len(pickle.dumps(qs))
+        r = unpack_quantities(data)
+        assert r == qs
+        assert r[-1].unit is units.metre ** 2
+
+    def test_pack_ints(self):
+        qs = [Quantity(2 ** 40, 'B'), Quantity(3, 'B')]
+        r = unpack_quantities(pack_quantities(qs))
+        assert [q._value for q in r] == [2 ** 40, 3]
+        assert all(type(q._value) is int for q in r)
+        assert unpack_quantities(pack_quantities([])) == []
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from quantity.parallel import parallel_arithmetic, parallel_convert, parallel_reduce
+from quantity.quantity import Quantity
+import quantity.unit.units as units
+import quantity.prefix.prefixes as prefixes
+
+
+class TestParallel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ProcessPoolExecutor(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_convert(self):
+        out = parallel_convert(range(1000), '°C', '°F', chunk_size=300, executor=self.pool)
+        assert len(out) == 1000
+        assert out[0] == 32.0
+        assert out[100] == 212.0
+        assert list(parallel_convert([1.5], 'kV', 'V', executor=self.pool)) == [1500.0]
+
+    def test_arithmetic(self):
+        volts = [float(i) for i in range(100)]
+        amps = [2.0] * 100
+        values, unit = parallel_arithmetic('*', (volts, units.volt), (amps, units.ampere), chunk_size=30,
+                                           executor=self.pool)
+        assert unit is units.watt
+        assert list(values) == [v * 2.0 for v in volts]
+        self.assertRaises(AssertionError, parallel_arithmetic, '+', (volts, units.volt), (amps, units.ampere),
+                          executor=self.pool)
+
+    def test_reduce(self):
+        values = [float(i) for i in range(1, 101)]
+        assert parallel_reduce('sum', values, units.volt, chunk_size=30, executor=self.pool) == Quantity(5050, 'V')
+        assert parallel_reduce('mean', values, units.volt, prefixes.kilo, chunk_size=30,
+                               executor=self.pool) == Quantity(50.5, 'kV')
+        assert parallel_reduce('min', values, units.volt, chunk_size=30, executor=self.pool) == Quantity(1, 'V')
+        assert parallel_reduce('max', values, units.volt, chunk_size=30, executor=self.pool) == Quantity(100, 'V')
+        assert parallel_reduce('max', [], units.volt, executor=self.pool) is None
+
+    def test_own_pool(self):
+        out = parallel_convert([0.0, 100.0], units.celsius, units.kelvin, workers=1)
+        assert list(out) == [273.15, 373.15]
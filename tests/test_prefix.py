@@ -3,6 +3,7 @@ import unittest
 
 import quantity.prefix.prefix as prefix
 import quantity.prefix.prefixes as prefixes
+from quantity.registry import default_registry
 
 
 class TestPrefix(unittest.TestCase):
@@ -28,3 +29,57 @@ class TestPrefix(unittest.TestCase):
 
     def test_scalar_right_multiply(self):
         assert 5 * prefixes.kilo == 5000
+
+    def test_large_integer_prefix(self):
+        r = prefix.closest_prefix(1234567890123456789)
+        assert r == (1.234567890123456789, prefixes.exa), r
+        r = prefix.closest_prefix(316)
+        assert r == (316.0, prefixes.NoPrefix), r
+        r = prefix.closest_prefix(317)
+        assert r == (0.317, prefixes.kilo), r
+
+    def test_out_of_range_prefix(self):
+        r = prefix.closest_prefix(1e30)
+        assert r == (1e6, prefixes.yotta), r
+        r = prefix.closest_prefix(1e-27)
+        assert r[1] is prefixes.yocto, r
+        assert round(r[0], 12) == 0.001, r
+
+    def test_int_exponent(self):
+        assert prefix.int_exponent(1) == 0
+        assert prefix.int_exponent(9) == 0
+        assert prefix.int_exponent(10) == 1
+        assert prefix.int_exponent(10 ** 400 - 1) == 399
+        assert prefix.int_exponent(10 ** 400) == 400
+
+    def test_prefix_for_exponent(self):
+        assert prefix.prefix_for_exponent(0) is prefixes.NoPrefix
+        assert prefix.prefix_for_exponent(4) is prefixes.kilo
+        assert prefix.prefix_for_exponent(-4) is prefixes.micro
+        assert prefix.prefix_for_exponent(100) is prefixes.yotta
+        assert prefix.prefix_for_exponent(-100) is prefixes.yocto
+
+    def test_batch_prefix(self):
+        r = prefix.closest_prefixes([1000, 1024, 0, -1000, 0.05])
+        assert r == [(1.0, prefixes.kilo), (1.024, prefixes.kilo), (0, prefixes.NoPrefix),
+                     (-1.0, prefixes.kilo), (50, prefixes.milli)], r
+
+    def test_closest_prefixes_zeros(self):
+        values = [0, 1000, 0.0, -0.0, 0.05, -1000]
+        reduced = prefix.closest_prefixes(values)
+        assert reduced == [prefix.closest_prefix(v) for v in values]
+        assert reduced[2] == reduced[3] == (0, prefixes.NoPrefix)
+
+    def test_table_rebuilt_on_register(self):
+        power_index = dict(prefix.MetaPrefix.power_index)
+        prefix_index = dict(prefix.MetaPrefix.prefix_index)
+        try:
+            hecto = prefix.Prefix('h', 'hecto', 2)
+            assert prefix.closest_prefix(200) == (2.0, hecto)
+        finally:
+            with default_registry.write():
+                prefix.MetaPrefix.power_index.clear()
+                prefix.MetaPrefix.power_index.update(power_index)
+                prefix.MetaPrefix.prefix_index.clear()
+                prefix.MetaPrefix.prefix_index.update(prefix_index)
+        assert prefix.closest_prefix(200) == (200.0, prefixes.NoPrefix)
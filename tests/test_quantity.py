@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import functools
+import pickle
 import unittest
 
 import quantity.unit.units as units
@@ -115,3 +117,98 @@ class TestQuantity(unittest.TestCase):
 
         # And they should be equal
         assert mv3 == mv3_2
+
+    def testQuantitySlots(self):
+        v = quantity.Quantity(3, 'V')
+        assert not hasattr(v, '__dict__')
+        self.assertRaises(AttributeError, setattr, v, 'other', 1)
+
+    def testInternedQuantity(self):
+        assert quantity.Quantity.interned(0) is quantity.Quantity.interned(0)
+        assert quantity.Quantity.interned(1, 'kV') is quantity.Quantity.interned(1, 'kV')
+        assert quantity.Quantity.interned(1, 'kV') == quantity.Quantity(1, 'kV')
+        # Ints and floats are kept apart
+        assert quantity.Quantity.interned(1) is not quantity.Quantity.interned(1.0)
+        # Shared by every caller, so it can't be changed
+        shared = quantity.Quantity.interned(5, 'V')
+        assert isinstance(shared, quantity.FrozenQuantity)
+        self.assertRaises(AttributeError, shared._strip_unit)
+        assert quantity.Quantity.interned(5, 'V').unit is units.volt
+
+    def testQuantityCompoundUnits(self):
+        a = quantity.Quantity(5, 'm') / quantity.Quantity(2, 's') / quantity.Quantity(1, 's')
+        assert a.unit is units.metre / units.second ** 2
+        assert str(a) == '2.5 m/s²'
+        assert quantity.Quantity(2, 'm') ** 2 == quantity.Quantity(4, units.metre ** 2)
+
+    def testQuantityTo(self):
+        q = quantity.Quantity(1, 'km')
+        assert q.to('m') == 1000.0
+        assert q.to('mm') == 1000000.0
+        assert q.to('Mm') == 0.001
+        assert q.to(prefixes.kilo) == 1.0
+        assert q.to('Xm') is None
+        # No rounding
+        assert quantity.Quantity(1.5, 'm').to('m') == 1.5
+
+    def testQuantityCrossPrefixComparison(self):
+        a = quantity.Quantity(1.2, 'kW')
+        b = quantity.Quantity(900, 'W')
+        assert b < a
+        assert a > b
+        assert b <= a
+        assert a >= quantity.Quantity(1200, 'W')
+        assert sorted([a, b]) == [b, a]
+        assert max([b, a]) is a
+        # Unitless quantities compare with numbers
+        assert quantity.Quantity(2) < 3
+        assert not quantity.Quantity(2.5) <= 2
+        self.assertRaises(AssertionError, lambda: a < quantity.Quantity(1, 'V'))
+
+    def testQuantitySortKey(self):
+        readings = [quantity.Quantity(1.2, 'kW'), quantity.Quantity(3, 'V'), quantity.Quantity(900, 'W'),
+                    quantity.Quantity(2, 'mV')]
+        ordered = sorted(readings, key=quantity.Quantity.sort_key)
+        assert ordered == [readings[3], readings[1], readings[2], readings[0]], ordered
+
+    def testFrozenQuantity(self):
+        a = quantity.FrozenQuantity(1, 'kV')
+        b = quantity.Quantity(1000, 'V').freeze()
+        assert isinstance(b, quantity.FrozenQuantity)
+        assert a == b
+        assert hash(a) == hash(b)
+        assert {a: 'trip'}[b] == 'trip'
+        assert len({a, b, quantity.FrozenQuantity(1, 'kA')}) == 2
+        assert quantity.FrozenQuantity(9, 'mV') == quantity.FrozenQuantity(0.009, 'V')
+        # Unitless ones behave like numbers
+        assert {quantity.FrozenQuantity(3): 'three'}[3] == 'three'
+        # Equal only if the hashes are, no rounding to the other side's type
+        assert quantity.FrozenQuantity(1.4) != 1
+        assert 1 != quantity.FrozenQuantity(1.4)
+        # Prefix scaling leaves 258916.99999999997 behind, it still matches 258917 V
+        c = quantity.FrozenQuantity(258.917, 'kV')
+        d = quantity.FrozenQuantity(258917, 'V')
+        assert c == d
+        assert hash(c) == hash(d)
+        assert {c: 'limit'}[d] == 'limit'
+        assert a.freeze() is a
+        assert a.prefix is prefixes.kilo
+
+        with self.assertRaises(AttributeError):
+            a.unit = units.ampere
+        with self.assertRaises(AttributeError):
+            del a._value
+        # Arithmetic gives ordinary quantities
+        assert type(a + b) is quantity.Quantity
+        self.assertRaises(TypeError, hash, quantity.Quantity(1, 'V'))
+
+        calls = []
+
+        @functools.lru_cache(maxsize=None)
+        def doubled(q):
+            calls.append(q)
+            return q * 2
+
+        assert doubled(a) == doubled(b)
+        assert len(calls) == 1
+        assert type(pickle.loads(pickle.dumps(a))) is quantity.FrozenQuantity
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import quantity.unit.units as units
+import quantity.prefix.prefixes as prefixes
+from quantity.quantity import Quantity
+
+if np is not None:
+    from quantity.quantity_array import QuantityArray
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestQuantityArray(unittest.TestCase):
+
+    def test_construction(self):
+        a = QuantityArray([1, 2, 3], 'kV')
+        assert a.unit is units.volt
+        assert list(a.values) == [1000.0, 2000.0, 3000.0]
+        assert a.prefix is prefixes.kilo
+        assert str(a) == '[1. 2. 3.] kV', str(a)
+
+        b = QuantityArray([1, 2], units.volt, prefixes.milli)
+        assert list(b.values) == [0.001, 0.002]
+
+    def test_from_quantities(self):
+        a = QuantityArray.from_quantities([Quantity(1, 'mA'), Quantity(2, 'A')])
+        assert a.unit is units.ampere
+        assert list(a.values) == [0.001, 2.0]
+        self.assertRaises(AssertionError, QuantityArray.from_quantities, [Quantity(1, 'A'), Quantity(1, 'V')])
+
+    def test_unit_math(self):
+        v = QuantityArray([1, 2, 3], 'V')
+        i = QuantityArray([10, 10, 10], 'A')
+        w = v * i
+        assert w.unit is units.watt
+        assert list(w.values) == [10.0, 20.0, 30.0]
+        assert (w / i).unit is units.volt
+        assert (v * Quantity(2, 'A')).unit is units.watt
+        assert list((v + v).values) == [2.0, 4.0, 6.0]
+        assert list((2 * v).values) == [2.0, 4.0, 6.0]
+        self.assertRaises(AssertionError, v.__add__, i)
+
+    def test_comparisons(self):
+        a = QuantityArray([1, 2, 3], 'kV')
+        assert list(a > Quantity(1500, 'V')) == [False, True, True]
+        assert list(a == QuantityArray([1000, 0, 3000], 'V')) == [True, False, True]
+        assert not (a == QuantityArray([1, 2, 3], 'A')).any()
+
+    def test_reductions(self):
+        a = QuantityArray([1, 2, 3], 'kV')
+        assert a.sum() == Quantity(6, 'kV')
+        assert a.mean() == Quantity(2, 'kV')
+        assert a.min() == Quantity(1, 'kV')
+        assert a.max() == Quantity(3, 'kV')
+
+    def test_to(self):
+        a = QuantityArray([1, 2], 'km')
+        assert list(a.to('m')) == [1000.0, 2000.0]
+        assert list(a.to('mm')) == [1000000.0, 2000000.0]
+        assert list(a.to(prefixes.kilo)) == [1.0, 2.0]
+        assert a.to('Xm') is None
+
+    def test_convert(self):
+        t = QuantityArray([0, 100], units.celsius).convert(units.fahrenheit)
+        assert t.unit is units.fahrenheit
+        assert list(t.values) == [32.0, 212.0]
+
+    def test_indexing(self):
+        a = QuantityArray([1, 2, 3], 'kV')
+        assert a[1] == Quantity(2, 'kV')
+        assert isinstance(a[1:], QuantityArray)
+        assert len(a[1:]) == 2
+        assert list(a) == [Quantity(1, 'kV'), Quantity(2, 'kV'), Quantity(3, 'kV')]
+
+    def test_array_copy(self):
+        a = QuantityArray([1, 2, 3], 'V')
+        copied = np.array(a, copy=True)
+        copied[0] = 100
+        assert a[0] == Quantity(1, 'V')
+        assert np.asarray(a) is a.values
+        assert np.array(a, dtype=np.float32).dtype == np.float32
+        with self.assertRaises(ValueError):
+            np.array(a, dtype=np.float32, copy=False)
+
+    def test_sum_arrays(self):
+        a = QuantityArray([1, 2], 'V')
+        total = sum([a, QuantityArray([3, 4], 'V')])
+        assert list(total.values) == [4.0, 6.0]
+        assert total.unit is units.volt
+        assert (a + 0).values is not a.values
+        assert list((0 - a).values) == [-1.0, -2.0]
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 import os
 import unittest
+from configparser import NoOptionError, NoSectionError
 
+from quantity.quantity import Quantity
 from quantity.quantity_config_parser import QuantityConfigParser
 
 here = os.path.dirname(__file__)
@@ -64,3 +66,59 @@ class TestQuantityConfigParser(unittest.TestCase):
 
         v = self.qcp.gethex('Hex', 'value2')
         assert v == 0xDEADC0DE
+
+
+_LIMITS = """
+[DEFAULT]
+retries = 3
+
+[limits]
+timeout = 250 ms
+max_power = 1.5 kW
+"""
+
+
+class TestQuantityConfigParserCache(unittest.TestCase):
+    """
+    Test the cached quantities
+    """
+
+    def setUp(self):
+        self.qcp = QuantityConfigParser()
+        self.qcp.read_string(_LIMITS)
+
+    def test_cached(self):
+        v = self.qcp.getfloat('limits', 'timeout')
+        assert v == Quantity(0.25, 's')
+        assert self.qcp.getfloat('limits', 'timeout') is v
+        assert self.qcp.getint('limits', 'timeout') is not v
+
+    def test_invalidated(self):
+        qcp = self.qcp
+        changes = (
+            lambda: qcp.set('limits', 'timeout', '1 s'),
+            lambda: qcp['limits'].__setitem__('timeout', '2 s'),
+            lambda: qcp.read_string('[limits]\ntimeout = 3 s\n'),
+            lambda: qcp.read_dict({'limits': {'timeout': '4 s'}}),
+            lambda: qcp.__setitem__('limits', {'timeout': '5 s'}),
+        )
+        for seconds, change in enumerate(changes, 1):
+            qcp.getfloat('limits', 'timeout')
+            change()
+            assert qcp.getfloat('limits', 'timeout') == Quantity(seconds, 's'), seconds
+
+        qcp.remove_option('limits', 'timeout')
+        self.assertRaises(NoOptionError, qcp.getfloat, 'limits', 'timeout')
+        qcp.getfloat('limits', 'retries')
+        del qcp['limits']
+        self.assertRaises(NoSectionError, qcp.getfloat, 'limits', 'retries')
+        qcp.add_section('limits')
+        assert qcp.getint('limits', 'retries') == 3
+
+    def test_get_section_as(self):
+        limits = self.qcp.get_section_as('limits')
+        assert limits == {'retries': 3, 'timeout': Quantity(250, 'ms'), 'max_power': Quantity(1.5, 'kW')}
+        assert self.qcp.getfloat('limits', 'max_power') is limits['max_power']
+        assert self.qcp.get_all_as() == {'limits': limits}
+        # 1.5 isn't an int
+        self.assertRaises(ValueError, self.qcp.get_all_as, int)
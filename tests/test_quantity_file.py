@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from quantity.quantity import Quantity
+from quantity.quantity_file import QuantityFile, write_quantities
+from quantity.unit import NoUnit
+import quantity.unit.units as units
+import quantity.prefix.prefixes as prefixes
+
+
+class TestQuantityFile(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.pyqc')
+        os.close(fd)
+        write_quantities(self.path, {
+            'volts': ([1.0, 2.0, 3.0], units.volt, prefixes.kilo),
+            'bytes': (array('i', [1024, 2048]), units.byte),
+            'speed': ([1.5, 2.5], units.metre / units.second ** 2),
+            'count': (range(10), NoUnit),
+        })
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_header(self):
+        with QuantityFile(self.path) as qf:
+            assert qf.columns == ['volts', 'bytes', 'speed', 'count']
+            assert qf.unit('volts') is units.volt
+            assert qf.prefix('volts') is prefixes.kilo
+            assert qf.unit('speed') is units.metre / units.second ** 2
+            assert qf.unit('count') is NoUnit
+
+    def test_columns(self):
+        with QuantityFile(self.path) as qf:
+            view = qf.column('volts')
+            assert view.format == 'd'
+            assert list(view) == [1.0, 2.0, 3.0]
+            view.release()
+            view = qf['bytes']
+            assert view.format == 'q'
+            assert list(view) == [1024, 2048]
+            view.release()
+            assert qf.quantity('volts', 1) == Quantity(2, 'kV')
+            self.assertRaises(IndexError, qf.quantity, 'volts', 5)
+
+    def test_negative_indices(self):
+        with QuantityFile(self.path) as qf:
+            assert qf.quantity('volts', -1) == Quantity(3, 'kV')
+            assert qf.quantity('bytes', -2) == Quantity(1024, 'B')
+            self.assertRaises(IndexError, qf.quantity, 'volts', -4)
+            self.assertRaises(IndexError, qf.quantity, 'bytes', -3)
+            view = qf.column('bytes', -1)
+            assert list(view) == [1024, 2048]
+            view.release()
+            view = qf.column('volts', -5, -1)
+            assert list(view) == []
+            view.release()
+
+    def test_reductions(self):
+        with QuantityFile(self.path) as qf:
+            assert qf.sum('volts') == Quantity(6, 'kV')
+            assert qf.mean('volts', chunk_size=2) == Quantity(2, 'kV')
+            assert qf.min('count', chunk_size=3) == 0
+            assert qf.max('count', chunk_size=3) == 9
+            assert qf.sum('count', chunk_size=4) == 45
+            assert [len(c) for c in qf.chunks('count', 4)] == [4, 4, 2]
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_numpy(self):
+        with QuantityFile(self.path) as qf:
+            a = qf.array('volts')
+            assert list(a) == [1.0, 2.0, 3.0]
+            assert not a.flags.writeable
+            del a
+
+    def test_not_a_quantity_file(self):
+        with open(self.path, 'wb') as fp:
+            fp.write(b'nothing to see here')
+        self.assertRaises(ValueError, QuantityFile, self.path)
+
+    def test_truncated(self):
+        with open(self.path, 'rb') as fp:
+            data = fp.read()
+        # Cut short in the preamble, the header and the data
+        for size in (6, 40, len(data) - 8):
+            with open(self.path, 'wb') as fp:
+                fp.write(data[:size])
+            with self.assertRaises(ValueError) as raised:
+                QuantityFile(self.path)
+            assert self.path in str(raised.exception)
+
+    def test_corrupt_header(self):
+        with open(self.path, 'r+b') as fp:
+            fp.seek(12)
+            fp.write(b'}')
+        self.assertRaises(ValueError, QuantityFile, self.path)
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_uint64_rejected(self):
+        values = np.array([2 ** 63], dtype=np.uint64)
+        self.assertRaises(TypeError, write_quantities, self.path, {'big': (values, NoUnit)})
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from quantity.quantity import Quantity
+from quantity.quantity_index import QuantityIndex
+import quantity.unit.units as units
+
+
+class TestQuantityIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.readings = [Quantity(1.2, 'kW'), Quantity(900, 'W'), Quantity(50, 'W'), Quantity(2, 'MW'),
+                         Quantity(900, 'W')]
+        self.index = QuantityIndex(self.readings)
+
+    def test_order(self):
+        assert self.index.unit is units.watt
+        assert len(self.index) == 5
+        assert [float(q) for q in self.index] == [50.0, 900.0, 900.0, 1200.0, 2e6]
+        assert self.index.min() == Quantity(50, 'W')
+        assert self.index.max() == Quantity(2, 'MW')
+
+    def test_range(self):
+        assert self.index.range(Quantity(100, 'W'), Quantity(1.2, 'kW')) == self.readings[1:2] * 2 + self.readings[:1]
+        assert self.index.range(Quantity(900, 'W'), Quantity(1.2, 'kW'), inclusive=False) == []
+        assert self.index.range(low=Quantity(1, 'kW')) == [self.readings[0], self.readings[3]]
+        assert self.index.range(high=Quantity(0.1, 'kW')) == [self.readings[2]]
+        assert self.index.count(Quantity(900, 'W'), Quantity(900, 'W')) == 2
+        assert self.index.range(Quantity(2, 'kW'), Quantity(1, 'kW')) == []
+
+    def test_top_and_nearest(self):
+        assert self.index.top(2) == [self.readings[3], self.readings[0]]
+        assert self.index.top(0) == []
+        assert self.index.bottom(1) == [self.readings[2]]
+        assert self.index.nearest(Quantity(1.1, 'kW')) == [self.readings[0]]
+        assert self.index.nearest(Quantity(0, 'W'), 2) == [self.readings[2], self.readings[1]]
+        assert len(self.index.nearest(Quantity(1, 'kW'), 10)) == 5
+
+    def test_items(self):
+        index = QuantityIndex([Quantity(3, 'V'), Quantity(1, 'kV')], items=['low', 'high'])
+        index.add(Quantity(20, 'V'), 'middle')
+        assert list(index) == ['low', 'middle', 'high']
+        assert Quantity(20, 'V') in index
+        index.remove(Quantity(20, 'V'), 'middle')
+        assert list(index) == ['low', 'high']
+        self.assertRaises(ValueError, index.remove, Quantity(20, 'V'))
+
+    def test_units_must_match(self):
+        self.assertRaises(AssertionError, self.index.add, Quantity(1, 'V'))
+        self.assertRaises(AssertionError, self.index.range, Quantity(1, 'V'))
+
+    def test_by_unit(self):
+        groups = QuantityIndex.by_unit([Quantity(1, 'V'), Quantity(2, 'A'), Quantity(3, 'mV')])
+        assert set(groups) == {units.volt, units.ampere}
+        assert list(groups[units.volt]) == [Quantity(3, 'mV'), Quantity(1, 'V')]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import io
+import unittest
+
+from quantity.quantity import Quantity
+from quantity.quantity_reader import read_quantities
+import quantity.unit.units as units
+import quantity.prefix.prefixes as prefixes
+
+DATA = 'volts,amps,temp\n12.5 kV,300 mA,20 °C\n11 kV,250mA,\n9 V,1 A,30 °C\n'
+
+
+class TestQuantityReader(unittest.TestCase):
+
+    def test_read(self):
+        batches = {b.column: b for b in read_quantities(io.StringIO(DATA))}
+        assert batches['volts'].unit is units.volt
+        assert batches['volts'].prefix is prefixes.NoPrefix
+        assert list(batches['volts'].values) == [12500.0, 11000.0, 9.0]
+        assert list(batches['amps'].values) == [0.3, 0.25, 1.0]
+        # Empty cells are skipped
+        assert list(batches['temp'].values) == [20.0, 30.0]
+
+    def test_targets(self):
+        batches = list(read_quantities(io.StringIO(DATA), columns=['amps', 'temp'],
+                                       targets={'amps': 'mA', 'temp': units.fahrenheit}))
+        assert [b.column for b in batches] == ['amps', 'temp']
+        amps, temp = batches
+        assert amps.unit is units.ampere and amps.prefix is prefixes.milli
+        assert list(amps.values) == [300.0, 250.0, 1000.0]
+        assert temp.unit is units.fahrenheit
+        assert list(temp.values) == [68.0, 86.0]
+
+    def test_batches(self):
+        lines = ('%d ms' % i for i in range(10))
+        batches = list(read_quantities(lines, header=False, batch_size=4))
+        assert [len(b.values) for b in batches] == [4, 4, 2]
+        assert all(b.column == 0 and b.unit is units.second for b in batches)
+        assert list(batches[-1].values) == [float(Quantity(i, 'ms')) for i in (8, 9)]
+        assert batches[-1].values[-1] == 0.009
+
+    def test_exact_prefix_scaling(self):
+        batches = list(read_quantities(io.StringIO('t,d\n9 ms,7 mm\n3 ns,9 km\n'), targets={'d': 'm'}))
+        assert [list(b.values) for b in batches] == [[0.009, 3e-09], [0.007, 9000.0]]
+
+    def test_units_split_per_batch(self):
+        batches = list(read_quantities(io.StringIO('x\n1 V\n2 A\n3 kV\n')))
+        assert [(b.unit, list(b.values)) for b in batches] == [(units.volt, [1.0, 3000.0]), (units.ampere, [2.0])]
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import pickle
+import statistics
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from quantity.quantity_stats import QuantityStats
+from quantity.quantity import Quantity
+from quantity.unit import NoUnit
+import quantity.unit.units as units
+
+VALUES = (2, 4, 4, 4, 5, 5, 7, 9)
+
+
+class TestQuantityStats(unittest.TestCase):
+
+    def test_stream(self):
+        stats = QuantityStats()
+        for v in VALUES:
+            stats.add(Quantity(v, 'W'))
+        assert stats.count == len(stats) == 8
+        assert stats.unit is units.watt
+        assert stats.mean == Quantity(5, 'W')
+        assert stats.min == Quantity(2, 'W')
+        assert stats.max == Quantity(9, 'W')
+        assert stats.pstdev == Quantity(2, 'W')
+        assert stats.pvariance.unit is units.watt ** 2
+        assert round(float(stats.variance), 12) == round(statistics.variance(VALUES), 12)
+        assert round(float(stats.stdev), 12) == round(statistics.stdev(VALUES), 12)
+
+    def test_batches(self):
+        stats = QuantityStats(Quantity(v, 'mW') for v in VALUES[:3])
+        stats.update(iter([Quantity(v / 1000, 'W') for v in VALUES[3:]]))
+        assert stats.count == 8
+        assert round(float(stats.mean), 12) == 0.005
+        assert stats.max.unit is units.watt
+        assert round(float(stats.max), 12) == 0.009
+
+    def test_numbers(self):
+        stats = QuantityStats(VALUES[:3])
+        stats.update(float(v) for v in VALUES[3:])
+        assert stats.count == 8
+        assert stats.unit is NoUnit
+        assert stats.mean == 5
+        assert stats.pstdev == 2
+        assert stats.min == 2 and stats.max == 9
+
+    def test_bad_batch(self):
+        stats = QuantityStats([Quantity(1, 'W')])
+        self.assertRaises(AssertionError, stats.update, [Quantity(2, 'W'), Quantity(3, 'V')])
+        self.assertRaises(AssertionError, stats.update, [Quantity(2, 'W'), 3])
+        assert stats.count == 1
+        assert stats.max == Quantity(1, 'W')
+        self.assertRaises(AssertionError, QuantityStats, [1, Quantity(3, 'V')])
+
+    def test_merge(self):
+        whole = QuantityStats(Quantity(v, 'V') for v in VALUES)
+        a = QuantityStats(Quantity(v, 'V') for v in VALUES[:5])
+        b = QuantityStats(Quantity(v, 'V') for v in VALUES[5:])
+        merged = a + b
+        assert a.count == 5
+        assert merged.count == whole.count
+        assert merged.min == whole.min and merged.max == whole.max
+        assert round(float(merged.mean), 12) == float(whole.mean)
+        assert round(float(merged.variance), 12) == round(float(whole.variance), 12)
+        # Accumulators travel between processes
+        assert pickle.loads(pickle.dumps(merged)).count == 8
+        assert QuantityStats().merge(a).count == 5
+        assert a.merge(QuantityStats()).count == 5
+
+    def test_units(self):
+        stats = QuantityStats([Quantity(1, 'V')])
+        self.assertRaises(AssertionError, stats.add, Quantity(1, 'A'))
+        self.assertRaises(AssertionError, stats.update, [Quantity(2, 'V'), Quantity(1, 'A')])
+        self.assertRaises(AssertionError, stats.merge, QuantityStats([Quantity(1, 'A')]))
+        unitless = QuantityStats()
+        unitless.add(3)
+        unitless.add(Quantity(5))
+        assert unitless.mean == 4
+
+    def test_empty(self):
+        stats = QuantityStats()
+        self.assertRaises(ValueError, lambda: stats.mean)
+        self.assertRaises(ValueError, lambda: stats.max)
+        stats.add(Quantity(1, 'V'))
+        self.assertRaises(ValueError, lambda: stats.variance)
+        assert stats.pvariance == Quantity(0, units.volt ** 2)
+
+    @unittest.skipIf(np is None, 'numpy not installed')
+    def test_quantity_array(self):
+        from quantity.quantity_array import QuantityArray
+        stats = QuantityStats([Quantity(2, 'W')])
+        stats.update(QuantityArray(VALUES[1:], 'W'))
+        assert stats.count == 8
+        assert stats.pstdev == Quantity(2, 'W')
+        assert stats.max == Quantity(9, 'W')
+
+
+if __name__ == '__main__':
+    unittest.main()
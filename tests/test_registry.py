@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+import operator
+import sys
+import threading
+import unittest
+
+from quantity.registry import Registry, current_registry, current_snapshot, use_registry, default_registry
+from quantity.unit import Unit, has_unit, get_unit, get_affine_conversion
+from quantity.unit.unit import get_all_conversions
+from quantity.prefix import Prefix, closest_prefix, has_prefix
+from quantity.unit_parser import parse_unit
+import quantity.unit.units as units
+import quantity.prefix.prefixes as prefixes
+
+
+class TestRegistry(unittest.TestCase):
+
+    def test_default(self):
+        assert current_registry() is default_registry
+        assert current_snapshot() is default_registry.snapshot()
+        assert get_unit('V') is units.volt
+
+    def test_snapshots_are_read_only(self):
+        snapshot = current_snapshot()
+        with self.assertRaises(TypeError):
+            snapshot.unit_index['V'] = units.ampere
+
+    def test_fork_isolation(self):
+        tenant = default_registry.fork()
+        with use_registry(tenant):
+            furlong = Unit('fur', 'furlong')
+            cubit = Prefix('cb', 'cubit', 33)
+            assert has_unit('fur')
+            assert has_prefix('cb')
+            assert parse_unit('kfur') == (prefixes.kilo, furlong)
+            assert closest_prefix(1e33) == (1.0, cubit)
+            assert units.volt * units.ampere is units.watt
+        assert not has_unit('fur')
+        assert not has_prefix('cb')
+        assert closest_prefix(1e33)[1] is prefixes.yotta
+        assert parse_unit('fur')[1] is not furlong
+
+    def test_fork_conversions(self):
+        a = Unit('RGA', 'registry a', temp=True)
+        b = Unit('RGB', 'registry b', temp=True)
+        tenant = Registry(default_registry)
+        with use_registry(tenant):
+            get_all_conversions()[(a, b)] = ((operator.mul, 3.0),)
+            assert a.convert(b, 2) == 6.0
+        assert get_affine_conversion((a, b)) is None
+        self.assertRaises(ValueError, a.convert, b, 2)
+
+    def test_snapshot_replaced_on_change(self):
+        tenant = default_registry.fork()
+        before = tenant.snapshot()
+        assert tenant.snapshot() is before
+        with use_registry(tenant):
+            Unit('RGC', 'registry c')
+        after = tenant.snapshot()
+        assert after is not before
+        assert 'RGC' in after.unit_index
+        assert 'RGC' not in before.unit_index
+
+    def test_batched_writes(self):
+        tenant = default_registry.fork()
+        before = tenant.snapshot()
+        a = Unit('RGD', 'registry d', temp=True)
+        with tenant.write():
+            tenant.unit_index['RGD'] = a
+            # Readers keep the old snapshot until the writer is done
+            assert tenant.snapshot() is before
+            tenant.unit_index['registry d'] = a
+        assert tenant.snapshot().unit_index['RGD'] is a
+
+    def test_context_per_thread(self):
+        tenant = default_registry.fork()
+        seen = []
+        with use_registry(tenant):
+            thread = threading.Thread(target=lambda: seen.append(current_registry()))
+            thread.start()
+            thread.join()
+            assert current_registry() is tenant
+        assert seen == [default_registry]
+
+    def test_concurrent_readers_and_writer(self):
+        tenant = default_registry.fork()
+        a = Unit('RGE', 'registry e', temp=True)
+        b = Unit('RGF', 'registry f', temp=True)
+        stop = threading.Event()
+        errors = []
+
+        def read():
+            with use_registry(tenant):
+                while not stop.is_set():
+                    try:
+                        assert units.volt * units.ampere is units.watt
+                        assert get_affine_conversion((a, b)) in (None, (2.0, 0.0))
+                    except Exception as e:
+                        errors.append(e)
+                        return
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        # Switch threads as often as possible to shake out races
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+        for reader in readers:
+            reader.start()
+        for _ in range(200):
+            with tenant.write():
+                tenant.conversions[(a, b)] = ((operator.mul, 2.0),)
+            with tenant.write():
+                del tenant.conversions[(a, b)]
+        # Writes straight to the tables, outside write(), as units.py and get_all_*() do
+        for i in range(2000):
+            tenant.conversions[(a, b)] = ((operator.mul, 2.0),)
+            tenant.unit_index[f'RG{i}'] = a
+            del tenant.conversions[(a, b)]
+        tenant.conversions[(a, b)] = ((operator.mul, 2.0),)
+        stop.set()
+        for reader in readers:
+            reader.join()
+        assert not errors, errors
+        # The last write is never hidden by a snapshot a reader copied before it
+        with use_registry(tenant):
+            assert get_affine_conversion((a, b)) == (2.0, 0.0)
+            assert has_unit('RG1999')
+
+        # A direct table write waits for whoever holds the lock, e.g. a reader copying the tables for a snapshot
+        written = threading.Event()
+
+        def write():
+            tenant.conversions[(b, a)] = ((operator.mul, 0.5),)
+            written.set()
+
+        with tenant._lock:
+            writer = threading.Thread(target=write)
+            writer.start()
+            assert not written.wait(0.1)
+            assert (b, a) not in tenant.conversions
+        writer.join()
+        assert written.is_set()
+        with use_registry(tenant):
+            assert get_affine_conversion((b, a)) == (0.5, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+from quantity.quantity import Quantity
+from quantity.registry import default_registry, use_registry
+from quantity.registry_file import parse_registry_file, compile_registry_file, load_registry_file
+from quantity.registry_file.registry_file import SUFFIX
+from quantity.unit import get_unit, has_unit
+from quantity.prefix import get_power, get_prefix, has_prefix
+import quantity.prefix.prefixes as prefixes
+import quantity.unit.units as units
+
+_SOURCE = """
+# Lengths
+[units]
+fur = furlong
+ch = chain
+V = volt
+
+[prefixes]
+da = deca 1
+
+[combined]
+fur * ch = J
+
+[divided]
+fur / ch = s
+
+[conversions]
+fur -> m = 201.168
+ch -> fur = / 10
+°F -> K = - 32, * 5, / 9, + 273.15
+"""
+
+
+class TestRegistryFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'lengths.ini')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(_SOURCE)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_parse(self):
+        units_, prefixes, combined, divided, conversions = parse_registry_file(_SOURCE)
+        assert units_ == (('fur', 'furlong'), ('ch', 'chain'), ('V', 'volt'))
+        assert prefixes == (('da', 'deca', 1),)
+        assert combined == (('fur', 'ch', 'J'),)
+        assert divided == (('fur', 'ch', 's'),)
+        assert conversions[2] == ('°F', 'K', (('-', 32.0), ('*', 5.0), ('/', 9.0), ('+', 273.15)))
+
+    def test_bad_files(self):
+        self.assertRaises(ValueError, parse_registry_file, '[unit]\nfur = furlong\n')
+        self.assertRaises(ValueError, parse_registry_file, '[prefixes]\nda = deca\n')
+        self.assertRaises(ValueError, parse_registry_file, '[combined]\nfur = J\n')
+        self.assertRaises(ValueError, parse_registry_file, '[conversions]\nfur -> m = ^ 3\n')
+        self.assertRaises(ValueError, load_registry_file, self._write('[divided]\nfur / s = nope\n'),
+                          default_registry.fork(), False)
+
+    def test_unknown_unit_installs_nothing(self):
+        tenant = default_registry.fork()
+        path = self._write('[units]\nfur = furlong\n[prefixes]\nda = deca 1\n[conversions]\nfur -> nope = 2\n')
+        self.assertRaises(ValueError, load_registry_file, path, tenant, False)
+        with use_registry(tenant):
+            assert not has_unit('fur')
+            assert not has_prefix('da')
+
+    def test_existing_prefixes_kept(self):
+        tenant = load_registry_file(self._write('[prefixes]\nk = kilo 3\nm = milli -2\n'), default_registry.fork(),
+                                    False)
+        with use_registry(tenant):
+            assert get_prefix('k') is prefixes.kilo
+            assert get_power(3) is prefixes.kilo
+            assert get_prefix('m') is not prefixes.milli
+            assert get_prefix('m').power == -2
+
+    def _write(self, text: str) -> str:
+        path = os.path.join(self.directory.name, 'other.ini')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_load(self):
+        tenant = load_registry_file(self.path, default_registry.fork())
+        assert not has_unit('fur')
+        with use_registry(tenant):
+            furlong = get_unit('fur')
+            chain = get_unit('ch')
+            assert get_unit('volt') is units.volt
+            assert Quantity(1, 'kfur').convert(units.metre) == Quantity(201.168, 'km')
+            assert float(Quantity(10, 'ch').convert(units.metre)) == 201.168
+            assert round(float(Quantity(212, '°F').convert(units.kelvin)), 6) == 373.15
+            assert Quantity(2, 'dafur').to('fur') == 20
+            assert furlong * chain is units.joule
+            assert furlong / chain is units.second
+        assert os.path.exists(self.path + SUFFIX)
+
+    def test_snapshot(self):
+        snapshot = compile_registry_file(self.path)
+        with open(snapshot, 'rb') as f:
+            compiled = f.read()
+
+        # An up to date snapshot is used as it is
+        load_registry_file(self.path, default_registry.fork())
+        with open(snapshot, 'rb') as f:
+            assert f.read() == compiled
+
+        # Editing the file makes it stale, so it's rebuilt
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(_SOURCE.replace('ch = chain', 'ch = chain\nlea = league'))
+        with use_registry(load_registry_file(self.path, default_registry.fork())):
+            assert has_unit('league')
+        with open(snapshot, 'rb') as f:
+            assert f.read() != compiled
+
+        # So is a damaged one
+        with open(snapshot, 'wb') as f:
+            f.write(compiled[:20])
+        with use_registry(load_registry_file(self.path, default_registry.fork())):
+            assert has_unit('league')
+
+    def test_no_snapshot(self):
+        with use_registry(load_registry_file(self.path, default_registry.fork(), snapshot=False)):
+            assert has_unit('furlong')
+        assert not os.path.exists(self.path + SUFFIX)
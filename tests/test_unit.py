@@ -1,18 +1,27 @@
 # -*- coding: utf-8 -*-
+import operator
 import unittest
 
 from quantity.unit import Unit, has_unit
+from quantity.unit.unit import get_affine_conversion, get_all_combined_units, get_all_conversions
 from quantity.unit import NoUnit
+from quantity.registry import default_registry, use_registry
 import quantity.unit.units as units
 
 
 class TestUnit(unittest.TestCase):
+    def setUp(self):
+        # Units made by the tests go in a fork, so they don't leak into other tests
+        self.enterContext(use_registry(default_registry.fork()))
+
     def test_simple_unit(self):
         t = Unit('ZZZ', 'TestUnit', temp=True)
         assert not has_unit('ZZZ')
 
         t = Unit('ZZZ', 'TestUnit', False)
         assert has_unit('ZZZ')
+        with use_registry(default_registry):
+            assert not has_unit('ZZZ')
 
     def test_addition(self):
         assert units.volt + units.volt is units.volt
@@ -51,3 +60,73 @@ class TestUnit(unittest.TestCase):
         assert units.ampere * units.volt is units.watt
         # Do they commute?
         assert units.volt * units.ampere is units.watt
+
+    def test_compound_units(self):
+        # Repeated division collapses to a power
+        acceleration = units.metre / units.second / units.second
+        assert acceleration is units.metre / (units.second * units.second)
+        assert acceleration is units.metre / units.second ** 2
+        assert str(acceleration) == 'm/s²'
+        assert repr(acceleration) == 'metre per square second'
+        assert not has_unit(acceleration)
+
+        # Compound units commute and cancel
+        assert units.ohm * units.metre is units.metre * units.ohm
+        assert units.metre * units.second / units.second is units.metre
+        assert units.metre ** 2 / units.metre is units.metre
+        assert str(NoUnit / units.second) == 's⁻¹'
+
+    def test_power(self):
+        m3 = units.metre ** 3
+        assert str(m3) == 'm³'
+        assert repr(m3) == 'cubic metre'
+        assert m3 is units.metre * units.metre * units.metre
+        assert units.metre ** 1 is units.metre
+        assert units.metre ** 0 is NoUnit
+        assert (units.metre ** 2) ** -1 is NoUnit / (units.metre ** 2)
+
+    def test_derived_units_update(self):
+        a = Unit('AAA', 'test a')
+        b = Unit('BBB', 'test b')
+        c = Unit('CCC', 'test c')
+        assert str(a * b) == 'AAABBB'
+        combined = frozenset((a, b))
+        get_all_combined_units()[combined] = c
+        try:
+            assert a * b is c
+        finally:
+            del get_all_combined_units()[combined]
+        assert a * b is not c
+        with use_registry(default_registry):
+            assert not has_unit('AAA')
+
+    def test_conversion(self):
+        assert units.celsius.convert(units.kelvin, 100) == 373.15
+        assert units.hour.convert(units.second, 2) == 7200.0
+        assert units.volt.convert(units.volt, 5) == 5
+        self.assertRaises(ValueError, units.volt.convert, units.ampere, 5)
+
+    def test_transitive_conversion(self):
+        # inch -> foot -> mile
+        assert round(units.inch.convert(units.mile, 63360), 12) == 1.0
+        # kelvin -> celsius -> fahrenheit
+        assert round(units.kelvin.convert(units.fahrenheit, 373.15), 10) == 212.0
+        assert round(units.fahrenheit.convert(units.kelvin, 32), 10) == 273.15
+        assert get_affine_conversion((units.volt, units.ampere)) is None
+
+    def test_conversion_update(self):
+        a = Unit('AAA', 'test a')
+        b = Unit('BBB', 'test b')
+        c = Unit('CCC', 'test c')
+        assert get_affine_conversion((a, c)) is None
+        get_all_conversions().update({
+            (a, b): ((operator.mul, 2.0),),
+            (b, c): ((operator.add, 1.0),),
+        })
+        try:
+            assert get_affine_conversion((a, c)) == (2.0, 1.0)
+            assert a.convert(c, 3) == 7.0
+        finally:
+            del get_all_conversions()[(a, b)]
+            del get_all_conversions()[(b, c)]
+        assert get_affine_conversion((a, c)) is None
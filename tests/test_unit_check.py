@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from quantity.unit_check import units
+from quantity.quantity import Quantity
+import quantity.unit.units as unit_definitions
+import quantity.prefix.prefixes as prefixes
+
+
+class TestUnitCheck(unittest.TestCase):
+
+    def test_raw_arguments(self):
+        seen = []
+
+        @units(v='V', i='mA', returns='W')
+        def power(v, i):
+            seen.append((v, i))
+            return v * i / 1000
+
+        result = power(Quantity(2, 'kV'), Quantity(3, 'A'))
+        assert seen == [(2000.0, 3000.0)]
+        assert result == Quantity(6, unit_definitions.watt, prefixes.kilo)
+        assert power(i=Quantity(3, 'A'), v=Quantity(2, 'V')) == Quantity(6, unit_definitions.watt)
+        assert power.__name__ == 'power'
+
+    def test_signature_cache(self):
+        @units(t='K')
+        def identity(t):
+            return t
+
+        identity(Quantity(1, 'K'))
+        identity(Quantity(2, 'kK'))
+        assert len(identity.signatures) == 1
+        assert round(identity(Quantity(0, '°C')), 10) == 273.15
+        assert len(identity.signatures) == 2
+
+    def test_conversions(self):
+        @units(t='°C', returns='°F')
+        def fahrenheit(t):
+            return t * 9 / 5 + 32
+
+        assert fahrenheit(Quantity(373.15, 'K')).to('°F') == 212.0
+
+    def test_unchecked_arguments(self):
+        @units(v='V', scale=None)
+        def scaled(v, scale, offset=0, limit=None):
+            return v * scale + offset
+
+        assert scaled(Quantity(2, 'V'), 3, offset=1) == 7
+        assert scaled(Quantity(2, 'V'), 3) == 6
+
+    def test_keyword_only_arguments(self):
+        @units(v='V', i='A')
+        def total(*args, v, i=None):
+            return sum(args) + v + (i or 0)
+
+        assert total(1, 2, 3, v=Quantity(2, 'kV')) == 2006
+        assert total(v=Quantity(2, 'kV'), i=Quantity(500, 'mA')) == 2000.5
+        # An explicit None is checked, not taken as the default
+        with self.assertRaises(TypeError):
+            total(v=Quantity(2, 'kV'), i=None)
+
+        @units(v='mV')
+        def after(a, *rest, v):
+            return a, rest, v
+
+        assert after(Quantity(1, 'A'), 2, v=Quantity(1, 'V')) == (Quantity(1, 'A'), (2,), 1000.0)
+
+    def test_errors(self):
+        @units(v='V')
+        def identity(v):
+            return v
+
+        with self.assertRaises(TypeError):
+            identity(2)
+        with self.assertRaises(ValueError):
+            identity(Quantity(1, 's'))
+        with self.assertRaises(TypeError):
+            units(x='V')(identity)
+
+    def test_quantity_result(self):
+        @units(returns='K')
+        def boiling():
+            return Quantity(100, '°C')
+
+        assert round(float(boiling()), 10) == 373.15
+        assert boiling().unit is unit_definitions.kelvin
+
+    @unittest.skipIf(np is None, 'numpy not installed')
+    def test_arrays(self):
+        from quantity.quantity_array import QuantityArray
+
+        @units(v='kV', i='A', returns='kW')
+        def power(v, i):
+            return v * i
+
+        result = power(QuantityArray([1000, 2000], 'V'), Quantity(3, 'A'))
+        assert isinstance(result, QuantityArray)
+        assert list(result.to('W')) == [3000.0, 6000.0]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from quantity.unit import Unit, NoUnit
+from quantity.unit_parser import parse_unit, clear_cache
+from quantity.unit_parser.unit_parser import _parse
+import quantity.unit.units as units
+import quantity.prefix.prefixes as prefixes
+
+
+class TestUnitParser(unittest.TestCase):
+
+    def setUp(self):
+        clear_cache()
+
+    def test_whole_unit(self):
+        assert parse_unit('V') == (prefixes.NoPrefix, units.volt)
+        assert parse_unit('min') == (prefixes.NoPrefix, units.minute)
+        assert parse_unit('volt') == (prefixes.NoPrefix, units.volt)
+        assert parse_unit('') == (prefixes.NoPrefix, NoUnit)
+
+    def test_prefixed_unit(self):
+        assert parse_unit('kV') == (prefixes.kilo, units.volt)
+        assert parse_unit('mm') == (prefixes.milli, units.metre)
+        assert parse_unit('µs') == (prefixes.micro, units.second)
+        assert parse_unit('kmol') == (prefixes.kilo, units.mole)
+        assert parse_unit('MPa') == (prefixes.mega, units.pascal)
+
+    def test_unknown_unit(self):
+        prefix, unit = parse_unit('widget')
+        assert prefix is prefixes.NoPrefix
+        assert unit.unit == 'widget'
+        # The temporary unit is remembered
+        assert parse_unit('widget')[1] is unit
+
+    def test_cache(self):
+        parse_unit('kV')
+        hits = _parse.cache_info().hits
+        parse_unit('kV')
+        assert _parse.cache_info().hits == hits + 1
+
+    def test_registry_change(self):
+        prefix, unit = parse_unit('kgadget')
+        assert unit.unit == 'kgadget'
+        gadget = Unit('gadget', 'gadget')
+        assert parse_unit('kgadget') == (prefixes.kilo, gadget)